@@ -0,0 +1,68 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+ASYNC_METHODS = (
+    "connect", "disconnect", "create_tables", "migrate",
+    "execute_query", "fetch_data",
+    "add_flight", "get_all_flights", "count_flights", "get_flight_by_id", "get_flights_by_route",
+    "initialize_seats_for_flight", "initialize_seats_bulk",
+    "get_available_seats", "update_seat_availability",
+    "get_availability_bitmaps", "count_free_seats_by_type",
+    "add_passenger", "get_passenger_by_id",
+    "create_booking", "book_seat", "book_new_passenger", "book_group", "update_booking_payment", "get_booking_by_ticket",
+    "add_baggage", "get_baggage_by_passenger",
+)
+
+
+class AsyncDatabaseHandler:
+    """Asyncio front end for a database handler.
+
+    Every call runs the blocking handler method on a dedicated thread pool, so
+    an event loop can keep hundreds of booking flows in flight. This only
+    speeds anything up for a MySQL handler with a ``pool_size``, whose workers
+    each get their own connection. An unpooled handler (and SQLite) has a
+    single connection and so gets a single worker: calls then run one at a
+    time with an executor hop added, which is slower than calling the handler
+    directly. Use the wrapper there only to keep the event loop unblocked.
+    """
+
+    def __init__(self, db, max_workers=None):
+        self._db = db
+        if max_workers is None:
+            max_workers = db.pool.max_size if getattr(db, "pool", None) is not None else 1
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="async-db")
+
+    @property
+    def sync_handler(self):
+        return self._db
+
+    async def run(self, func, *args, **kwargs):
+        """Run any blocking callable on the database executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.run(self._db.disconnect)
+        self.close()
+
+
+def _async_method(name):
+    async def method(self, *args, **kwargs):
+        return await self.run(getattr(self._db, name), *args, **kwargs)
+
+    method.__name__ = name
+    method.__qualname__ = f"AsyncDatabaseHandler.{name}"
+    method.__doc__ = f"Awaitable version of the handler's ``{name}``."
+    return method
+
+
+for _name in ASYNC_METHODS:
+    setattr(AsyncDatabaseHandler, _name, _async_method(_name))
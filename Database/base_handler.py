@@ -0,0 +1,984 @@
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import lru_cache
+
+from Database.connection_pool import PoolTimeoutError
+from Database.metrics import instrumented, note_error, note_rows
+from Database.migrations import MigrationRunner
+from Database.resilience import CircuitOpenError
+from Database.seat_bitmap import SeatBitmap
+
+
+def seat_type_for(seat_id):
+    return "Window" if seat_id[-1:] in ('A', 'D') else "Middle"
+
+
+@lru_cache(maxsize=64)
+def _multi_row_seat_insert(row_count):
+    return (
+        "INSERT IGNORE INTO seats (seat_id, flight_id, is_available, seat_type) VALUES "
+        + ", ".join(["(%s, %s, %s, %s)"] * row_count)
+    )
+
+
+@lru_cache(maxsize=256)
+def _with_in_list(query, value_count):
+    """Expand the ``{}`` in ``query`` to an IN list of ``value_count`` placeholders."""
+    return query.format(", ".join(["%s"] * value_count))
+
+
+@lru_cache(maxsize=256)
+def _multi_row_insert(statement, row_placeholders, row_count):
+    return statement + " VALUES " + ", ".join([row_placeholders] * row_count)
+
+
+AVAILABLE_SEATS_QUERY = """
+    SELECT seat_id, seat_type 
+    FROM seats 
+    WHERE flight_id = %s AND is_available = TRUE
+"""
+
+FLIGHTS_BY_ROUTE_QUERY = """
+    SELECT * FROM flights
+    WHERE source = %s AND destination = %s AND flight_date BETWEEN %s AND %s
+    ORDER BY flight_date, departure_time
+"""
+
+BOOKING_BY_TICKET_QUERY = """
+    SELECT b.*, p.name, p.email, f.airline, f.source, f.destination, f.flight_date
+    FROM bookings b
+    JOIN passengers p ON b.passenger_id = p.passenger_id
+    JOIN flights f ON b.flight_id = f.flight_id
+    WHERE b.ticket_id = %s
+"""
+
+BAGGAGE_BY_PASSENGER_QUERY = "SELECT * FROM baggage WHERE passenger_id = %s"
+
+CLAIM_SEAT_QUERY = """
+    UPDATE seats
+    SET is_available = FALSE
+    WHERE seat_id = %s AND flight_id = %s AND is_available = TRUE
+"""
+
+LOG_SEAT_CHANGE_QUERY = """
+    INSERT INTO seat_availability_changes (flight_id, seat_id, is_available)
+    VALUES (%s, %s, %s)
+"""
+
+STORE_SEAT_BITMAP_QUERY = """
+    REPLACE INTO seat_availability (flight_id, seat_ids, seat_types, available)
+    VALUES (%s, %s, %s, %s)
+"""
+
+SET_SEAT_AVAILABILITY_QUERY = """
+    UPDATE seats 
+    SET is_available = %s 
+    WHERE seat_id = %s AND flight_id = %s
+"""
+
+SEAT_BITMAPS_QUERY = "SELECT flight_id, seat_ids, seat_types, available FROM seat_availability WHERE flight_id IN ({})"
+
+SEAT_CHANGES_QUERY = """
+    SELECT flight_id, seat_id, is_available FROM seat_availability_changes
+    WHERE flight_id IN ({}) ORDER BY change_id
+"""
+
+CLEAR_SEAT_CHANGES_QUERY = "DELETE FROM seat_availability_changes WHERE flight_id IN ({})"
+
+FLIGHTS_TO_COMPACT_QUERY = """
+    SELECT DISTINCT flight_id FROM seat_availability_changes
+    UNION
+    SELECT DISTINCT flight_id FROM seats
+    WHERE flight_id NOT IN (SELECT flight_id FROM seat_availability)
+"""
+
+SEAT_ROWS_FOR_FLIGHTS_QUERY = "SELECT flight_id, seat_id, seat_type, is_available FROM seats WHERE flight_id IN ({})"
+
+LOCK_SEAT_ROWS_FOR_FLIGHTS_QUERY = SEAT_ROWS_FOR_FLIGHTS_QUERY + " FOR UPDATE"
+
+LOCK_FREE_SEATS_QUERY = """
+    SELECT seat_id FROM seats
+    WHERE flight_id = %s AND is_available = TRUE AND seat_id IN ({}) FOR UPDATE
+"""
+
+CLAIM_SEATS_QUERY = "UPDATE seats SET is_available = FALSE WHERE flight_id = %s AND seat_id IN ({})"
+
+INSERT_BOOKINGS_STATEMENT = "INSERT INTO bookings (ticket_id, passenger_id, flight_id, seat_id, payment_status)"
+
+INSERT_BAGGAGE_STATEMENT = "INSERT INTO baggage (passenger_id, weight, fee)"
+
+INSERT_PASSENGER_QUERY = """
+    INSERT INTO passengers (name, email, age, passenger_type, preferences, special_data)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+INSERT_BOOKING_QUERY = """
+    INSERT INTO bookings (ticket_id, passenger_id, flight_id, seat_id, payment_status)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+class StatementResult:
+    """Detached outcome of a write statement.
+
+    The cursor is closed before the connection goes back to the pool, so callers
+    get the values they need here instead of a live cursor.
+    """
+    def __init__(self, rowcount, lastrowid):
+        self.rowcount = rowcount
+        self.lastrowid = lastrowid
+
+    def close(self):
+        pass
+
+
+class BookingResult:
+    BOOKED = "booked"
+    CONFLICT = "conflict"
+    FAILED = "failed"
+
+    def __init__(self, status, ticket_id=None, message="", passenger_id=None):
+        self.status = status
+        self.ticket_id = ticket_id
+        self.message = message
+        self.passenger_id = passenger_id
+
+    @property
+    def ok(self):
+        return self.status == self.BOOKED
+
+    @property
+    def conflict(self):
+        return self.status == self.CONFLICT
+
+    def __repr__(self):
+        return f"BookingResult(status='{self.status}', ticket_id='{self.ticket_id}')"
+
+
+class GroupBookingResult:
+    """Outcome of a group booking.
+
+    ``tickets`` and ``seats`` map manifest row number -> ticket_id / seat_id
+    for the rows that were written; ``errors`` is a list of ``(row, message)`` pairs, with row None for
+    failures that affected the whole group.
+    """
+    def __init__(self, flight_id, tickets=None, errors=None, committed=False, seats=None):
+        self.flight_id = flight_id
+        self.tickets = tickets if tickets is not None else {}
+        self.seats = seats if seats is not None else {}
+        self.errors = errors if errors is not None else []
+        self.committed = committed
+
+    @property
+    def ok(self):
+        return self.committed and not self.errors
+
+    @property
+    def booked(self):
+        return len(self.tickets) if self.committed else 0
+
+    def __repr__(self):
+        return (f"GroupBookingResult(flight_id='{self.flight_id}', booked={self.booked}, "
+                f"errors={len(self.errors)})")
+
+
+class BaseDatabaseHandler(ABC):
+    """Storage interface shared by the MySQL and SQLite backends.
+
+    Queries are written once in MySQL syntax with ``%s`` placeholders; backends
+    translate them through ``_sql`` and provide their own connection handling.
+    """
+    Error = Exception
+    # Logged seat changes a flight may gather before a write compacts them
+    # into its stored bitmap, which bounds what every bitmap read replays.
+    SEAT_LOG_COMPACT_THRESHOLD = 256
+    _seat_log_lock = threading.Lock()
+    SCHEMA = (
+        """
+            CREATE TABLE IF NOT EXISTS flights (
+                flight_id VARCHAR(10) PRIMARY KEY,
+                airline VARCHAR(50) NOT NULL,
+                source VARCHAR(50) NOT NULL,
+                destination VARCHAR(50) NOT NULL,
+                departure_time TIME NOT NULL,
+                arrival_time TIME NOT NULL,
+                flight_date DATE NOT NULL,
+                capacity INT NOT NULL
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS passengers (
+                passenger_id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                email VARCHAR(100),
+                age INT,
+                passenger_type VARCHAR(20),
+                preferences VARCHAR(50),
+                special_data VARCHAR(100)
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS seats (
+                seat_id VARCHAR(5) NOT NULL,
+                flight_id VARCHAR(10) NOT NULL,
+                is_available BOOLEAN DEFAULT TRUE,
+                seat_type VARCHAR(20),
+                PRIMARY KEY (seat_id, flight_id),
+                FOREIGN KEY (flight_id) REFERENCES flights(flight_id)
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS bookings (
+                booking_id INT AUTO_INCREMENT PRIMARY KEY,
+                ticket_id VARCHAR(20) UNIQUE NOT NULL,
+                passenger_id INT NOT NULL,
+                flight_id VARCHAR(10) NOT NULL,
+                seat_id VARCHAR(5) NOT NULL,
+                booking_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+                payment_status BOOLEAN DEFAULT FALSE,
+                FOREIGN KEY (passenger_id) REFERENCES passengers(passenger_id),
+                FOREIGN KEY (flight_id) REFERENCES flights(flight_id)
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS baggage (
+                baggage_id INT AUTO_INCREMENT PRIMARY KEY,
+                passenger_id INT NOT NULL,
+                weight DECIMAL(5,2) NOT NULL,
+                fee DECIMAL(6,2) NOT NULL,
+                FOREIGN KEY (passenger_id) REFERENCES passengers(passenger_id)
+            )
+        """,
+    )
+    pool = None
+    connection = None
+    metrics = None
+
+    @abstractmethod
+    def connect(self):
+        pass
+
+    @abstractmethod
+    def disconnect(self):
+        pass
+
+    @abstractmethod
+    def _ensure_connection(self):
+        pass
+
+    def _sql(self, query):
+        return query
+
+    @contextmanager
+    def _connection(self):
+        """Yield a connection for one operation, or None if none is available.
+
+        In pooled mode the connection is checked out for the duration of the
+        block; otherwise the handler's own connection is (re)established.
+        """
+        if self.pool is None:
+            if not self._ensure_connection():
+                yield None
+                return
+            try:
+                yield self.connection
+            except BaseException:
+                self._rollback_quietly(self.connection)
+                raise
+            return
+
+        try:
+            connection = self.pool.acquire()
+        except (self.Error, PoolTimeoutError, CircuitOpenError) as e:
+            print(f"Error acquiring pooled connection: {e}")
+            yield None
+            return
+
+        try:
+            yield connection
+        except BaseException:
+            # A connection that raised mid-operation (or a streaming read that
+            # was abandoned) may be dead, hold unread rows or a half-finished
+            # transaction, so it is closed rather than reused.
+            self.pool.release(connection, discard=True)
+            raise
+        else:
+            self.pool.release(connection)
+
+    def _rollback_quietly(self, connection):
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+
+    def pool_stats(self):
+        return self.pool.stats() if self.pool is not None else None
+
+    @contextmanager
+    def _statement(self, connection, sql):
+        """Cursor for running ``sql``; backends may hand out cached prepared statements."""
+        cursor = connection.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    def execute_query(self, query, params=None):
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return None
+
+                sql = self._sql(query)
+                with self._statement(connection, sql) as cursor:
+                    if params:
+                        cursor.execute(sql, params)
+                    else:
+                        cursor.execute(sql)
+
+                    connection.commit()
+                    note_rows(cursor.rowcount)
+                    return StatementResult(cursor.rowcount, cursor.lastrowid)
+            
+        except self.Error as e:
+            print(f"Error executing query: {e}")
+            note_error()
+            return None
+    
+    def fetch_data(self, query, params=None):
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return None
+
+                sql = self._sql(query)
+                with self._statement(connection, sql) as cursor:
+                    if params:
+                        cursor.execute(sql, params)
+                    else:
+                        cursor.execute(sql)
+
+                    result = cursor.fetchall()
+                    note_rows(len(result))
+                    return result
+            
+        except self.Error as e:
+            print(f"Error fetching data: {e}")
+            note_error()
+            return None
+
+    def _streaming_cursor(self, connection):
+        return connection.cursor()
+
+    def iter_data(self, query, params=None, fetch_size=500, batches=False):
+        """Stream a result set instead of materializing it like ``fetch_data``.
+
+        Rows are pulled from the server ``fetch_size`` at a time and yielded one
+        by one, or as lists when ``batches`` is set. The connection stays busy
+        until the iterator is exhausted or closed, so in unpooled mode the
+        handler should not run other queries while iterating.
+        """
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    return
+
+                cursor = self._streaming_cursor(connection)
+                try:
+                    if params:
+                        cursor.execute(self._sql(query), params)
+                    else:
+                        cursor.execute(self._sql(query))
+
+                    while True:
+                        rows = cursor.fetchmany(fetch_size)
+                        if not rows:
+                            break
+                        if batches:
+                            yield rows
+                        else:
+                            yield from rows
+                finally:
+                    cursor.close()
+
+        except self.Error as e:
+            print(f"Error streaming data: {e}")
+
+    @instrumented
+    def create_tables(self):
+        cursor = None
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    return False
+
+                cursor = connection.cursor()
+
+                for statement in self.SCHEMA:
+                    cursor.execute(self._sql(statement))
+
+                connection.commit()
+                cursor.close()
+
+        except self.Error as e:
+            print(f"Error creating tables: {e}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            return False
+
+        return self.migrate() is not None
+
+    def migrate(self, target=None):
+        return MigrationRunner(self).migrate(target)
+
+    def explain(self, query, params=None):
+        return self.fetch_data("EXPLAIN " + query, params)
+
+    def indexes_used(self, query, params=None):
+        """Names of the indexes the planner picks for ``query``."""
+        cursor = None
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    return None
+
+                cursor = connection.cursor()
+                cursor.execute(self._sql("EXPLAIN " + query), params)
+                columns = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+                cursor.close()
+                key = columns.index("key")
+                return {row[key] for row in rows if row[key]}
+
+        except self.Error as e:
+            print(f"Error explaining query: {e}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            return None
+    
+    @instrumented
+    def add_flight(self, flight_id, airline, source, destination, departure_time, arrival_time, flight_date, capacity,
+                   aircraft_type=None):
+        query = """
+            INSERT IGNORE INTO flights (flight_id, airline, source, destination, departure_time, arrival_time, flight_date, capacity, aircraft_type)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        params = (flight_id, airline, source, destination, departure_time, arrival_time, flight_date, capacity,
+                  aircraft_type)
+        cursor = self.execute_query(query, params)
+        if cursor:
+            cursor.close()
+            return True
+        return False
+    
+    @instrumented
+    def get_all_flights(self):
+        query = "SELECT * FROM flights"
+        return self.fetch_data(query)
+    
+    def iter_all_flights(self, fetch_size=500):
+        return self.iter_data("SELECT * FROM flights", fetch_size=fetch_size)
+
+    @instrumented
+    def count_flights(self):
+        result = self.fetch_data("SELECT COUNT(*) FROM flights")
+        return result[0][0] if result else 0
+    
+    @instrumented
+    def get_flight_by_id(self, flight_id):
+        query = "SELECT * FROM flights WHERE flight_id = %s"
+        result = self.fetch_data(query, (flight_id,))
+        if result and len(result) > 0:
+            return result[0]
+        return None
+    
+    @instrumented
+    def initialize_seats_for_flight(self, flight_id, seat_map, seat_types=None):
+        """Insert one flight's {seat_id: is_available} map.
+
+        ``seat_types`` maps seat_id -> seat type, normally the shared lookup
+        table of the flight's aircraft layout; without it the type is derived
+        from the seat letter.
+        """
+        query = """
+            INSERT IGNORE INTO seats (seat_id, flight_id, is_available, seat_type)
+            VALUES (%s, %s, %s, %s)
+        """
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return False
+
+                sql = self._sql(query)
+                with self._statement(connection, sql) as cursor:
+                    for seat_id, is_available in seat_map.items():
+                        seat_type = seat_types[seat_id] if seat_types else seat_type_for(seat_id)
+                        params = (seat_id, flight_id, is_available, seat_type)
+                        cursor.execute(sql, params)
+                        note_rows(cursor.rowcount)
+
+                self._rebuild_seat_bitmaps(connection, [flight_id])
+                connection.commit()
+                return True
+
+        except self.Error as e:
+            print(f"Error initializing seats: {e}")
+            note_error()
+            return False
+    
+    @instrumented
+    def initialize_seats_bulk(self, seat_maps, chunk_size=500, seat_types=None):
+        """Insert the seat maps of many flights in a single transaction.
+
+        ``seat_maps`` maps flight_id -> {seat_id: is_available} and the optional
+        ``seat_types`` maps flight_id -> {seat_id: seat_type}; flights on the
+        same aircraft can share one layout table there. Seats are written
+        with multi-row ``INSERT IGNORE`` statements of at most ``chunk_size`` rows,
+        each chunk covering one flight so the per-flight insert counts stay exact.
+        Returns {flight_id: seats_inserted}, or None if nothing was committed.
+        """
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return None
+
+                counts = {}
+                for flight_id, seat_map in seat_maps.items():
+                    types = seat_types.get(flight_id) if seat_types else None
+                    rows = [(seat_id, flight_id, is_available, types[seat_id] if types else seat_type_for(seat_id))
+                            for seat_id, is_available in seat_map.items()]
+                    inserted = 0
+                    for start in range(0, len(rows), chunk_size):
+                        chunk = rows[start:start + chunk_size]
+                        params = [value for row in chunk for value in row]
+                        sql = self._sql(_multi_row_seat_insert(len(chunk)))
+                        with self._statement(connection, sql) as cursor:
+                            cursor.execute(sql, params)
+                            inserted += cursor.rowcount
+                    counts[flight_id] = inserted
+                    note_rows(inserted)
+
+                self._rebuild_seat_bitmaps(connection, list(seat_maps))
+                connection.commit()
+                return counts
+
+        except self.Error as e:
+            print(f"Error bulk initializing seats: {e}")
+            note_error()
+            return None
+
+    @instrumented
+    def get_flights_by_route(self, source, destination, date_from, date_to=None):
+        params = (source, destination, date_from, date_to or date_from)
+        return self.fetch_data(FLIGHTS_BY_ROUTE_QUERY, params)
+    
+    @instrumented
+    def get_available_seats(self, flight_id):
+        return self.fetch_data(AVAILABLE_SEATS_QUERY, (flight_id,))
+    
+    @instrumented
+    def update_seat_availability(self, seat_id, flight_id, is_available):
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return False
+
+                sql = self._sql(SET_SEAT_AVAILABILITY_QUERY)
+                with self._statement(connection, sql) as cursor:
+                    cursor.execute(sql, (is_available, seat_id, flight_id))
+                    changed = cursor.rowcount
+
+                if changed:
+                    self._log_seat_changes(connection, flight_id, [seat_id], is_available)
+                connection.commit()
+                note_rows(changed)
+                self._compact_if_due(connection, flight_id)
+                return True
+
+        except self.Error as e:
+            print(f"Error updating seat availability: {e}")
+            note_error()
+            return False
+
+    @instrumented
+    def get_availability_bitmaps(self, flight_ids, chunk_size=500):
+        """Packed seat availability for many flights, one query per ``chunk_size`` flights.
+
+        Returns {flight_id: SeatBitmap}; flights without seats are left out.
+        Seat changes logged since a bitmap was stored are applied in memory,
+        and flights without a stored bitmap get one built from their seat
+        rows. Nothing is written; ``compact_seat_bitmaps`` stores the results.
+        """
+        flight_ids = list(dict.fromkeys(flight_ids))
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return None
+
+                bitmaps = {}
+                for start in range(0, len(flight_ids), chunk_size):
+                    chunk = flight_ids[start:start + chunk_size]
+                    sql = self._sql(_with_in_list(SEAT_BITMAPS_QUERY, len(chunk)))
+                    with self._statement(connection, sql) as cursor:
+                        cursor.execute(sql, chunk)
+                        for flight_id, seat_ids, seat_types, available in cursor.fetchall():
+                            bitmaps[flight_id] = SeatBitmap(flight_id, seat_ids, seat_types, available)
+
+                    sql = self._sql(_with_in_list(SEAT_CHANGES_QUERY, len(chunk)))
+                    with self._statement(connection, sql) as cursor:
+                        cursor.execute(sql, chunk)
+                        for flight_id, seat_id, is_available in cursor.fetchall():
+                            bitmap = bitmaps.get(flight_id)
+                            if bitmap is None:
+                                continue
+                            if seat_id in bitmap:
+                                bitmap.set_available(seat_id, is_available)
+                            else:
+                                # Seats added since the bitmap was stored
+                                del bitmaps[flight_id]
+
+                missing = [flight_id for flight_id in flight_ids if flight_id not in bitmaps]
+                if missing:
+                    bitmaps.update(self._bitmaps_from_seats(connection, missing, SEAT_ROWS_FOR_FLIGHTS_QUERY))
+                connection.rollback()
+                note_rows(len(bitmaps))
+                return bitmaps
+
+        except self.Error as e:
+            print(f"Error fetching seat bitmaps: {e}")
+            note_error()
+            return None
+
+    def count_free_seats_by_type(self, flight_ids):
+        """{flight_id: {seat_type: free_seats}} computed from the packed bitmaps."""
+        bitmaps = self.get_availability_bitmaps(flight_ids)
+        if bitmaps is None:
+            return None
+        return {flight_id: bitmap.count_free_by_type() for flight_id, bitmap in bitmaps.items()}
+
+    @instrumented
+    def compact_seat_bitmaps(self, flight_ids=None):
+        """Fold logged seat changes into the stored bitmaps.
+
+        Rebuilds the bitmaps of ``flight_ids`` (by default every flight with
+        logged changes or without a stored bitmap) from their seat rows and
+        clears their change log. The seat rows are read with a locking read,
+        so bookings on those flights wait for it. Returns the number of
+        bitmaps stored, or None on error. Seat writes already compact a flight
+        each time they have logged ``SEAT_LOG_COMPACT_THRESHOLD`` changes for
+        it; this is the full sweep, e.g. for a flight no write has touched since
+        its bitmap went missing.
+        """
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return None
+
+                if flight_ids is None:
+                    sql = self._sql(FLIGHTS_TO_COMPACT_QUERY)
+                    with self._statement(connection, sql) as cursor:
+                        cursor.execute(sql)
+                        flight_ids = [row[0] for row in cursor.fetchall()]
+                bitmaps = self._rebuild_seat_bitmaps(connection, list(flight_ids))
+                connection.commit()
+                note_rows(len(bitmaps))
+                return len(bitmaps)
+
+        except self.Error as e:
+            print(f"Error compacting seat bitmaps: {e}")
+            note_error()
+            return None
+
+    def _bitmaps_from_seats(self, connection, flight_ids, query, chunk_size=500):
+        rows_by_flight = {}
+        for start in range(0, len(flight_ids), chunk_size):
+            chunk = flight_ids[start:start + chunk_size]
+            sql = self._sql(_with_in_list(query, len(chunk)))
+            with self._statement(connection, sql) as cursor:
+                cursor.execute(sql, chunk)
+                for flight_id, seat_id, seat_type, is_available in cursor.fetchall():
+                    rows_by_flight.setdefault(flight_id, []).append((seat_id, seat_type, is_available))
+        return {flight_id: SeatBitmap.from_rows(flight_id, rows) for flight_id, rows in rows_by_flight.items()}
+
+    def _rebuild_seat_bitmaps(self, connection, flight_ids, chunk_size=500):
+        """Recompute and store the bitmaps of ``flight_ids`` and clear their change log.
+
+        Runs inside the caller's transaction; the seat rows are read with a
+        locking read, so no change to them can be logged until the caller
+        commits and the stored bitmap already covers every cleared change.
+        """
+        bitmaps = self._bitmaps_from_seats(connection, flight_ids, LOCK_SEAT_ROWS_FOR_FLIGHTS_QUERY, chunk_size)
+        if bitmaps:
+            sql = self._sql(STORE_SEAT_BITMAP_QUERY)
+            with self._statement(connection, sql) as cursor:
+                cursor.executemany(sql, [bitmap.to_row() for bitmap in bitmaps.values()])
+        for start in range(0, len(flight_ids), chunk_size):
+            chunk = flight_ids[start:start + chunk_size]
+            sql = self._sql(_with_in_list(CLEAR_SEAT_CHANGES_QUERY, len(chunk)))
+            with self._statement(connection, sql) as cursor:
+                cursor.execute(sql, chunk)
+        return bitmaps
+
+    def _log_seat_changes(self, connection, flight_id, seat_ids, is_available):
+        """Record new seat states for the bitmaps, in the caller's transaction.
+
+        This is a plain insert, so concurrent bookings on one flight never
+        wait on each other here; the seat rows they already hold order the
+        changes of each seat.
+        """
+        sql = self._sql(LOG_SEAT_CHANGE_QUERY)
+        with self._statement(connection, sql) as cursor:
+            cursor.executemany(sql, [(flight_id, seat_id, is_available) for seat_id in seat_ids])
+        with self._seat_log_lock:
+            counts = self.__dict__.setdefault("_seat_log_counts", {})
+            counts[flight_id] = counts.get(flight_id, 0) + len(seat_ids)
+
+    def _compact_if_due(self, connection, flight_id):
+        """Fold a flight's change log into its bitmap once this handler has logged
+        ``SEAT_LOG_COMPACT_THRESHOLD`` changes for it; call after the write commits.
+
+        Runs as its own transaction on the caller's connection. A failure only
+        postpones compaction, since the write itself is already committed.
+        """
+        with self._seat_log_lock:
+            counts = self.__dict__.setdefault("_seat_log_counts", {})
+            if counts.get(flight_id, 0) < self.SEAT_LOG_COMPACT_THRESHOLD:
+                return
+            counts.pop(flight_id)
+        try:
+            self._rebuild_seat_bitmaps(connection, [flight_id])
+            connection.commit()
+        except self.Error as e:
+            print(f"Error compacting seat bitmaps: {e}")
+            connection.rollback()
+    
+    @instrumented
+    def add_passenger(self, name, email, age, passenger_type, preferences, special_data=None):
+        params = (name, email, age, passenger_type, preferences, special_data)
+        cursor = self.execute_query(INSERT_PASSENGER_QUERY, params)
+        if cursor:
+            passenger_id = cursor.lastrowid
+            cursor.close()
+            return passenger_id
+        return None
+    
+    @instrumented
+    def get_passenger_by_id(self, passenger_id):
+        query = "SELECT * FROM passengers WHERE passenger_id = %s"
+        result = self.fetch_data(query, (passenger_id,))
+        if result and len(result) > 0:
+            return result[0]
+        return None
+    
+    @instrumented
+    def create_booking(self, ticket_id, passenger_id, flight_id, seat_id, payment_status=False):
+        """Book a seat; False unless the flight has that seat row and it is still free."""
+        return self.book_seat(ticket_id, passenger_id, flight_id, seat_id, payment_status).ok
+
+    @instrumented
+    def book_seat(self, ticket_id, passenger_id, flight_id, seat_id, payment_status=False):
+        """Claim a seat and record the booking in a single transaction.
+
+        The seat is taken with a conditional UPDATE, which row-locks it until the
+        commit, so two concurrent bookings of the same seat cannot both succeed.
+        """
+        return self._book(ticket_id, flight_id, seat_id, payment_status, passenger_id=passenger_id)
+
+    @instrumented
+    def book_new_passenger(self, ticket_id, flight_id, seat_id, passenger, baggage=None, payment_status=False):
+        """Add a passenger, their baggage and their booking in a single transaction.
+
+        ``passenger`` holds the ``add_passenger`` fields and ``baggage`` is an
+        optional ``(weight, fee)`` pair. The seat is claimed first, as in
+        ``book_seat``, so a conflict writes nothing at all. The result carries
+        the new ``passenger_id``.
+        """
+        return self._book(ticket_id, flight_id, seat_id, payment_status, passenger=passenger, baggage=baggage)
+
+    def _book(self, ticket_id, flight_id, seat_id, payment_status, passenger_id=None, passenger=None, baggage=None):
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    return BookingResult(BookingResult.FAILED, ticket_id, "No database connection")
+
+                claim_sql = self._sql(CLAIM_SEAT_QUERY)
+                with self._statement(connection, claim_sql) as cursor:
+                    cursor.execute(claim_sql, (seat_id, flight_id))
+                    claimed = cursor.rowcount == 1
+
+                if not claimed:
+                    connection.rollback()
+                    return BookingResult(BookingResult.CONFLICT, ticket_id,
+                                         f"Seat {seat_id} on {flight_id} is no longer available")
+
+                if passenger is not None:
+                    sql = self._sql(INSERT_PASSENGER_QUERY)
+                    with self._statement(connection, sql) as cursor:
+                        cursor.execute(sql, (passenger["name"], passenger.get("email"), passenger.get("age"),
+                                             passenger.get("passenger_type"), passenger.get("preferences"),
+                                             passenger.get("special_data")))
+                        passenger_id = cursor.lastrowid
+                    if baggage is not None:
+                        self._insert_rows(connection, INSERT_BAGGAGE_STATEMENT, "(%s, %s, %s)",
+                                          [(passenger_id,) + tuple(baggage)], 1)
+
+                self._log_seat_changes(connection, flight_id, [seat_id], False)
+
+                insert_sql = self._sql(INSERT_BOOKING_QUERY)
+                with self._statement(connection, insert_sql) as cursor:
+                    cursor.execute(insert_sql, (ticket_id, passenger_id, flight_id, seat_id, payment_status))
+
+                connection.commit()
+                note_rows(1)
+                self._compact_if_due(connection, flight_id)
+                return BookingResult(BookingResult.BOOKED, ticket_id, passenger_id=passenger_id)
+
+        except self.Error as e:
+            print(f"Error booking seat: {e}")
+            note_error()
+            return BookingResult(BookingResult.FAILED, ticket_id, str(e))
+    
+    @instrumented
+    def book_group(self, flight_id, entries, allow_partial=False, chunk_size=500):
+        """Book a validated group manifest on one flight in a single transaction.
+
+        Each entry is a dict with ``row``, the ``add_passenger`` fields,
+        ``seat_id``, ``ticket_id``, ``payment_status``, ``baggage_weight`` and
+        ``baggage_fee``. Requested seats are locked and claimed with one
+        statement per ``chunk_size`` seats, and bookings and baggage go in as
+        multi-row inserts. Seats that are already taken are reported per row;
+        unless ``allow_partial`` is set, any such conflict books nobody.
+        """
+        result = GroupBookingResult(flight_id)
+        try:
+            with self._connection() as connection:
+                if connection is None:
+                    note_error()
+                    result.errors.append((None, "No database connection"))
+                    return result
+
+                seat_ids = [entry["seat_id"] for entry in entries]
+                free = set()
+                for start in range(0, len(seat_ids), chunk_size):
+                    chunk = seat_ids[start:start + chunk_size]
+                    sql = self._sql(_with_in_list(LOCK_FREE_SEATS_QUERY, len(chunk)))
+                    with self._statement(connection, sql) as cursor:
+                        cursor.execute(sql, [flight_id] + chunk)
+                        free.update(row[0] for row in cursor.fetchall())
+
+                for entry in entries:
+                    if entry["seat_id"] not in free:
+                        result.errors.append(
+                            (entry["row"], f"Seat {entry['seat_id']} on {flight_id} is not available"))
+                entries = [entry for entry in entries if entry["seat_id"] in free]
+                if not entries or (result.errors and not allow_partial):
+                    connection.rollback()
+                    return result
+
+                claimed = [entry["seat_id"] for entry in entries]
+                updated = 0
+                for start in range(0, len(claimed), chunk_size):
+                    chunk = claimed[start:start + chunk_size]
+                    sql = self._sql(_with_in_list(CLAIM_SEATS_QUERY, len(chunk)))
+                    with self._statement(connection, sql) as cursor:
+                        cursor.execute(sql, [flight_id] + chunk)
+                        updated += cursor.rowcount
+                if updated != len(claimed):
+                    # Only possible where the backend cannot lock rows on read.
+                    connection.rollback()
+                    result.errors.append((None, "Seat availability changed during the booking, please retry"))
+                    return result
+                self._log_seat_changes(connection, flight_id, claimed, False)
+
+                # Passenger ids come from lastrowid, which multi-row inserts do
+                # not report reliably, so passengers are inserted one by one on
+                # a single prepared statement.
+                passenger_ids = []
+                sql = self._sql(INSERT_PASSENGER_QUERY)
+                with self._statement(connection, sql) as cursor:
+                    for entry in entries:
+                        cursor.execute(sql, (entry["name"], entry["email"], entry["age"],
+                                             entry["passenger_type"], entry["preferences"],
+                                             entry["special_data"]))
+                        passenger_ids.append(cursor.lastrowid)
+
+                bookings = [(entry["ticket_id"], passenger_id, flight_id, entry["seat_id"], entry["payment_status"])
+                            for entry, passenger_id in zip(entries, passenger_ids)]
+                baggage = [(passenger_id, entry["baggage_weight"], entry["baggage_fee"])
+                           for entry, passenger_id in zip(entries, passenger_ids) if entry["baggage_weight"] > 0]
+                self._insert_rows(connection, INSERT_BOOKINGS_STATEMENT, "(%s, %s, %s, %s, %s)",
+                                  bookings, chunk_size)
+                self._insert_rows(connection, INSERT_BAGGAGE_STATEMENT, "(%s, %s, %s)", baggage, chunk_size)
+
+                connection.commit()
+                self._compact_if_due(connection, flight_id)
+                result.committed = True
+                result.tickets = {entry["row"]: entry["ticket_id"] for entry in entries}
+                result.seats = {entry["row"]: entry["seat_id"] for entry in entries}
+                note_rows(len(entries))
+                return result
+
+        except self.Error as e:
+            print(f"Error booking group: {e}")
+            note_error()
+            return GroupBookingResult(flight_id, errors=[(None, str(e))])
+
+    def _insert_rows(self, connection, statement, row_placeholders, rows, chunk_size):
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            sql = self._sql(_multi_row_insert(statement, row_placeholders, len(chunk)))
+            with self._statement(connection, sql) as cursor:
+                cursor.execute(sql, [value for row in chunk for value in row])
+
+    @instrumented
+    def update_booking_payment(self, ticket_id, payment_status):
+        query = """
+            UPDATE bookings 
+            SET payment_status = %s 
+            WHERE ticket_id = %s
+        """
+        params = (payment_status, ticket_id)
+        cursor = self.execute_query(query, params)
+        if cursor:
+            cursor.close()
+            return True
+        return False
+    
+    @instrumented
+    def get_booking_by_ticket(self, ticket_id):
+        result = self.fetch_data(BOOKING_BY_TICKET_QUERY, (ticket_id,))
+        if result and len(result) > 0:
+            return result[0]
+        return None
+    
+    @instrumented
+    def add_baggage(self, passenger_id, weight, fee):
+        query = """
+            INSERT INTO baggage (passenger_id, weight, fee)
+            VALUES (%s, %s, %s)
+        """
+        params = (passenger_id, weight, fee)
+        cursor = self.execute_query(query, params)
+        if cursor:
+            cursor.close()
+            return True
+        return False
+    
+    @instrumented
+    def get_baggage_by_passenger(self, passenger_id):
+        return self.fetch_data(BAGGAGE_BY_PASSENGER_QUERY, (passenger_id,))
\ No newline at end of file
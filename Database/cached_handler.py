@@ -0,0 +1,118 @@
+import threading
+
+from utilities.cache import LRUCache
+
+_ALL_FLIGHTS = "__all__"
+
+
+class DatabaseCacheProxy:
+    """Read-through cache in front of a database handler.
+
+    Flight rows rarely change, so they are kept in a TTL + LRU cache. Seat
+    availability is cached per flight and invalidated by every write that goes
+    through this proxy; a raw ``execute_query`` may touch any table, so it
+    clears both caches. The short ``seat_ttl`` bounds staleness from writers
+    in other processes. Cached results are shared and must be treated as read-only.
+    Anything not overridden here is forwarded to the wrapped handler.
+    """
+
+    def __init__(self, db, flight_ttl=300, max_flights=1024, seat_ttl=30, max_seat_maps=1024):
+        self._db = db
+        self.flight_cache = LRUCache(max_flights, ttl=flight_ttl)
+        self.seat_cache = LRUCache(max_seat_maps, ttl=seat_ttl)
+        self._versions = {}
+        self._generation = 0
+        self._versions_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def get_flight_by_id(self, flight_id):
+        return self._read_through(self.flight_cache, ("flight", flight_id),
+                                  lambda: self._db.get_flight_by_id(flight_id))
+
+    def get_all_flights(self):
+        return self._read_through(self.flight_cache, _ALL_FLIGHTS, self._db.get_all_flights)
+
+    def get_available_seats(self, flight_id):
+        return self._read_through(self.seat_cache, flight_id,
+                                  lambda: self._db.get_available_seats(flight_id))
+
+    def execute_query(self, query, params=None):
+        result = self._db.execute_query(query, params)
+        self._invalidate_all()
+        return result
+
+    def add_flight(self, flight_id, *args, **kwargs):
+        result = self._db.add_flight(flight_id, *args, **kwargs)
+        self._invalidate(self.flight_cache, ("flight", flight_id))
+        self._invalidate(self.flight_cache, _ALL_FLIGHTS)
+        return result
+
+    def initialize_seats_for_flight(self, flight_id, seat_map, *args, **kwargs):
+        result = self._db.initialize_seats_for_flight(flight_id, seat_map, *args, **kwargs)
+        self._invalidate(self.seat_cache, flight_id)
+        return result
+
+    def initialize_seats_bulk(self, seat_maps, *args, **kwargs):
+        result = self._db.initialize_seats_bulk(seat_maps, *args, **kwargs)
+        for flight_id in seat_maps:
+            self._invalidate(self.seat_cache, flight_id)
+        return result
+
+    def update_seat_availability(self, seat_id, flight_id, is_available):
+        result = self._db.update_seat_availability(seat_id, flight_id, is_available)
+        self._invalidate(self.seat_cache, flight_id)
+        return result
+
+    def book_seat(self, ticket_id, passenger_id, flight_id, seat_id, payment_status=False):
+        # Conflicts invalidate too: they mean the cached seat map was stale.
+        result = self._db.book_seat(ticket_id, passenger_id, flight_id, seat_id, payment_status)
+        self._invalidate(self.seat_cache, flight_id)
+        return result
+
+    def book_new_passenger(self, ticket_id, flight_id, seat_id, *args, **kwargs):
+        result = self._db.book_new_passenger(ticket_id, flight_id, seat_id, *args, **kwargs)
+        self._invalidate(self.seat_cache, flight_id)
+        return result
+
+    def book_group(self, flight_id, entries, *args, **kwargs):
+        result = self._db.book_group(flight_id, entries, *args, **kwargs)
+        self._invalidate(self.seat_cache, flight_id)
+        return result
+
+    def create_booking(self, ticket_id, passenger_id, flight_id, seat_id, payment_status=False):
+        return self.book_seat(ticket_id, passenger_id, flight_id, seat_id, payment_status).ok
+
+    def cache_stats(self):
+        return {
+            "flights": self.flight_cache.stats(),
+            "seats": self.seat_cache.stats(),
+        }
+
+    def _read_through(self, cache, key, load):
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        version = self._version(cache, key)
+        result = load()
+        # Skip the fill if a write invalidated the key while we were loading.
+        if result is not None and self._version(cache, key) == version:
+            cache.set(key, result)
+        return result
+
+    def _invalidate(self, cache, key):
+        with self._versions_lock:
+            self._versions[(id(cache), key)] = self._versions.get((id(cache), key), 0) + 1
+        cache.invalidate(key)
+
+    def _invalidate_all(self):
+        with self._versions_lock:
+            self._generation += 1
+        self.flight_cache.clear()
+        self.seat_cache.clear()
+
+    def _version(self, cache, key):
+        with self._versions_lock:
+            return self._generation, self._versions.get((id(cache), key), 0)
@@ -0,0 +1,250 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out before the timeout."""
+
+
+class _PooledConnection:
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    Connections are created lazily by ``factory`` up to ``max_size``. Instead of
+    pinging on every query, a connection is only health-checked when it is
+    checked out after sitting idle for ``health_check_interval`` seconds, and it
+    is recycled once it is older than ``max_lifetime`` or idle longer than
+    ``max_idle``.
+    """
+
+    def __init__(self, factory, max_size=10, ping=None, checkout_timeout=10.0,
+                 health_check_interval=30.0, max_lifetime=1800.0, max_idle=600.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._factory = factory
+        self._ping = ping
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+
+        self._idle = []
+        self._in_use = {}
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+        self._checkouts = 0
+        self._misses = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._created = 0
+        self._recycled = 0
+        self._failed_health_checks = 0
+
+    def acquire(self, timeout=None):
+        """Check out a raw connection, creating one if the pool has room."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        waited = False
+
+        with self._lock:
+            if self._closed:
+                raise PoolTimeoutError("Connection pool is closed")
+            self._checkouts += 1
+            while True:
+                entry = self._take_idle()
+                if entry is not None:
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._record_wait(time.monotonic() - started)
+                    raise PoolTimeoutError(f"No connection available after {timeout:.1f}s")
+                waited = True
+                self._available.wait(remaining)
+            if entry is None or waited:
+                self._misses += 1
+            if waited:
+                self._waits += 1
+            self._record_wait(time.monotonic() - started)
+
+        if entry is not None and not self._check_health(entry):
+            # Keep the slot reserved and replace the dead connection in place.
+            self._close_raw(entry.raw)
+            entry = None
+
+        if entry is None:
+            try:
+                entry = _PooledConnection(self._factory())
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._available.notify()
+                raise
+            with self._lock:
+                self._created += 1
+
+        with self._lock:
+            self._in_use[id(entry.raw)] = entry
+        return entry.raw
+
+    def release(self, raw, discard=False):
+        """Return a connection checked out with ``acquire``."""
+        with self._lock:
+            entry = self._in_use.pop(id(raw), None)
+        if entry is None:
+            return
+
+        now = time.monotonic()
+        if discard or self._closed or now - entry.created_at > self.max_lifetime:
+            if not discard and not self._closed:
+                with self._lock:
+                    self._recycled += 1
+            self._discard(entry)
+            return
+
+        entry.last_used = now
+        with self._lock:
+            self._idle.append(entry)
+            self._available.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        raw = self.acquire(timeout)
+        try:
+            yield raw
+        except BaseException:
+            # Same rule as the handlers: a connection interrupted mid-operation,
+            # even by KeyboardInterrupt, may be in any state and is not reused.
+            self.release(raw, discard=True)
+            raise
+        else:
+            self.release(raw)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self._size,
+                "max_size": self.max_size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "misses": self._misses,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "total_wait_time": self._total_wait,
+                "avg_wait_time": self._total_wait / self._checkouts if self._checkouts else 0.0,
+                "max_wait_time": self._max_wait,
+                "created": self._created,
+                "recycled": self._recycled,
+                "failed_health_checks": self._failed_health_checks,
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+    def _take_idle(self):
+        # Called with the lock held. Most recently used connections are reused
+        # first so that surplus connections age out through ``max_idle``.
+        now = time.monotonic()
+        while self._idle:
+            entry = self._idle.pop()
+            if now - entry.last_used > self.max_idle or now - entry.created_at > self.max_lifetime:
+                self._recycled += 1
+                self._size -= 1
+                self._close_raw(entry.raw)
+                continue
+            return entry
+        return None
+
+    def _check_health(self, entry):
+        if self._ping is None:
+            return True
+        if time.monotonic() - entry.last_used < self.health_check_interval:
+            return True
+        if self._is_alive(entry.raw):
+            return True
+        with self._lock:
+            self._failed_health_checks += 1
+        return False
+
+    def _is_alive(self, raw):
+        if self._ping is None:
+            return True
+        try:
+            return bool(self._ping(raw))
+        except Exception:
+            return False
+
+    def _discard(self, entry):
+        self._close_raw(entry.raw)
+        with self._lock:
+            self._size -= 1
+            self._available.notify()
+
+    def _close_raw(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _record_wait(self, waited):
+        self._total_wait += waited
+        if waited > self._max_wait:
+            self._max_wait = waited
+
+
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_pool(key, factory, **options):
+    """Return the process-wide pool registered under ``key``, creating it once.
+
+    A caller that finds the pool already registered must ask for the same
+    settings; asking for a different ``max_size`` or timeout raises ValueError
+    rather than silently handing back a pool configured by someone else. The
+    ``ping`` callable is not compared, since each handler passes its own.
+    """
+    with _shared_pools_lock:
+        pool = _shared_pools.get(key)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(factory, **options)
+            _shared_pools[key] = pool
+            return pool
+
+        mismatched = sorted(name for name, value in options.items()
+                            if name != "ping" and getattr(pool, name) != value)
+        if mismatched:
+            settings = ", ".join(f"{name}={getattr(pool, name)!r} (asked for {options[name]!r})"
+                                 for name in mismatched)
+            raise ValueError(f"Shared pool {key!r} already exists with {settings}")
+        return pool
+
+
+def close_shared_pools():
+    with _shared_pools_lock:
+        pools = list(_shared_pools.values())
+        _shared_pools.clear()
+    for pool in pools:
+        pool.close()
@@ -1,45 +1,94 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import mysql.connector
 from mysql.connector import Error
-from datetime import datetime
 
-class DatabaseHandler:
-    def __init__(self, host="localhost", user="root", password="11", database="flight_booking"):
+from Database.base_handler import BaseDatabaseHandler, BookingResult, StatementResult, seat_type_for
+from Database.connection_pool import get_shared_pool, PoolTimeoutError
+from Database.resilience import CircuitOpenError, Reconnector
+
+
+class DatabaseHandler(BaseDatabaseHandler):
+    Error = Error
+
+    def __init__(self, host="localhost", user="root", password="11", database="flight_booking",
+                 pool_size=None, statement_cache_size=32, connect_timeout=5,
+                 retry_policy=None, circuit_breaker=None, port=3306, **pool_options):
         self.host = host
+        self.port = port
         self.user = user
         self.password = password
         self.database = database
+        self.connect_timeout = connect_timeout
         self.connection = None
-        
-    def connect(self):
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database
+        self.pool = None
+        # Every new connection, pooled or not, goes through backoff and the
+        # circuit breaker so an outage cannot stall callers on repeated connects.
+        self.reconnector = Reconnector(self._open_connection, retry_policy, circuit_breaker, retry_on=(Error,))
+        # Prepared statements per connection, keyed by SQL text (LRU).
+        self.statement_cache_size = statement_cache_size
+        self._statements = weakref.WeakKeyDictionary()
+        self._statements_lock = threading.Lock()
+        if pool_size:
+            # Handlers created with the same DSN share one pool, so every window,
+            # the payment path and headless services draw from the same connections.
+            # The password is part of the DSN (hashed, to keep it out of the key).
+            password_hash = hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+            self.pool = get_shared_pool(
+                ("mysql", host, port, user, password_hash, database),
+                self.reconnector.connect,
+                max_size=pool_size,
+                ping=lambda conn: conn.is_connected(),
+                **pool_options
             )
-            
-            if self.connection.is_connected():
-                return True
-                
+
+    def _open_connection(self):
+        try:
+            return self._connect_to(self.database)
         except Error as e:
             if e.errno == 1049:
                 print(f"Database '{self.database}' doesn't exist. Creating it...")
                 if self.create_database():
-                    return self.connect()
-                else:
-                    return False
-            else:
-                print(f"Error connecting to MySQL database: {e}")
-                return False
+                    return self._connect_to(self.database)
+            raise
+
+    def _connect_to(self, database):
+        options = {"database": database} if database else {}
+        return mysql.connector.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            connection_timeout=self.connect_timeout,
+            **options
+        )
+
+    def connect(self):
+        try:
+            if self.pool is not None:
+                with self.pool.connection():
+                    return True
+
+            self.connection = self.reconnector.connect()
+            return self.connection.is_connected()
+
+        except CircuitOpenError as e:
+            print(f"MySQL unavailable: {e}")
+            return False
+        except (Error, PoolTimeoutError) as e:
+            print(f"Error connecting to MySQL database: {e}")
+            return False
+
+    def reconnect_stats(self):
+        return self.reconnector.stats()
     
     def create_database(self):
         try:
-            temp_connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password
-            )
+            temp_connection = self._connect_to(None)
             
             if temp_connection.is_connected():
                 cursor = temp_connection.cursor()
@@ -55,6 +104,14 @@ class DatabaseHandler:
             return False
         
     def disconnect(self):
+        with self._statements_lock:
+            statements = self._statements.pop(self.connection, None) if self.connection else None
+        for cursor in (statements or {}).values():
+            self._close_cursor(cursor)
+        if self.pool is not None:
+            # The pool is shared with other handlers; it is closed with
+            # close_shared_pools() when the application shuts down.
+            return
         try:
             if self.connection and self.connection.is_connected():
                 try:
@@ -65,288 +122,52 @@ class DatabaseHandler:
         except Exception as e:
             pass
     
-    def _ensure_connection(self):
-        try:
-            if self.connection and self.connection.is_connected():
-                return True
-            return self.connect()
-        except:
-            return self.connect()
-    
-    def execute_query(self, query, params=None):
-        cursor = None
-        try:
-            if not self._ensure_connection():
-                return None
-                
-            cursor = self.connection.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-                
-            self.connection.commit()
-            return cursor
-            
-        except Error as e:
-            print(f"Error executing query: {e}")
-            if cursor:
-                try:
-                    cursor.close()
-                except:
-                    pass
-            return None
-    
-    def fetch_data(self, query, params=None):
-        cursor = None
+    @contextmanager
+    def _statement(self, connection, sql):
+        if not self.statement_cache_size:
+            with super()._statement(connection, sql) as cursor:
+                yield cursor
+            return
+
+        with self._statements_lock:
+            statements = self._statements.get(connection)
+            if statements is None:
+                statements = self._statements[connection] = OrderedDict()
+            cursor = statements.pop(sql, None)
+
+        if cursor is None:
+            cursor = connection.cursor(prepared=True)
+
         try:
-            if not self._ensure_connection():
-                return None
-                
-            cursor = self.connection.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-                
-            result = cursor.fetchall()
-            cursor.close()
-            return result
-            
-        except Error as e:
-            print(f"Error fetching data: {e}")
-            if cursor:
-                try:
-                    cursor.close()
-                except:
-                    pass
-            return None
+            yield cursor
+        except BaseException:
+            # Never reuse a statement that failed; it is re-prepared next time.
+            self._close_cursor(cursor)
+            raise
+
+        with self._statements_lock:
+            # A nested use of the same SQL prepared its own cursor; keep one, close the other.
+            replaced = statements.pop(sql, None)
+            statements[sql] = cursor
+            evicted = statements.popitem(last=False)[1] if len(statements) > self.statement_cache_size else None
+        for stale in (replaced, evicted):
+            if stale is not None:
+                self._close_cursor(stale)
 
-    def create_tables(self):
+    def _close_cursor(self, cursor):
         try:
-            if not self._ensure_connection():
-                return False
-                
-            cursor = self.connection.cursor()
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS flights (
-                    flight_id VARCHAR(10) PRIMARY KEY,
-                    airline VARCHAR(50) NOT NULL,
-                    source VARCHAR(50) NOT NULL,
-                    destination VARCHAR(50) NOT NULL,
-                    departure_time TIME NOT NULL,
-                    arrival_time TIME NOT NULL,
-                    flight_date DATE NOT NULL,
-                    capacity INT NOT NULL
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS passengers (
-                    passenger_id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(100) NOT NULL,
-                    email VARCHAR(100),
-                    age INT,
-                    passenger_type VARCHAR(20),
-                    preferences VARCHAR(50),
-                    special_data VARCHAR(100)
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS seats (
-                    seat_id VARCHAR(5) NOT NULL,
-                    flight_id VARCHAR(10) NOT NULL,
-                    is_available BOOLEAN DEFAULT TRUE,
-                    seat_type VARCHAR(20),
-                    PRIMARY KEY (seat_id, flight_id),
-                    FOREIGN KEY (flight_id) REFERENCES flights(flight_id)
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS bookings (
-                    booking_id INT AUTO_INCREMENT PRIMARY KEY,
-                    ticket_id VARCHAR(20) UNIQUE NOT NULL,
-                    passenger_id INT NOT NULL,
-                    flight_id VARCHAR(10) NOT NULL,
-                    seat_id VARCHAR(5) NOT NULL,
-                    booking_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    payment_status BOOLEAN DEFAULT FALSE,
-                    FOREIGN KEY (passenger_id) REFERENCES passengers(passenger_id),
-                    FOREIGN KEY (flight_id) REFERENCES flights(flight_id)
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS baggage (
-                    baggage_id INT AUTO_INCREMENT PRIMARY KEY,
-                    passenger_id INT NOT NULL,
-                    weight DECIMAL(5,2) NOT NULL,
-                    fee DECIMAL(6,2) NOT NULL,
-                    FOREIGN KEY (passenger_id) REFERENCES passengers(passenger_id)
-                )
-            """)
-            
-            self.connection.commit()
-            cursor.close()
-            return True
-            
-        except Error as e:
-            print(f"Error creating tables: {e}")
-            if cursor:
-                try:
-                    cursor.close()
-                except:
-                    pass
-            return False
-    
-    def add_flight(self, flight_id, airline, source, destination, departure_time, arrival_time, flight_date, capacity):
-        query = """
-            INSERT IGNORE INTO flights (flight_id, airline, source, destination, departure_time, arrival_time, flight_date, capacity)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        params = (flight_id, airline, source, destination, departure_time, arrival_time, flight_date, capacity)
-        cursor = self.execute_query(query, params)
-        if cursor:
             cursor.close()
-            return True
-        return False
-    
-    def get_all_flights(self):
-        query = "SELECT * FROM flights"
-        return self.fetch_data(query)
-    
-    def get_flight_by_id(self, flight_id):
-        query = "SELECT * FROM flights WHERE flight_id = %s"
-        result = self.fetch_data(query, (flight_id,))
-        if result and len(result) > 0:
-            return result[0]
-        return None
-    
-    def initialize_seats_for_flight(self, flight_id, seat_map):
+        except Exception:
+            pass
+
+    def _streaming_cursor(self, connection):
+        # Unbuffered: rows stay on the server until fetched.
+        return connection.cursor(buffered=False)
+
+    def _ensure_connection(self):
         try:
-            if not self._ensure_connection():
-                return False
-                
-            cursor = self.connection.cursor()
-            
-            for seat_id, is_available in seat_map.items():
-                seat_type = "Window" if seat_id.endswith(('A', 'D')) else "Middle"
-                
-                query = """
-                    INSERT IGNORE INTO seats (seat_id, flight_id, is_available, seat_type)
-                    VALUES (%s, %s, %s, %s)
-                """
-                params = (seat_id, flight_id, is_available, seat_type)
-                cursor.execute(query, params)
-            
-            self.connection.commit()
-            cursor.close()
-            return True
-            
-        except Error as e:
-            print(f"Error initializing seats: {e}")
-            if cursor:
-                try:
-                    cursor.close()
-                except:
-                    pass
-            return False
-    
-    def get_available_seats(self, flight_id):
-        query = """
-            SELECT seat_id, seat_type 
-            FROM seats 
-            WHERE flight_id = %s AND is_available = TRUE
-        """
-        return self.fetch_data(query, (flight_id,))
-    
-    def update_seat_availability(self, seat_id, flight_id, is_available):
-        query = """
-            UPDATE seats 
-            SET is_available = %s 
-            WHERE seat_id = %s AND flight_id = %s
-        """
-        params = (is_available, seat_id, flight_id)
-        cursor = self.execute_query(query, params)
-        if cursor:
-            cursor.close()
-            return True
-        return False
-    
-    def add_passenger(self, name, email, age, passenger_type, preferences, special_data=None):
-        query = """
-            INSERT INTO passengers (name, email, age, passenger_type, preferences, special_data)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        params = (name, email, age, passenger_type, preferences, special_data)
-        cursor = self.execute_query(query, params)
-        if cursor:
-            passenger_id = cursor.lastrowid
-            cursor.close()
-            return passenger_id
-        return None
-    
-    def get_passenger_by_id(self, passenger_id):
-        query = "SELECT * FROM passengers WHERE passenger_id = %s"
-        result = self.fetch_data(query, (passenger_id,))
-        if result and len(result) > 0:
-            return result[0]
-        return None
-    
-    def create_booking(self, ticket_id, passenger_id, flight_id, seat_id, payment_status=False):
-        query = """
-            INSERT INTO bookings (ticket_id, passenger_id, flight_id, seat_id, payment_status)
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        params = (ticket_id, passenger_id, flight_id, seat_id, payment_status)
-        cursor = self.execute_query(query, params)
-        if cursor:
-            cursor.close()
-            self.update_seat_availability(seat_id, flight_id, False)
-            return True
-        return False
-    
-    def update_booking_payment(self, ticket_id, payment_status):
-        query = """
-            UPDATE bookings 
-            SET payment_status = %s 
-            WHERE ticket_id = %s
-        """
-        params = (payment_status, ticket_id)
-        cursor = self.execute_query(query, params)
-        if cursor:
-            cursor.close()
-            return True
-        return False
-    
-    def get_booking_by_ticket(self, ticket_id):
-        query = """
-            SELECT b.*, p.name, p.email, f.airline, f.source, f.destination, f.flight_date
-            FROM bookings b
-            JOIN passengers p ON b.passenger_id = p.passenger_id
-            JOIN flights f ON b.flight_id = f.flight_id
-            WHERE b.ticket_id = %s
-        """
-        result = self.fetch_data(query, (ticket_id,))
-        if result and len(result) > 0:
-            return result[0]
-        return None
-    
-    def add_baggage(self, passenger_id, weight, fee):
-        query = """
-            INSERT INTO baggage (passenger_id, weight, fee)
-            VALUES (%s, %s, %s)
-        """
-        params = (passenger_id, weight, fee)
-        cursor = self.execute_query(query, params)
-        if cursor:
-            cursor.close()
-            return True
-        return False
-    
-    def get_baggage_by_passenger(self, passenger_id):
-        query = "SELECT * FROM baggage WHERE passenger_id = %s"
-        return self.fetch_data(query, (passenger_id,))
\ No newline at end of file
+            if self.connection is not None and self.connection.is_connected():
+                return True
+        except Error:
+            pass
+        return self.connect()
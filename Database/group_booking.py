@@ -0,0 +1,227 @@
+import csv
+import json
+import uuid
+
+from Database.base_handler import GroupBookingResult
+from baggage.BaggageFeeCalc import BaggageFeeCalculatorProxy
+from baggage.FeePolicy import route_key
+from flights.Flight import flights_from_rows
+
+PASSENGER_TYPES = ("Regular", "Socializer", "Tall", "Eco-Friendly")
+PREFERENCES = ("Networking", "Sleep", "Work", "Comfort", "Eco-Friendly")
+TRUE_VALUES = ("1", "true", "yes", "y", "paid")
+FALSE_VALUES = ("", "0", "false", "no", "n", "unpaid")
+
+
+class _UnreadableRow:
+    def __init__(self, message):
+        self.message = message
+
+
+def load_manifest(source):
+    """Read a manifest from a list of dicts or a ``.csv`` / ``.jsonl`` file path.
+
+    Lines of a JSONL file that are not valid JSON are kept as placeholders so
+    that validation reports them against their row number.
+    """
+    if not isinstance(source, str):
+        return list(source)
+
+    if source.endswith(".csv"):
+        with open(source, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    if source.endswith((".jsonl", ".ndjson")):
+        rows = []
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    rows.append(_UnreadableRow(f"Invalid JSON: {e}"))
+        return rows
+
+    raise ValueError(f"Unsupported manifest format: {source}")
+
+
+def _text(raw, field, max_length, required=False):
+    value = raw.get(field)
+    value = str(value).strip() if value is not None else ""
+    if not value:
+        if required:
+            raise ValueError(f"{field} is required")
+        return None
+    if len(value) > max_length:
+        raise ValueError(f"{field} is longer than {max_length} characters")
+    return value
+
+
+def _number(raw, field, cast, minimum, maximum, default=None):
+    value = raw.get(field)
+    if value is None or value == "":
+        return default
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number, got {value!r}")
+    if not minimum <= value <= maximum:
+        raise ValueError(f"{field} must be between {minimum} and {maximum}")
+    return value
+
+
+def _flag(raw, field):
+    value = raw.get(field, False)
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"{field} must be true or false, got {value!r}")
+
+
+def _choice(raw, field, choices, default):
+    value = _text(raw, field, 50) or default
+    if value is not None and value not in choices:
+        raise ValueError(f"{field} must be one of {', '.join(choices)}")
+    return value
+
+
+class GroupBooking:
+    """Validate a passenger manifest and book it on one flight in one transaction.
+
+    Replaces the per-passenger ``add_passenger`` / ``add_baggage`` /
+    ``book_seat`` round trips (and their commits) with a single call to the
+    handler's ``book_group``. Invalid rows are reported with their 1-based row
+    number instead of aborting the load.
+    """
+
+    def __init__(self, db, fee_calculator=None):
+        self.db = db
+        self.fee_calculator = fee_calculator or BaggageFeeCalculatorProxy()
+
+    def validate(self, manifest, seat_required=True):
+        """Return ``(entries, errors)`` for the rows of ``manifest``."""
+        entries = []
+        errors = []
+        seats = set()
+        tickets = set()
+        for row, raw in enumerate(manifest, start=1):
+            try:
+                entry = self._validate_row(raw, seat_required)
+                if entry["seat_id"] is not None and entry["seat_id"] in seats:
+                    raise ValueError(f"seat {entry['seat_id']} appears more than once in the manifest")
+                if entry["ticket_id"] in tickets:
+                    raise ValueError(f"ticket {entry['ticket_id']} appears more than once in the manifest")
+            except ValueError as e:
+                errors.append((row, str(e)))
+                continue
+            seats.add(entry["seat_id"])
+            tickets.add(entry["ticket_id"])
+            entry["row"] = row
+            entries.append(entry)
+        return entries, errors
+
+    def _validate_row(self, raw, seat_required=True):
+        if isinstance(raw, _UnreadableRow):
+            raise ValueError(raw.message)
+        if not isinstance(raw, dict):
+            raise ValueError(f"expected an object, got {type(raw).__name__}")
+
+        email = _text(raw, "email", 100)
+        if email is not None and "@" not in email:
+            raise ValueError(f"email {email!r} is not valid")
+
+        baggage_weight = _number(raw, "baggage_weight", float, 0, 999.99, default=0.0)
+        baggage_fee = _number(raw, "baggage_fee", float, 0, 9999.99)
+        if baggage_fee is None and not baggage_weight:
+            baggage_fee = 0
+
+        seat_id = _text(raw, "seat_id", 5, required=seat_required)
+        return {
+            "name": _text(raw, "name", 100, required=True),
+            "email": email,
+            "age": _number(raw, "age", int, 0, 130),
+            "passenger_type": _choice(raw, "passenger_type", PASSENGER_TYPES, "Regular"),
+            "preferences": _choice(raw, "preferences", PREFERENCES, None),
+            "special_data": _text(raw, "special_data", 100),
+            "seat_id": seat_id.upper() if seat_id is not None else None,
+            "ticket_id": _text(raw, "ticket_id", 20) or f"GRP{uuid.uuid4().hex[:12].upper()}",
+            "payment_status": _flag(raw, "payment_status"),
+            "baggage_weight": baggage_weight,
+            "baggage_fee": baggage_fee,
+        }
+
+    def price_baggage(self, flight_id, entries, layout=None):
+        """Fill in ``baggage_fee`` for entries whose manifest row gave none.
+
+        Bags are priced like a single booking's: on the flight's route and in
+        the cabin of each entry's seat, under whatever fee policy is current.
+        """
+        unpriced = [entry for entry in entries if entry["baggage_fee"] is None]
+        if not unpriced:
+            return
+
+        route = None
+        row = self.db.get_flight_by_id(flight_id)
+        if row is not None:
+            flight = next(flights_from_rows([row]))
+            route = route_key(flight.source, flight.destination)
+            layout = layout or flight.layout
+        travel_classes = [layout.cabin(entry["seat_id"]) if layout is not None and entry["seat_id"] in layout else None
+                          for entry in unpriced]
+        fees = self.fee_calculator.calculate_fees([entry["baggage_weight"] for entry in unpriced],
+                                                  travel_classes, route)
+        for entry, fee in zip(unpriced, fees.tolist()):
+            entry["baggage_fee"] = fee
+
+    def book(self, flight_id, manifest, allow_partial=False):
+        """Book ``manifest`` (see ``load_manifest``) on ``flight_id``.
+
+        Without ``allow_partial`` nothing is written unless every row is valid
+        and every requested seat is free.
+        """
+        entries, errors = self.validate(load_manifest(manifest))
+        if not entries or (errors and not allow_partial):
+            return GroupBookingResult(flight_id, errors=errors)
+
+        self.price_baggage(flight_id, entries)
+        result = self.db.book_group(flight_id, entries, allow_partial=allow_partial)
+        result.errors = sorted(errors + result.errors, key=lambda error: (error[0] is not None, error[0] or 0))
+        return result
+
+    def book_together(self, flight_id, manifest, seat_inventory, allow_split=False, layout=None):
+        """Book a party on seats next to each other, chosen by ``seat_inventory``.
+
+        Any ``seat_id`` in the manifest is ignored: the inventory holds a block
+        of adjacent seats (see ``SeatInventory.hold_group``), they are assigned
+        to the rows in manifest order and booked in one transaction. The whole
+        party is booked or nobody is.
+        """
+        entries, errors = self.validate(load_manifest(manifest), seat_required=False)
+        if not entries or errors:
+            return GroupBookingResult(flight_id, errors=errors)
+
+        if not seat_inventory.ensure_loaded(flight_id, layout):
+            return GroupBookingResult(flight_id, errors=[(None, f"Flight {flight_id} has no seats")])
+        seat_ids, token = seat_inventory.hold_group(flight_id, len(entries), allow_split=allow_split)
+        if not seat_ids:
+            return GroupBookingResult(
+                flight_id, errors=[(None, f"No {len(entries)} seats together are free on {flight_id}")])
+
+        for entry, seat_id in zip(entries, seat_ids):
+            entry["seat_id"] = seat_id
+        self.price_baggage(flight_id, entries, layout)
+        result = self.db.book_group(flight_id, entries)
+        for seat_id in seat_ids:
+            if result.committed:
+                seat_inventory.confirm(flight_id, seat_id, token)
+            else:
+                seat_inventory.release(flight_id, seat_id, token)
+        if not result.committed:
+            # The inventory was probably behind the database; catch up for the next attempt
+            seat_inventory.refresh([flight_id])
+        return result
@@ -0,0 +1,135 @@
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_current = threading.local()
+
+
+class _MethodStats:
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.buckets = [0] * (bucket_count + 1)
+
+
+class QueryMetrics:
+    """Per-method latency histograms, row counts and error counts.
+
+    Install on a handler with ``handler.metrics = QueryMetrics()``; any object
+    with the same ``record`` method can be used as the hook instead.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.bucket_bounds = tuple(buckets)
+        self._methods = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, seconds, rows=0, error=False):
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats(len(self.bucket_bounds))
+            stats.count += 1
+            stats.rows += rows
+            stats.errors += 1 if error else 0
+            stats.total_time += seconds
+            stats.max_time = max(stats.max_time, seconds)
+            stats.buckets[bisect_left(self.bucket_bounds, seconds)] += 1
+
+    def as_dict(self):
+        with self._lock:
+            result = {}
+            for method, stats in self._methods.items():
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.bucket_bounds + (float("inf"),), stats.buckets):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                result[method] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "rows": stats.rows,
+                    "total_time": stats.total_time,
+                    "avg_time": stats.total_time / stats.count,
+                    "max_time": stats.max_time,
+                    "buckets": buckets,
+                }
+            return result
+
+    def to_prometheus(self, prefix="flight_db"):
+        lines = [
+            f"# HELP {prefix}_query_duration_seconds Database call latency by handler method.",
+            f"# TYPE {prefix}_query_duration_seconds histogram",
+        ]
+        snapshot = self.as_dict()
+        for method, stats in sorted(snapshot.items()):
+            for bound, count in stats["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_query_duration_seconds_bucket{{method="{method}",le="{le}"}} {count}')
+            lines.append(f'{prefix}_query_duration_seconds_sum{{method="{method}"}} {stats["total_time"]}')
+            lines.append(f'{prefix}_query_duration_seconds_count{{method="{method}"}} {stats["count"]}')
+
+        for name, key, help_text in (("rows", "rows", "Rows returned or affected"),
+                                     ("errors", "errors", "Failed database calls")):
+            lines.append(f"# HELP {prefix}_query_{name}_total {help_text} by handler method.")
+            lines.append(f"# TYPE {prefix}_query_{name}_total counter")
+            for method, stats in sorted(snapshot.items()):
+                lines.append(f'{prefix}_query_{name}_total{{method="{method}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+
+def instrumented(method):
+    """Time a handler method and report it to ``self.metrics`` if one is set.
+
+    Nested instrumented calls are attributed to the outermost method, so the
+    numbers add up to what the caller actually waited for.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        if metrics is None or getattr(_current, "active", False):
+            return method(self, *args, **kwargs)
+
+        _current.active = True
+        _current.rows = 0
+        _current.error = False
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except BaseException:
+            _current.error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.active = False
+            metrics.record(name, elapsed, _current.rows, _current.error)
+
+    return wrapper
+
+
+def note_rows(count):
+    if getattr(_current, "active", False) and count and count > 0:
+        _current.rows += count
+
+
+def note_error():
+    _current.errors = getattr(_current, "errors", 0) + 1
+    if getattr(_current, "active", False):
+        _current.error = True
+
+
+def error_count():
+    """Errors noted on this thread so far; a change across a call means it failed."""
+    return getattr(_current, "errors", 0)
@@ -0,0 +1,118 @@
+class Migration:
+    def __init__(self, version, description, statements):
+        self.version = version
+        self.description = description
+        self.statements = statements
+
+
+MIGRATIONS = [
+    Migration(1, "Secondary indexes for seat, booking, baggage and route lookups", (
+        "CREATE INDEX idx_seats_flight_available ON seats (flight_id, is_available)",
+        "CREATE INDEX idx_bookings_passenger ON bookings (passenger_id)",
+        "CREATE INDEX idx_baggage_passenger ON baggage (passenger_id)",
+        "CREATE INDEX idx_flights_route_date ON flights (source, destination, flight_date)",
+    )),
+    Migration(2, "Packed per-flight seat availability bitmaps", (
+        """
+            CREATE TABLE IF NOT EXISTS seat_availability (
+                flight_id VARCHAR(10) PRIMARY KEY,
+                seat_ids TEXT NOT NULL,
+                seat_types TEXT NOT NULL,
+                available BLOB NOT NULL,
+                FOREIGN KEY (flight_id) REFERENCES flights(flight_id)
+            )
+        """,
+    )),
+    Migration(3, "Aircraft type of each flight for shared seat layouts", (
+        "ALTER TABLE flights ADD COLUMN aircraft_type VARCHAR(20)",
+    )),
+    Migration(4, "Append-only log of seat changes not yet folded into the bitmaps", (
+        """
+            CREATE TABLE IF NOT EXISTS seat_availability_changes (
+                change_id INT AUTO_INCREMENT PRIMARY KEY,
+                flight_id VARCHAR(10) NOT NULL,
+                seat_id VARCHAR(5) NOT NULL,
+                is_available BOOLEAN NOT NULL
+            )
+        """,
+        "CREATE INDEX idx_seat_changes_flight ON seat_availability_changes (flight_id, change_id)",
+    )),
+]
+
+
+class MigrationRunner:
+    """Applies numbered schema migrations and records them in ``schema_migrations``.
+
+    A migration's version row is only written once all of its statements have
+    run. The statements themselves are not transactional, though: SQLite and
+    MySQL both commit DDL as it runs, so a migration that fails part way can
+    leave its earlier statements applied and need manual cleanup before a retry.
+    """
+    TABLE_DDL = """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(200) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+
+    def __init__(self, db, migrations=None):
+        self.db = db
+        self.migrations = sorted(migrations if migrations is not None else MIGRATIONS,
+                                 key=lambda migration: migration.version)
+
+    def applied_versions(self):
+        if self.db.execute_query(self.TABLE_DDL) is None:
+            return None
+        rows = self.db.fetch_data("SELECT version FROM schema_migrations")
+        if rows is None:
+            return None
+        return {row[0] for row in rows}
+
+    def pending(self):
+        applied = self.applied_versions()
+        if applied is None:
+            return None
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    def migrate(self, target=None):
+        """Apply pending migrations up to ``target``; returns the versions applied or None."""
+        pending = self.pending()
+        if pending is None:
+            return None
+
+        applied = []
+        for migration in pending:
+            if target is not None and migration.version > target:
+                break
+            if not self._apply(migration):
+                return None
+            applied.append(migration.version)
+        return applied
+
+    def _apply(self, migration):
+        cursor = None
+        try:
+            with self.db._connection() as connection:
+                if connection is None:
+                    return False
+
+                cursor = connection.cursor()
+                for statement in migration.statements:
+                    cursor.execute(self.db._sql(statement))
+                cursor.execute(self.db._sql(
+                    "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)"
+                ), (migration.version, migration.description))
+
+                connection.commit()
+                cursor.close()
+                return True
+
+        except self.db.Error as e:
+            print(f"Error applying migration {migration.version}: {e}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            return False
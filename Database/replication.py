@@ -0,0 +1,156 @@
+import itertools
+import threading
+import time
+
+from Database.metrics import error_count
+
+READ_METHODS = (
+    "get_all_flights", "iter_all_flights", "count_flights", "get_flight_by_id", "get_flights_by_route",
+    "get_available_seats", "get_passenger_by_id", "get_booking_by_ticket", "get_baggage_by_passenger",
+)
+
+WRITE_METHODS = (
+    "create_tables", "migrate", "execute_query", "add_flight", "initialize_seats_for_flight",
+    "initialize_seats_bulk", "update_seat_availability", "compact_seat_bitmaps", "add_passenger",
+    "create_booking", "book_seat", "book_new_passenger", "book_group", "update_booking_payment", "add_baggage",
+)
+
+ROUND_ROBIN = "round_robin"
+LEAST_LATENCY = "least_latency"
+
+
+class _Replica:
+    def __init__(self, handler):
+        self.handler = handler
+        self.reads = 0
+        self.fallbacks = 0
+        self.latency = 0.0
+
+
+class ReplicatedDatabaseHandler:
+    """Sends read-only handler methods to replicas and everything else to the primary.
+
+    Replicas are picked round-robin or by lowest smoothed read latency. After
+    any write through this handler, its reads go to the primary for
+    ``read_your_writes_window`` seconds so a booking is visible to the session
+    that made it even while the replicas lag. The last write is tracked per
+    handler rather than per thread, since ``AsyncDatabaseHandler`` may run a
+    write and the read after it on different worker threads; give each
+    session its own handler to keep other sessions' reads on the replicas.
+    A replica read that fails (it raises, or the handler notes an error) is
+    retried on the primary; a plain not-found result is returned as it is.
+    """
+    FAILURE_PENALTY = 1.0
+
+    def __init__(self, primary, replicas, strategy=ROUND_ROBIN, read_your_writes_window=5.0,
+                 latency_smoothing=0.2, clock=time.monotonic):
+        if strategy not in (ROUND_ROBIN, LEAST_LATENCY):
+            raise ValueError(f"Unknown replica strategy '{strategy}'")
+        self.primary = primary
+        self.replicas = [_Replica(replica) for replica in replicas]
+        self.strategy = strategy
+        self.read_your_writes_window = read_your_writes_window
+        self.latency_smoothing = latency_smoothing
+        self._clock = clock
+        self._next = itertools.count()
+        self._last_write = None
+        self._lock = threading.Lock()
+        self.primary_reads = 0
+
+    def __getattr__(self, name):
+        return getattr(self.primary, name)
+
+    @property
+    def metrics(self):
+        return self.primary.metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        for handler in [self.primary] + [replica.handler for replica in self.replicas]:
+            handler.metrics = metrics
+
+    def connect(self):
+        for replica in self.replicas:
+            if not replica.handler.connect():
+                print("Warning: replica unavailable, reads will fall back to the primary")
+        return self.primary.connect()
+
+    def disconnect(self):
+        for replica in self.replicas:
+            replica.handler.disconnect()
+        self.primary.disconnect()
+
+    def mark_write(self):
+        """Pin this handler's reads to the primary for the read-your-writes window."""
+        self._last_write = self._clock()
+
+    def _reads_own_writes(self):
+        last_write = self._last_write
+        return last_write is not None and self._clock() - last_write < self.read_your_writes_window
+
+    def _pick_replica(self):
+        if self.strategy == LEAST_LATENCY:
+            with self._lock:
+                return min(self.replicas, key=lambda replica: replica.latency)
+        return self.replicas[next(self._next) % len(self.replicas)]
+
+    def _read(self, name, args, kwargs):
+        if not self.replicas or self._reads_own_writes():
+            with self._lock:
+                self.primary_reads += 1
+            return getattr(self.primary, name)(*args, **kwargs)
+
+        replica = self._pick_replica()
+        started = self._clock()
+        errors = error_count()
+        try:
+            result = getattr(replica.handler, name)(*args, **kwargs)
+            failed = error_count() != errors
+        except Exception as e:
+            print(f"Error reading from replica: {e}")
+            result, failed = None, True
+        elapsed = self._clock() - started
+        with self._lock:
+            replica.reads += 1
+            if failed:
+                replica.fallbacks += 1
+                elapsed += self.FAILURE_PENALTY
+            replica.latency += self.latency_smoothing * (elapsed - replica.latency)
+        if failed:
+            with self._lock:
+                self.primary_reads += 1
+            return getattr(self.primary, name)(*args, **kwargs)
+        return result
+
+    def _write(self, name, args, kwargs):
+        try:
+            return getattr(self.primary, name)(*args, **kwargs)
+        finally:
+            self.mark_write()
+
+    def replica_stats(self):
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "primary_reads": self.primary_reads,
+                "replicas": [
+                    {"reads": replica.reads, "fallbacks": replica.fallbacks, "latency": replica.latency}
+                    for replica in self.replicas
+                ],
+            }
+
+
+def _routed(name, route):
+    def method(self, *args, **kwargs):
+        return route(self, name, args, kwargs)
+
+    method.__name__ = name
+    method.__qualname__ = f"ReplicatedDatabaseHandler.{name}"
+    return method
+
+
+for _name in READ_METHODS:
+    setattr(ReplicatedDatabaseHandler, _name, _routed(_name, ReplicatedDatabaseHandler._read))
+
+for _name in WRITE_METHODS:
+    setattr(ReplicatedDatabaseHandler, _name, _routed(_name, ReplicatedDatabaseHandler._write))
@@ -0,0 +1,179 @@
+import random
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of connecting while the circuit breaker is open."""
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter.
+
+    The delay before retry ``n`` (0-based) is drawn uniformly from
+    ``[0, min(max_delay, base_delay * multiplier ** n)]`` so that clients that
+    lost the database together do not reconnect in lockstep.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=2.0, multiplier=2.0, jitter=True,
+                 rng=random.random):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._rng = rng
+
+    def delay(self, attempt):
+        capped = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return capped * self._rng() if self.jitter else capped
+
+
+class CircuitBreaker:
+    """Fails fast after repeated connection failures.
+
+    ``closed``: calls go through. After ``failure_threshold`` consecutive
+    failures the breaker opens and rejects calls for ``reset_timeout``
+    seconds; it then lets a single trial call through (``half_open``), closing
+    again on success and reopening on failure.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=10.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self):
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def retry_after(self):
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """End a half-open trial that neither succeeded nor failed, e.g. a call
+        interrupted by an error unrelated to the database, so another call may
+        probe."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+
+class Reconnector:
+    """Opens connections through a retry policy and a circuit breaker.
+
+    The time one ``connect`` call can block is bounded by the connect timeouts
+    of ``max_attempts`` tries plus their capped backoff, and while the breaker
+    is open it fails immediately with ``CircuitOpenError``.
+    """
+
+    def __init__(self, connect, retry_policy=None, circuit_breaker=None, retry_on=(Exception,),
+                 sleep=time.sleep):
+        self._connect = connect
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.retry_on = retry_on
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._attempts = 0
+        self._successes = 0
+        self._failures = 0
+        self._rejected = 0
+        self._backoff_time = 0.0
+        self._last_error = None
+
+    def connect(self):
+        breaker = self.circuit_breaker
+        if not breaker.allow():
+            with self._lock:
+                self._rejected += 1
+            raise CircuitOpenError(f"Database marked unavailable, retrying in {breaker.retry_after():.1f}s")
+
+        attempts = self.retry_policy.max_attempts
+        for attempt in range(attempts):
+            with self._lock:
+                self._attempts += 1
+            try:
+                connection = self._connect()
+            except self.retry_on as e:
+                breaker.record_failure()
+                with self._lock:
+                    self._failures += 1
+                    self._last_error = str(e)
+                if attempt == attempts - 1 or breaker.state == CircuitBreaker.OPEN:
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                with self._lock:
+                    self._backoff_time += delay
+                self._sleep(delay)
+                if not breaker.allow():
+                    raise
+            except BaseException:
+                # Not a connection failure, but a half-open trial must not stay
+                # in flight or the breaker would reject every later call.
+                breaker.release_trial()
+                raise
+            else:
+                breaker.record_success()
+                with self._lock:
+                    self._successes += 1
+                return connection
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.circuit_breaker.state,
+                "times_opened": self.circuit_breaker.times_opened,
+                "attempts": self._attempts,
+                "successes": self._successes,
+                "failures": self._failures,
+                "rejected": self._rejected,
+                "backoff_time": self._backoff_time,
+                "last_error": self._last_error,
+            }
@@ -0,0 +1,101 @@
+from functools import lru_cache
+
+_SEAT_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def seat_sort_key(seat_id):
+    """Order seats by row number, then letter ("2A" before "10A")."""
+    row = seat_id.rstrip(_SEAT_LETTERS)
+    return (int(row) if row.isdigit() else 0, seat_id)
+
+
+@lru_cache(maxsize=256)
+def _layout(seat_ids, seat_types):
+    """Parse a stored layout once; flights with the same equipment share the result."""
+    ids = tuple(seat_ids.split(",")) if seat_ids else ()
+    types = tuple(seat_types.split(",")) if seat_types else ()
+    index = {seat_id: position for position, seat_id in enumerate(ids)}
+    type_masks = {}
+    for position, seat_type in enumerate(types):
+        type_masks[seat_type] = type_masks.get(seat_type, 0) | (1 << position)
+    return ids, types, index, type_masks
+
+
+class SeatBitmap:
+    """Availability of one flight's seats packed one bit per seat.
+
+    Bit ``i`` is set when ``seat_ids[i]`` is free. The seat order and types are
+    stored with the bitmap, and per-type masks let free seats be counted with a
+    single AND and popcount instead of a scan over seat rows.
+    """
+
+    def __init__(self, flight_id, seat_ids, seat_types, available):
+        self.flight_id = flight_id
+        self.layout_key = (seat_ids, seat_types)
+        self._seat_ids, self._seat_types, self._index, self._type_masks = _layout(seat_ids, seat_types)
+        self._bits = int.from_bytes(available or b"", "little")
+
+    @classmethod
+    def from_rows(cls, flight_id, rows):
+        """Build from ``(seat_id, seat_type, is_available)`` rows."""
+        rows = sorted(rows, key=lambda row: seat_sort_key(row[0]))
+        bits = 0
+        for position, (_, _, is_available) in enumerate(rows):
+            if is_available:
+                bits |= 1 << position
+        bitmap = cls(flight_id, ",".join(row[0] for row in rows),
+                     ",".join(row[1] or "" for row in rows), None)
+        bitmap._bits = bits
+        return bitmap
+
+    @property
+    def seat_ids(self):
+        return self._seat_ids
+
+    @property
+    def seat_types(self):
+        return self._seat_types
+
+    def __len__(self):
+        return len(self._seat_ids)
+
+    def __contains__(self, seat_id):
+        return seat_id in self._index
+
+    def is_available(self, seat_id):
+        position = self._index.get(seat_id)
+        return position is not None and bool(self._bits >> position & 1)
+
+    def set_available(self, seat_id, is_available):
+        position = self._index[seat_id]
+        if is_available:
+            self._bits |= 1 << position
+        else:
+            self._bits &= ~(1 << position)
+
+    def free_count(self):
+        return self._bits.bit_count()
+
+    def count_free_by_type(self):
+        return {seat_type: (self._bits & mask).bit_count() for seat_type, mask in self._type_masks.items()}
+
+    def available_seats(self, seat_type=None):
+        bits = self._bits
+        if seat_type is not None:
+            bits &= self._type_masks.get(seat_type, 0)
+        seats = []
+        while bits:
+            low = bits & -bits
+            seats.append(self._seat_ids[low.bit_length() - 1])
+            bits ^= low
+        return seats
+
+    def to_bytes(self):
+        return self._bits.to_bytes((len(self._seat_ids) + 7) // 8, "little")
+
+    def to_row(self):
+        seat_ids, seat_types = self.layout_key
+        return (self.flight_id, seat_ids, seat_types, self.to_bytes())
+
+    def __repr__(self):
+        return f"SeatBitmap(flight_id='{self.flight_id}', free={self.free_count()}/{len(self)})"
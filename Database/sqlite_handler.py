@@ -0,0 +1,98 @@
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+
+from Database.base_handler import BaseDatabaseHandler
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(time, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(Decimal, str)
+
+sqlite3.register_converter("DATE", lambda raw: date.fromisoformat(raw.decode()))
+sqlite3.register_converter("TIME", lambda raw: time.fromisoformat(raw.decode()))
+sqlite3.register_converter("DATETIME", lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter("BOOLEAN", lambda raw: bool(int(raw)))
+sqlite3.register_converter("DECIMAL", lambda raw: Decimal(raw.decode()))
+
+_MYSQL_TO_SQLITE = (
+    ("INT AUTO_INCREMENT PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    ("INSERT IGNORE", "INSERT OR IGNORE"),
+    (" FOR UPDATE", ""),
+    ("%s", "?"),
+)
+
+
+@lru_cache(maxsize=256)
+def _translate(query):
+    for mysql_syntax, sqlite_syntax in _MYSQL_TO_SQLITE:
+        query = query.replace(mysql_syntax, sqlite_syntax)
+    return query
+
+
+class SQLiteDatabaseHandler(BaseDatabaseHandler):
+    """Embedded backend for tests, benchmarks and kiosks without a DB server.
+
+    ``path`` is a database file or ``":memory:"``. SQLite allows a single writer,
+    so the handler keeps one connection and serializes operations on it.
+    """
+    Error = sqlite3.Error
+
+    def __init__(self, path=":memory:", timeout=5.0, statement_cache_size=128):
+        self.path = path
+        self.timeout = timeout
+        # sqlite3 keeps its own per-connection cache of compiled statements.
+        self.statement_cache_size = statement_cache_size
+        self.connection = None
+        self._lock = threading.RLock()
+
+    def connect(self):
+        try:
+            self.connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False,
+                cached_statements=self.statement_cache_size
+            )
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error opening SQLite database: {e}")
+            return False
+
+    def disconnect(self):
+        with self._lock:
+            if self.connection is not None:
+                try:
+                    self.connection.close()
+                except sqlite3.Error:
+                    pass
+                self.connection = None
+
+    def _ensure_connection(self):
+        if self.connection is not None:
+            return True
+        return self.connect()
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            with super()._connection() as connection:
+                yield connection
+
+    def _sql(self, query):
+        return _translate(query)
+
+    def explain(self, query, params=None):
+        return self.fetch_data("EXPLAIN QUERY PLAN " + query, params)
+
+    def indexes_used(self, query, params=None):
+        plan = self.explain(query, params)
+        if plan is None:
+            return None
+        return {match for row in plan for match in re.findall(r"INDEX (\w+)", row[-1])}
@@ -1,21 +1,27 @@
 from baggage.BaggageFeeCalc import BaggageFeeCalculatorProxy
 
+# Shared by every bag; it always prices with the current default policy
+fee_calculator = BaggageFeeCalculatorProxy()
+
 class Baggage:
-    def __init__(self, passenger_name, weight):
+    def __init__(self, passenger_name, weight, travel_class=None, route=None, piece=1, calculator=None):
         self.passenger_name = passenger_name
         self.weight = weight        
+        self.travel_class = travel_class
+        self.route = route
+        self.piece = piece
         self.baggage_fee = 0
-        self.calculator = BaggageFeeCalculatorProxy()
+        self.calculator = calculator or fee_calculator
 
     def check_baggage_weight(self):
-        return self.weight <= self.calculator.get_limit()
+        return self.weight <= self.calculator.get_limit(self.travel_class, self.route)
 
     def calculate_fee(self):
-        self.baggage_fee = self.calculator.calculate_fee(self.weight)
+        self.baggage_fee = self.calculator.calculate_fee(self.weight, self.travel_class, self.route, self.piece)
         return self.baggage_fee
 
     def get_fee_summary(self):
-        limit = self.calculator.get_limit()
+        limit = self.calculator.get_limit(self.travel_class, self.route)
         if self.check_baggage_weight():
             return f"No extra fee. Weight: {self.weight}kg (Limit: {limit}kg)"
         else:
@@ -1,39 +1,138 @@
+import numpy as np
+
+from baggage.FeePolicy import FeeSchedule, FeeTable
+
+DEFAULT_LIMIT = 20
+DEFAULT_FEE_PER_KG = 10
+
+
 class BaggageFeePolicy:
+    """Flat pricing: ``fee_per_kg`` for every kilogram over ``limit``.
+
+    ``BaggageFeePolicy()`` is the shared default policy; passing a limit or
+    rate creates a separate policy with those values.
+    """
     _instance = None
 
-    def __new__(cls, limit=20, fee_per_kg=10):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.limit = limit
-            cls._instance.fee_per_kg = fee_per_kg
-        return cls._instance
+    def __new__(cls, limit=None, fee_per_kg=None):
+        if limit is None and fee_per_kg is None:
+            if cls._instance is None:
+                cls._instance = cls._create(DEFAULT_LIMIT, DEFAULT_FEE_PER_KG)
+            return cls._instance
+        return cls._create(DEFAULT_LIMIT if limit is None else limit,
+                           DEFAULT_FEE_PER_KG if fee_per_kg is None else fee_per_kg)
 
-    def get_limit(self):
+    @classmethod
+    def _create(cls, limit, fee_per_kg):
+        policy = super().__new__(cls)
+        policy.limit = limit
+        policy.fee_per_kg = fee_per_kg
+        policy._schedule = None
+        policy._schedule_rate = None
+        return policy
+
+    @property
+    def version(self):
+        return self.snapshot().version
+
+    def snapshot(self):
+        # Rebuilt only when limit or fee_per_kg were changed on the instance
+        schedule = self._schedule
+        if schedule is None or self._schedule_rate != (self.limit, self.fee_per_kg):
+            version = schedule.version + 1 if schedule is not None else 0
+            schedule = FeeSchedule({}, FeeTable.flat(self.limit, self.fee_per_kg), version)
+            self._schedule_rate = (self.limit, self.fee_per_kg)
+            self._schedule = schedule
+        return schedule
+
+    def get_limit(self, travel_class=None, route=None):
         return self.limit
 
-    def get_fee_per_kg(self):
+    def get_fee_per_kg(self, travel_class=None, route=None):
         return self.fee_per_kg
 
 
+_default_policy = None
+
+
+def use_policy(policy):
+    """Make ``policy`` (e.g. a ``TieredFeePolicy``) the one used by calculators created without one.
+
+    Calculators look the default up on every quote, so existing ``Baggage``
+    objects pick up the new policy too. ``use_policy(None)`` goes back to the
+    flat ``BaggageFeePolicy``.
+    """
+    global _default_policy
+    _default_policy = policy
+
+
 class BaggageFeeCalculator:
-    def __init__(self):
-        self.policy = BaggageFeePolicy()
+    def __init__(self, policy=None):
+        self._policy = policy
+
+    @property
+    def policy(self):
+        return self._policy or _default_policy or BaggageFeePolicy()
+
+    def calculate_fee(self, weight, travel_class=None, route=None, piece=1):
+        return self.policy.snapshot().table(travel_class, route).fee(weight, piece)
+
+    def calculate_fees(self, weights, travel_classes=None, routes=None, pieces=None):
+        """Fees for many bags at once, as a NumPy array matching ``calculate_fee``.
+
+        ``travel_classes`` and ``routes`` are optional, each either one value
+        for every bag or a sequence as long as ``weights``; ``pieces`` gives
+        each bag's piece number. All bags are priced from one policy snapshot
+        in one vectorised pass; the rules are only resolved once per distinct
+        class and route.
+        """
+        weights = np.asarray(weights, dtype=float)
+        if pieces is not None:
+            pieces = np.asarray(pieces, dtype=int)
+        schedule = self.policy.snapshot()
+        class_values, class_codes = _codes(travel_classes, len(weights))
+        route_values, route_codes = _codes(routes, len(weights))
+        if len(class_values) == 1 and len(route_values) == 1:
+            return schedule.table(class_values[0], route_values[0]).fees(weights, pieces)
+
+        table_indexes = np.array([[schedule.table_index(travel_class, route) for route in route_values]
+                                  for travel_class in class_values])
+        return schedule.fees(weights, table_indexes[class_codes, route_codes], pieces)
+
+    def within_limits(self, weights, travel_classes=None, routes=None):
+        weights = np.asarray(weights, dtype=float)
+        schedule = self.policy.snapshot()
+        class_values, class_codes = _codes(travel_classes, len(weights))
+        route_values, route_codes = _codes(routes, len(weights))
+        allowances = np.array([[schedule.table(travel_class, route).allowance for route in route_values]
+                               for travel_class in class_values])
+        return weights <= allowances[class_codes, route_codes]
+
+    def within_limit(self, weight, travel_class=None, route=None):
+        return weight <= self.policy.snapshot().table(travel_class, route).allowance
 
-    def calculate_fee(self, weight):
-        over_limit = max(0, weight - self.policy.get_limit())
-        return over_limit * self.policy.get_fee_per_kg()
 
-    def within_limit(self, weight):
-        return weight <= self.policy.get_limit()
+def _codes(values, count):
+    """Distinct values and each bag's index into them; one value for all bags if not a sequence."""
+    if values is None or isinstance(values, str):
+        return [values], np.zeros(count, dtype=int)
+    values = list(values)
+    if len(values) != count:
+        raise ValueError(f"Expected {count} values, got {len(values)}")
+    distinct = {}
+    codes = np.fromiter((distinct.setdefault(value, len(distinct)) for value in values), dtype=int, count=count)
+    return list(distinct), codes
 
 
 class BaggageFeeCalculatorProxy:
-    def __init__(self):
-        self.calculator = BaggageFeeCalculator()
+    def __init__(self, policy=None):
+        self.calculator = BaggageFeeCalculator(policy)
 
-    def calculate_fee(self, weight):
-        return self.calculator.calculate_fee(weight)
+    def calculate_fee(self, weight, travel_class=None, route=None, piece=1):
+        return self.calculator.calculate_fee(weight, travel_class, route, piece)
 
-    def get_limit(self):
-        return self.calculator.policy.get_limit()
+    def calculate_fees(self, weights, travel_classes=None, routes=None, pieces=None):
+        return self.calculator.calculate_fees(weights, travel_classes, routes, pieces)
 
+    def get_limit(self, travel_class=None, route=None):
+        return self.calculator.policy.snapshot().table(travel_class, route).allowance
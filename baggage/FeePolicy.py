@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+from bisect import bisect_right
+from types import MappingProxyType
+
+import numpy as np
+
+ANY = "*"
+
+# Weights are priced in one searchsorted over every table's breakpoints laid
+# end to end, table i occupying [i * _TABLE_SPAN, (i + 1) * _TABLE_SPAN)
+_TABLE_SPAN = 1e6
+
+# What a missing, unparsable or malformed rules file raises while loading,
+# e.g. a rule without "limit" (KeyError) or with a number for "tiers" (TypeError)
+RULE_FILE_ERRORS = (OSError, ValueError, KeyError, TypeError, AttributeError)
+
+
+def route_key(source, destination):
+    """Route name used in fee rules, e.g. "New York-London"."""
+    return f"{source}-{destination}"
+
+
+class FeeTable:
+    """Compiled fee for one (route, class): piecewise linear in weight plus a per-piece charge.
+
+    ``tiers`` is a list of (from_kg, fee_per_kg) pairs: every kilogram above
+    ``from_kg`` is charged at that tier's rate until the next tier starts. The
+    free allowance is where the first non-zero rate begins. Breakpoints, rates
+    and the fee already owed at each breakpoint are precomputed, so a weight is
+    priced with one bisect (or one ``np.searchsorted`` for a whole array).
+    """
+
+    __slots__ = ("starts", "rates", "base", "piece_fees", "allowance", "_starts", "_rates", "_base")
+
+    def __init__(self, tiers, piece_fees=(0,)):
+        tiers = sorted((start, rate) for start, rate in tiers)
+        if not tiers or tiers[0][0] != 0:
+            tiers.insert(0, (0, 0))
+        if len({start for start, _ in tiers}) != len(tiers):
+            raise ValueError("Fee tiers must start at different weights")
+        if any(rate < 0 for _, rate in tiers):
+            raise ValueError("Fee rates cannot be negative")
+
+        base = [0]
+        for (start, rate), (next_start, _) in zip(tiers, tiers[1:]):
+            base.append(base[-1] + (next_start - start) * rate)
+        self.starts = tuple(start for start, _ in tiers)
+        self.rates = tuple(rate for _, rate in tiers)
+        self.base = tuple(base)
+        self.piece_fees = tuple(piece_fees) or (0,)
+        charged = [start for start, rate in tiers if rate > 0]
+        self.allowance = charged[0] if charged else float("inf")
+        self._starts = _frozen(self.starts)
+        self._rates = _frozen(self.rates)
+        self._base = _frozen(self.base)
+
+    @classmethod
+    def flat(cls, limit, fee_per_kg):
+        return cls([(0, 0), (limit, fee_per_kg)])
+
+    def fee(self, weight, piece=1):
+        if weight <= 0:
+            tier_fee = 0
+        else:
+            i = bisect_right(self.starts, weight) - 1
+            tier_fee = self.base[i] + (weight - self.starts[i]) * self.rates[i]
+        return tier_fee + self.piece_fee(piece)
+
+    def piece_fee(self, piece):
+        # The last listed charge applies to every further piece
+        return self.piece_fees[min(max(piece, 1), len(self.piece_fees)) - 1]
+
+    def fees(self, weights, pieces=None):
+        weights = np.maximum(np.asarray(weights, dtype=float), 0)
+        i = np.searchsorted(self._starts, weights, side="right") - 1
+        fees = self._base[i] + (weights - self._starts[i]) * self._rates[i]
+        if pieces is not None:
+            piece_fees = _frozen(self.piece_fees)
+            fees += piece_fees[np.clip(np.asarray(pieces, dtype=int), 1, len(piece_fees)) - 1]
+        elif self.piece_fees[0]:
+            fees += self.piece_fees[0]
+        return fees
+
+    def first_rate(self):
+        """Rate of the first charged tier, 0 if nothing is ever charged."""
+        return next((rate for rate in self.rates if rate > 0), 0)
+
+
+def _frozen(values):
+    array = np.array(values, dtype=float)
+    array.setflags(write=False)
+    return array
+
+
+class FeeSchedule:
+    """An immutable, compiled set of fee rules; ``table()`` never locks.
+
+    A rule applies to a route and a cabin class, either of which may be
+    ``"*"``. The most specific rule wins: (route, class), then (route, *),
+    then (*, class), then the default. For batches every table is also packed
+    into shared arrays, so bags on many routes are priced in one pass.
+    """
+
+    def __init__(self, tables, default, version=0, label=None):
+        self._tables = MappingProxyType(dict(tables))
+        self.default = default
+        self.version = version
+        self.label = label
+
+        all_tables = [default] + list(self._tables.values())
+        self._index = {id(table): i for i, table in enumerate(all_tables)}
+        self._keys = _frozen([i * _TABLE_SPAN + start for i, table in enumerate(all_tables) for start in table.starts])
+        self._starts = _frozen([start for table in all_tables for start in table.starts])
+        self._base = _frozen([base for table in all_tables for base in table.base])
+        self._rates = _frozen([rate for table in all_tables for rate in table.rates])
+        widest = max(len(table.piece_fees) for table in all_tables)
+        self._piece_fees = _frozen([table.piece_fees + table.piece_fees[-1:] * (widest - len(table.piece_fees))
+                                    for table in all_tables])
+
+    @classmethod
+    def compile(cls, rules, version=0):
+        """Build a schedule from a rule table (see ``TieredFeePolicy``)."""
+        default = rules.get("default", {"tiers": [[0, 0], [20, 10]]})
+        tables = {}
+        for rule in rules.get("rules", ()):
+            key = (rule.get("route", ANY), rule.get("class", ANY))
+            if key in tables:
+                raise ValueError(f"Duplicate fee rule for route '{key[0]}' and class '{key[1]}'")
+            tables[key] = _table(rule)
+        return cls(tables, _table(default), version, rules.get("version"))
+
+    def table(self, travel_class=None, route=None):
+        tables = self._tables
+        travel_class = travel_class or ANY
+        route = route or ANY
+        return (tables.get((route, travel_class)) or tables.get((route, ANY))
+                or tables.get((ANY, travel_class)) or self.default)
+
+    def table_index(self, travel_class=None, route=None):
+        return self._index[id(self.table(travel_class, route))]
+
+    def fees(self, weights, table_indexes, pieces=None):
+        """Fees of bags priced by the tables at ``table_indexes`` (from ``table_index``)."""
+        weights = np.maximum(np.asarray(weights, dtype=float), 0)
+        table_indexes = np.asarray(table_indexes, dtype=int)
+        keys = table_indexes * _TABLE_SPAN + np.minimum(weights, _TABLE_SPAN - 1)
+        i = np.searchsorted(self._keys, keys, side="right") - 1
+        fees = self._base[i] + (weights - self._starts[i]) * self._rates[i]
+        if pieces is None:
+            pieces = np.ones(len(weights), dtype=int)
+        piece_columns = np.clip(np.asarray(pieces, dtype=int), 1, self._piece_fees.shape[1]) - 1
+        return fees + self._piece_fees[table_indexes, piece_columns]
+
+    def __len__(self):
+        return len(self._tables)
+
+
+def _table(rule):
+    if "tiers" in rule:
+        tiers = rule["tiers"]
+    else:
+        tiers = [(0, 0), (rule["limit"], rule["fee_per_kg"])]
+    return FeeTable(tiers, rule.get("piece_fees", (0,)))
+
+
+class TieredFeePolicy:
+    """Route-, class- and piece-aware baggage pricing loaded from rule tables.
+
+    Rules look like::
+
+        {"version": "winter-2026",
+         "default": {"limit": 20, "fee_per_kg": 10},
+         "rules": [
+             {"class": "Business", "tiers": [[0, 0], [32, 8]]},
+             {"route": "New York-London", "class": "Economy",
+              "tiers": [[0, 0], [23, 12], [32, 25]], "piece_fees": [0, 60, 150]}]}
+
+    Each load compiles a new ``FeeSchedule`` and swaps it in with a single
+    assignment, so readers take ``snapshot()`` without a lock and always see
+    one whole schedule; loads are serialised among themselves only.
+    ``version`` goes up by one on every load.
+    """
+
+    def __init__(self, rules=None, path=None):
+        self.path = path
+        self._mtime = None
+        self._load_lock = threading.Lock()
+        self._schedule = FeeSchedule.compile({})
+        if path is not None:
+            self.load_file(path)
+        elif rules is not None:
+            self.load(rules)
+
+    @property
+    def version(self):
+        return self._schedule.version
+
+    def snapshot(self):
+        return self._schedule
+
+    def load(self, rules):
+        with self._load_lock:
+            self._schedule = FeeSchedule.compile(rules, self._schedule.version + 1)
+            return self._schedule
+
+    def load_file(self, path=None):
+        path = path or self.path
+        mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as f:
+            rules = json.load(f)
+        schedule = self.load(rules)
+        self.path = path
+        self._mtime = mtime
+        return schedule
+
+    def reload_if_changed(self):
+        """Reload the rules file if it changed on disk; returns True if it did."""
+        if self.path is None:
+            return False
+        try:
+            if os.path.getmtime(self.path) == self._mtime:
+                return False
+            self.load_file()
+            return True
+        except RULE_FILE_ERRORS as e:
+            # Keep serving the current schedule if the new file is missing or invalid
+            print(f"Error reloading baggage fee rules: {e!r}")
+            return False
+
+    def get_table(self, travel_class=None, route=None):
+        return self._schedule.table(travel_class, route)
+
+    def get_limit(self, travel_class=None, route=None):
+        return self.get_table(travel_class, route).allowance
+
+    def get_fee_per_kg(self, travel_class=None, route=None):
+        return self.get_table(travel_class, route).first_rate()
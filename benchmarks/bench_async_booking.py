@@ -0,0 +1,124 @@
+"""Compare sequential booking flows with concurrent flows on the async handler.
+
+Each flow adds a passenger, adds a bag and books a distinct seat. The async
+run keeps ``--concurrency`` flows in flight at once; it only pays off when the
+handler has a connection pool to spread them over (MySQL with ``--pool-size``).
+SQLite has a single connection, so there the async run only measures the
+executor's overhead and is reported as such, not as a speedup.
+
+Usage:
+    python -m benchmarks.bench_async_booking --flows 500 --pool-size 16
+    python -m benchmarks.bench_async_booking --backend sqlite --path bench.db
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, time as clock
+
+from Database.async_handler import AsyncDatabaseHandler
+from Database.factory import create_database_handler
+
+SYNC_FLIGHT = "BSYNC"
+ASYNC_FLIGHT = "BASYNC"
+
+
+def seat_ids(count):
+    return [f"{index // 6 + 1}{'ABCDEF'[index % 6]}" for index in range(count)]
+
+
+def prepare(db, flows):
+    cleanup(db)
+    seats = {seat: True for seat in seat_ids(flows)}
+    for flight_id in (SYNC_FLIGHT, ASYNC_FLIGHT):
+        db.add_flight(flight_id, "BenchAir", "Origin", "Destination",
+                      clock(8, 0), clock(10, 0), date.today(), flows)
+    db.initialize_seats_bulk({SYNC_FLIGHT: seats, ASYNC_FLIGHT: seats})
+
+
+def cleanup(db):
+    for flight_id in (SYNC_FLIGHT, ASYNC_FLIGHT):
+        db.execute_query("DELETE FROM baggage WHERE passenger_id IN "
+                         "(SELECT passenger_id FROM bookings WHERE flight_id = %s)", (flight_id,))
+        db.execute_query("DELETE FROM bookings WHERE flight_id = %s", (flight_id,))
+        db.execute_query("DELETE FROM seat_availability WHERE flight_id = %s", (flight_id,))
+        db.execute_query("DELETE FROM seats WHERE flight_id = %s", (flight_id,))
+        db.execute_query("DELETE FROM flights WHERE flight_id = %s", (flight_id,))
+
+
+def booking_flow(db, flight_id, index, seat_id):
+    passenger_id = db.add_passenger(f"Bench {index}", None, 30, "Regular", "Work")
+    db.add_baggage(passenger_id, 20.0, 30)
+    return db.book_seat(f"{flight_id}-{index}", passenger_id, flight_id, seat_id, True).ok
+
+
+async def async_booking_flow(adb, flight_id, index, seat_id, limit):
+    async with limit:
+        passenger_id = await adb.add_passenger(f"Bench {index}", None, 30, "Regular", "Work")
+        await adb.add_baggage(passenger_id, 20.0, 30)
+        result = await adb.book_seat(f"{flight_id}-{index}", passenger_id, flight_id, seat_id, True)
+        return result.ok
+
+
+async def run_async(adb, seats, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(async_booking_flow(adb, ASYNC_FLIGHT, index, seat, limit)
+                                  for index, seat in enumerate(seats)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flows", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=16, help="MySQL connection pool size")
+    parser.add_argument("--backend", default="mysql", choices=("mysql", "sqlite"))
+    parser.add_argument("--path", default=":memory:", help="SQLite database file")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="11")
+    parser.add_argument("--database", default="flight_booking")
+    args = parser.parse_args()
+
+    options = {"path": args.path} if args.backend == "sqlite" else {
+        "host": args.host, "user": args.user, "password": args.password,
+        "database": args.database, "pool_size": args.pool_size,
+    }
+    db = create_database_handler(args.backend, **options)
+    if not db.connect():
+        print("Failed to connect to database")
+        return 1
+    db.create_tables()
+    prepare(db, args.flows)
+    seats = seat_ids(args.flows)
+    adb = AsyncDatabaseHandler(db)
+
+    try:
+        start = time.perf_counter()
+        sync_ok = sum(booking_flow(db, SYNC_FLIGHT, index, seat) for index, seat in enumerate(seats))
+        sync_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        async_ok = sum(asyncio.run(run_async(adb, seats, args.concurrency)))
+        async_elapsed = time.perf_counter() - start
+    finally:
+        adb.close()
+        cleanup(db)
+        db.disconnect()
+
+    if sync_ok != args.flows or async_ok != args.flows:
+        print(f"Not every flow booked its seat (sync {sync_ok}, async {async_ok})")
+        return 1
+
+    print(f"{args.flows} booking flows, {adb.max_workers} executor workers, "
+          f"{args.concurrency} in flight")
+    print(f"sync:  {sync_elapsed:8.3f}s  {args.flows / sync_elapsed:10.0f} flows/s")
+    print(f"async: {async_elapsed:8.3f}s  {args.flows / async_elapsed:10.0f} flows/s")
+    if adb.max_workers > 1:
+        print(f"speedup: {sync_elapsed / async_elapsed:6.2f}x")
+    else:
+        print(f"overhead: {async_elapsed / sync_elapsed:5.2f}x the sync time; one connection, so calls run "
+              f"one at a time (use MySQL with --pool-size to measure concurrency)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""Price a manifest of bags one Baggage object at a time and in one batch call.
+
+Usage:
+    python -m benchmarks.bench_baggage_fees --bags 50000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from baggage.Baggage import Baggage
+from baggage.BaggageFeeCalc import BaggageFeeCalculatorProxy
+
+CLASSES = ("Economy", "Premium", "Business", "First")
+ROUTES = ("NYC-LAX", "LHR-JFK", "DXB-SIN", "CAI-CDG")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bags", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    weights = [round(rng.uniform(5, 35), 1) for _ in range(args.bags)]
+    classes = [rng.choice(CLASSES) for _ in range(args.bags)]
+    routes = [rng.choice(ROUTES) for _ in range(args.bags)]
+
+    start = time.perf_counter()
+    looped = [Baggage("Passenger", weight).calculate_fee() for weight in weights]
+    loop_elapsed = time.perf_counter() - start
+
+    calculator = BaggageFeeCalculatorProxy()
+    start = time.perf_counter()
+    batch = calculator.calculate_fees(weights)
+    batch_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    routed = calculator.calculate_fees(weights, classes, routes)
+    routed_elapsed = time.perf_counter() - start
+
+    if not np.allclose(batch, looped) or not np.allclose(routed, looped):
+        print("Batch fees differ from the per-bag loop")
+        return 1
+    print(f"{args.bags} bags, ${batch.sum():,.2f} in fees")
+    for label, elapsed in (("per bag", loop_elapsed), ("batch", batch_elapsed),
+                           ("batch by class/route", routed_elapsed)):
+        print(f"{label:22s} {elapsed * 1e3:9.2f}ms  {args.bags / elapsed:12,.0f} bags/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
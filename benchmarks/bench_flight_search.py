@@ -0,0 +1,138 @@
+"""Compare flight-by-flight availability lookups with the indexed schedule search.
+
+Usage:
+    python -m benchmarks.bench_flight_search --flights 10000
+    python -m benchmarks.bench_flight_search --backend sqlite --path bench.db
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta, time as clock
+
+from Database.factory import create_database_handler
+from flights.FlightSearch import FlightSearch
+from flights.SeatInventory import SeatInventory
+from flights.SeatLayout import get_layout
+
+CITIES = ("New York", "Los Angeles", "Chicago", "Miami", "Boston", "San Francisco", "Seattle", "Denver")
+FIRST_DAY = date(2030, 1, 1)
+
+
+def flight_ids(count):
+    return [f"BS{index:06d}" for index in range(count)]
+
+
+def seed(db, count, layout, days, rng):
+    routes = [(source, destination) for source in CITIES for destination in CITIES if source != destination]
+    for flight_id in flight_ids(count):
+        source, destination = rng.choice(routes)
+        db.add_flight(flight_id, "BenchAir", source, destination, clock(rng.randrange(24), 0), clock(23, 59),
+                      FIRST_DAY + timedelta(days=rng.randrange(days)), len(layout), layout.code)
+    ids = flight_ids(count)
+    for start in range(0, count, 500):
+        chunk = ids[start:start + 500]
+        seat_maps = {}
+        for flight_id in chunk:
+            seat_map = layout.seat_map()
+            for seat_id in rng.sample(layout.seat_ids, rng.randrange(len(layout))):
+                seat_map[seat_id] = False
+            seat_maps[flight_id] = seat_map
+        db.initialize_seats_bulk(seat_maps, seat_types={flight_id: layout.seat_type_table for flight_id in chunk})
+    return routes
+
+
+def cleanup(db, count):
+    ids = flight_ids(count)
+    for start in range(0, count, 500):
+        chunk = ids[start:start + 500]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        for table in ("seat_availability", "seats", "flights"):
+            db.execute_query(f"DELETE FROM {table} WHERE flight_id IN ({placeholders})", chunk)
+
+
+def one_flight_at_a_time(db, flights, query):
+    """What flipping through flight_combo does: filter the schedule, then query each flight."""
+    source, destination, date_from, date_to, seat_type, party_size = query
+    found = []
+    for flight in flights:
+        if flight.source != source or flight.destination != destination:
+            continue
+        if not date_from <= flight.date <= date_to:
+            continue
+        seats = db.get_available_seats(flight.flight_id) or []
+        free = sum(1 for _, row_type in seats if seat_type is None or row_type == seat_type)
+        if free >= party_size:
+            found.append(flight.flight_id)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=10000)
+    parser.add_argument("--layout", default="A320")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--backend", default="mysql", choices=("mysql", "sqlite"))
+    parser.add_argument("--path", default=":memory:", help="SQLite database file")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="11")
+    parser.add_argument("--database", default="flight_booking")
+    args = parser.parse_args()
+
+    db = create_database_handler(args.backend, path=args.path, host=args.host, user=args.user,
+                                 password=args.password, database=args.database)
+    if not db.connect():
+        print("Failed to connect to database")
+        return 1
+    db.create_tables()
+    rng = random.Random(7)
+    cleanup(db, args.flights)
+
+    start = time.perf_counter()
+    routes = seed(db, args.flights, get_layout(args.layout), args.days, rng)
+    print(f"seeded {args.flights} {args.layout} flights in {time.perf_counter() - start:.2f}s")
+
+    try:
+        queries = []
+        for _ in range(args.searches):
+            date_from = FIRST_DAY + timedelta(days=rng.randrange(args.days))
+            queries.append((*rng.choice(routes), date_from, date_from + timedelta(days=rng.randrange(1, 8)),
+                            rng.choice((None, "Window", "Aisle")), rng.randrange(1, 10)))
+
+        search = FlightSearch(SeatInventory(db, start_expiry=False))
+        start = time.perf_counter()
+        search.load()
+        index_elapsed = time.perf_counter() - start
+        flights = [flight for route in search.routes() for flight in search.flights_between(
+            *route, date.min, date.max)]
+
+        start = time.perf_counter()
+        expected = [one_flight_at_a_time(db, flights, query) for query in queries]
+        loop_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = [[result.flight.flight_id for result in search.search(*query[:3], date_to=query[3],
+                                                                     seat_type=query[4], party_size=query[5])]
+                 for query in queries]
+        search_elapsed = time.perf_counter() - start
+        search.seat_inventory.close()
+
+        if [sorted(ids) for ids in found] != [sorted(ids) for ids in expected]:
+            print("Indexed search disagrees with the flight-by-flight lookup")
+            return 1
+
+        matches = sum(len(ids) for ids in found)
+        print(f"{args.searches} searches over {args.flights} flights ({matches} matches), "
+              f"index built in {index_elapsed:.2f}s")
+        print(f"one flight at a time: {loop_elapsed:8.3f}s  {args.searches / loop_elapsed:8.1f} searches/s")
+        print(f"indexed search:       {search_elapsed:8.3f}s  {args.searches / search_elapsed:8.1f} searches/s")
+        print(f"speedup: {loop_elapsed / search_elapsed:.1f}x")
+        return 0
+    finally:
+        cleanup(db, args.flights)
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+"""Compare per-passenger booking calls with one group booking of the same manifest.
+
+Usage:
+    python -m benchmarks.bench_group_booking --passengers 200
+    python -m benchmarks.bench_group_booking --backend sqlite --path bench.db
+"""
+import argparse
+import time
+from datetime import date, time as clock
+
+from Database.factory import create_database_handler
+from Database.group_booking import GroupBooking
+
+LOOP_FLIGHT = "BGLOOP"
+GROUP_FLIGHT = "BGGROUP"
+
+
+def seat_ids(count):
+    return [f"{index // 6 + 1}{'ABCDEF'[index % 6]}" for index in range(count)]
+
+
+def make_manifest(seats, prefix):
+    return [{"name": f"Charter {index}", "email": f"charter{index}@example.com", "age": 30,
+             "passenger_type": "Regular", "preferences": "Work", "seat_id": seat,
+             "ticket_id": f"{prefix}{index:06d}", "baggage_weight": 23.0, "payment_status": True}
+            for index, seat in enumerate(seats)]
+
+
+def cleanup(db):
+    for flight_id in (LOOP_FLIGHT, GROUP_FLIGHT):
+        db.execute_query("DELETE FROM baggage WHERE passenger_id IN "
+                         "(SELECT passenger_id FROM bookings WHERE flight_id = %s)", (flight_id,))
+        db.execute_query("DELETE FROM bookings WHERE flight_id = %s", (flight_id,))
+        db.execute_query("DELETE FROM seat_availability WHERE flight_id = %s", (flight_id,))
+        db.execute_query("DELETE FROM seats WHERE flight_id = %s", (flight_id,))
+        db.execute_query("DELETE FROM flights WHERE flight_id = %s", (flight_id,))
+
+
+def book_one_by_one(db, flight_id, manifest, group):
+    entries, _ = group.validate(manifest)
+    booked = 0
+    for entry in entries:
+        passenger_id = db.add_passenger(entry["name"], entry["email"], entry["age"],
+                                        entry["passenger_type"], entry["preferences"])
+        db.add_baggage(passenger_id, entry["baggage_weight"], entry["baggage_fee"])
+        result = db.book_seat(entry["ticket_id"], passenger_id, flight_id, entry["seat_id"])
+        booked += db.update_booking_payment(entry["ticket_id"], entry["payment_status"]) and result.ok
+    return booked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passengers", type=int, default=200)
+    parser.add_argument("--backend", default="mysql", choices=("mysql", "sqlite"))
+    parser.add_argument("--path", default=":memory:", help="SQLite database file")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="11")
+    parser.add_argument("--database", default="flight_booking")
+    args = parser.parse_args()
+
+    db = create_database_handler(args.backend, path=args.path, host=args.host, user=args.user,
+                                 password=args.password, database=args.database)
+    if not db.connect():
+        print("Failed to connect to database")
+        return 1
+    db.create_tables()
+    cleanup(db)
+
+    seats = seat_ids(args.passengers)
+    for flight_id in (LOOP_FLIGHT, GROUP_FLIGHT):
+        db.add_flight(flight_id, "BenchAir", "Origin", "Destination",
+                      clock(8, 0), clock(10, 0), date.today(), len(seats))
+    db.initialize_seats_bulk({flight_id: {seat: True for seat in seats} for flight_id in (LOOP_FLIGHT, GROUP_FLIGHT)})
+    group = GroupBooking(db)
+
+    try:
+        start = time.perf_counter()
+        loop_booked = book_one_by_one(db, LOOP_FLIGHT, make_manifest(seats, "BGL"), group)
+        loop_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = group.book(GROUP_FLIGHT, make_manifest(seats, "BGG"))
+        group_elapsed = time.perf_counter() - start
+    finally:
+        cleanup(db)
+        db.disconnect()
+
+    if loop_booked != args.passengers or not result.ok:
+        print(f"Not every passenger was booked (loop {loop_booked}, group {result})")
+        return 1
+
+    print(f"{args.passengers} passengers with one bag each")
+    print(f"one by one: {loop_elapsed:8.3f}s  {args.passengers / loop_elapsed:10.0f} passengers/s")
+    print(f"group:      {group_elapsed:8.3f}s  {args.passengers / group_elapsed:10.0f} passengers/s")
+    print(f"speedup:    {loop_elapsed / group_elapsed:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
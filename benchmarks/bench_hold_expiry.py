@@ -0,0 +1,67 @@
+"""Place, confirm and expire seat holds at scale on a single expiry thread.
+
+Usage:
+    python -m benchmarks.bench_hold_expiry --flights 1000 --seats 300
+"""
+import argparse
+import time
+
+from flights.SeatInventory import SeatInventory
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=1000)
+    parser.add_argument("--seats", type=int, default=300)
+    parser.add_argument("--confirm-every", type=int, default=3, help="confirm one hold in N")
+    args = parser.parse_args()
+
+    clock = ManualClock()
+    inventory = SeatInventory(default_ttl=600, clock=clock, start_expiry=False)
+    seats = [(f"{index // 6 + 1}{'ABCDEF'[index % 6]}", "Window" if index % 6 in (0, 5) else "Middle", True)
+             for index in range(args.seats)]
+    for flight in range(args.flights):
+        inventory.add_flight(f"BH{flight:05d}", seats)
+    total = args.flights * args.seats
+
+    start = time.perf_counter()
+    holds = []
+    for flight in range(args.flights):
+        flight_id = f"BH{flight:05d}"
+        for seat_id, _, _ in seats:
+            holds.append((flight_id, seat_id, inventory.hold(flight_id, seat_id, ttl=60 + len(holds) % 540)))
+    hold_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    confirmed = sum(inventory.confirm(flight_id, seat_id, token)
+                    for flight_id, seat_id, token in holds[::args.confirm_every])
+    confirm_elapsed = time.perf_counter() - start
+
+    live = inventory.hold_count()
+    clock.now = 601
+    start = time.perf_counter()
+    expired = inventory.expiry.expire_due()
+    expire_elapsed = time.perf_counter() - start
+    inventory.close()
+
+    if expired != live or expired + confirmed != total:
+        print(f"Unexpected counts: {confirmed} confirmed, {expired} expired of {total}")
+        return 1
+
+    print(f"{total} holds over {args.flights} flights")
+    print(f"hold:    {hold_elapsed:8.3f}s  {total / hold_elapsed:10.0f} holds/s")
+    print(f"confirm: {confirm_elapsed:8.3f}s  {confirmed / confirm_elapsed:10.0f} confirms/s")
+    print(f"expire:  {expire_elapsed:8.3f}s  {expired / expire_elapsed:10.0f} expiries/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""Cost of one SeatSwapper update as the manifest grows, against a full rerun.
+
+Usage:
+    python -m benchmarks.bench_incremental_swap --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_seat_assignment import make_passengers, make_zones
+from utilities.seat_swap import SeatSwapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--updates", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'passengers':>10s}  {'add+assign':>12s}  {'remove+assign':>14s}  {'full rerun':>12s}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        # Leave a tenth of the cabin free so new passengers can be seated
+        zones = make_zones(size // 6 + size // 60 + 4)
+        passengers = make_passengers(size, rng)
+        swapper = SeatSwapper(zones)
+        for passenger in passengers:
+            swapper.add_passenger(passenger)
+        start = time.perf_counter()
+        swapper.assign_seats()
+        full_elapsed = time.perf_counter() - start
+
+        updates = min(args.updates, size)
+        extra = make_passengers(updates, rng)
+        start = time.perf_counter()
+        for passenger in extra:
+            swapper.add_passenger(passenger)
+            swapper.assign_seats()
+        add_elapsed = (time.perf_counter() - start) / updates
+
+        leaving = rng.sample(passengers, updates)
+        start = time.perf_counter()
+        for passenger in leaving:
+            swapper.remove_passenger(passenger)
+            swapper.assign_seats()
+        remove_elapsed = (time.perf_counter() - start) / updates
+
+        print(f"{size:10d}  {add_elapsed * 1e6:10.1f}us  {remove_elapsed * 1e6:12.1f}us  "
+              f"{full_elapsed * 1e6:10.1f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
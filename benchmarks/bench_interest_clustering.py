@@ -0,0 +1,88 @@
+"""Seat socializers by interest cluster as passengers board, with and without clustering.
+
+Usage:
+    python -m benchmarks.bench_interest_clustering --passengers 1000 --batch 20
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_seat_assignment import make_zones
+from utilities.interest_clustering import InterestClusters
+from utilities.seat_swap import Passenger, SeatSwapper, Socializer
+
+TOPICS = (
+    ("tech", "startups", "ai", "software"),
+    ("golf", "tennis", "sailing"),
+    ("jazz", "music", "concerts"),
+    ("painting", "art", "museums"),
+    ("wine", "food", "cooking"),
+    ("hiking", "travel", "mountains"),
+)
+
+
+def make_interest(rng):
+    topic = rng.choice(TOPICS)
+    return " and ".join(rng.sample(topic, rng.randrange(1, 3)))
+
+
+def make_boarding(count, rng):
+    passengers = []
+    for index in range(count):
+        if rng.random() < 0.4:
+            passengers.append(Socializer(f"S{index}", "", "Networking", make_interest(rng)))
+        else:
+            passengers.append(Passenger(f"P{index}", "", rng.choice(("Sleep", "Work", "Comfort"))))
+    return passengers
+
+
+def cohesion(zones, passengers):
+    """Share of clustered socializers seated directly next to someone from their cluster."""
+    socializers = [p for p in passengers if isinstance(p, Socializer) and p.get_seat()]
+    clusters = InterestClusters()
+    cluster_ids = dict(zip(socializers, clusters.add_many((p, p.get_interest()) for p in socializers)))
+    position = {seat: index for index, seat in enumerate(zones["Networking"])}
+    by_position = {position[p.get_seat()]: cluster_ids[p] for p in socializers if p.get_seat() in position}
+    together = sum(1 for index, cluster_id in by_position.items()
+                   if cluster_id in (by_position.get(index - 1), by_position.get(index + 1)))
+    return together / max(len(by_position), 1)
+
+
+def run(zones, passengers, batch, cluster_interests):
+    swapper = SeatSwapper(zones, cluster_interests=cluster_interests)
+    start = time.perf_counter()
+    for offset in range(0, len(passengers), batch):
+        for passenger in passengers[offset:offset + batch]:
+            swapper.add_passenger(passenger)
+        swapper.assign_seats()
+    return time.perf_counter() - start, len(swapper.get_unassigned())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passengers", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=20, help="passengers boarding between assignment passes")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    # Networking is the first quarter of the cabin, enough for every socializer
+    zones = make_zones(args.passengers * 3 // 12 + 1)
+    sample = make_boarding(args.passengers, random.Random(args.seed))
+    socializers = [(p, p.get_interest()) for p in sample if isinstance(p, Socializer)]
+    start = time.perf_counter()
+    clusters = InterestClusters()
+    clusters.add_many(socializers)
+    print(f"{args.passengers} passengers, {len(socializers)} socializers in {len(clusters)} interest clusters "
+          f"({(time.perf_counter() - start) * 1e3:.1f}ms to cluster)")
+
+    for cluster_interests in (False, True):
+        passengers = make_boarding(args.passengers, random.Random(args.seed))
+        elapsed, unassigned = run(zones, passengers, args.batch, cluster_interests)
+        label = "clustered" if cluster_interests else "in order"
+        print(f"{label:10s} {elapsed * 1e3:8.1f}ms  {cohesion(zones, passengers):6.1%} of socializers "
+              f"next to their cluster, {unassigned} unassigned")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""Allocate adjacent seats for parties of 2-9 on nearly full 300-seat flights.
+
+Usage:
+    python -m benchmarks.bench_party_allocation --flights 200 --load 0.9
+"""
+import argparse
+import random
+import time
+
+from flights.SeatInventory import SeatInventory
+from flights.SeatLayout import SeatLayout
+
+LAYOUT = SeatLayout.from_definition({
+    "code": "BENCH300",
+    "cabins": [{"name": "Economy", "rows": [1, 50], "letters": "ABCDEF", "aisles_after": "C"}],
+})
+
+
+def scan_for_run(layout, available, size):
+    """Baseline: rescan every aisle-free block for a free run on each request."""
+    for block in layout.blocks:
+        run = []
+        for position in block:
+            run = run + [position] if available[position] else []
+            if len(run) == size:
+                return run
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=200)
+    parser.add_argument("--load", type=float, default=0.9, help="fraction of seats already booked")
+    parser.add_argument("--requests", type=int, default=50, help="party requests per flight")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    inventory = SeatInventory(start_expiry=False)
+    booked = {}
+    for flight in range(args.flights):
+        flight_id = f"BP{flight:05d}"
+        taken = set(rng.sample(range(len(LAYOUT)), int(len(LAYOUT) * args.load)))
+        booked[flight_id] = taken
+        inventory.add_flight(flight_id, [(seat_id, LAYOUT.seat_types[position], position not in taken)
+                                         for position, seat_id in enumerate(LAYOUT.seat_ids)], layout=LAYOUT)
+    requests = [(f"BP{rng.randrange(args.flights):05d}", rng.randrange(2, 10))
+                for _ in range(args.flights * args.requests)]
+
+    available = {flight_id: [position not in taken for position in range(len(LAYOUT))]
+                 for flight_id, taken in booked.items()}
+    start = time.perf_counter()
+    scanned = 0
+    for flight_id, size in requests:
+        run = scan_for_run(LAYOUT, available[flight_id], size)
+        if run is not None:
+            scanned += 1
+            for position in run:
+                available[flight_id][position] = False
+    scan_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    placed = seated_apart = 0
+    for flight_id, size in requests:
+        seat_ids, token = inventory.hold_group(flight_id, size)
+        if seat_ids:
+            placed += 1
+            rows = {LAYOUT.rows[LAYOUT.index[seat_id]] for seat_id in seat_ids}
+            blocks = {LAYOUT.columns[LAYOUT.index[seat_id]] < 3 for seat_id in seat_ids}
+            seated_apart += len(rows) > 1 or len(blocks) > 1
+    inventory_elapsed = time.perf_counter() - start
+    inventory.close()
+
+    total = len(requests)
+    print(f"{total} party requests on {args.flights} flights of {len(LAYOUT)} seats, {args.load:.0%} booked")
+    print(f"block scan:   {scan_elapsed:8.3f}s  {total / scan_elapsed:10.0f} requests/s  "
+          f"({scanned} seated in one run)")
+    print(f"free runs:    {inventory_elapsed:8.3f}s  {total / inventory_elapsed:10.0f} requests/s  "
+          f"({placed} seated, {seated_apart} of them across the aisle)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
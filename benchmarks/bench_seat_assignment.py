@@ -0,0 +1,72 @@
+"""Compare greedy and optimal SeatSwapper assignment on a full aircraft.
+
+Usage:
+    python -m benchmarks.bench_seat_assignment --rows 55 --passengers 330
+"""
+import argparse
+import random
+import time
+
+from utilities.seat_swap import Passenger, SeatSwapper, Socializer, TallPassenger
+
+ZONES = ("Networking", "Quiet", "Work", "Legroom")
+PREFERENCES = ("Networking", "Sleep", "Work", "Comfort", "Eco-Friendly")
+INTERESTS = ("Tech", "Art", "Golf", "Music", "Travel")
+
+
+def make_zones(rows, letters="ABCDEF"):
+    zones = {zone: [] for zone in ZONES}
+    for row in range(1, rows + 1):
+        zone = ZONES[min(len(ZONES) - 1, (row - 1) * len(ZONES) // rows)]
+        zones[zone].extend(f"{row}{letter}" for letter in letters)
+    return zones
+
+
+def make_passengers(count, rng):
+    passengers = []
+    for index in range(count):
+        preference = rng.choice(PREFERENCES)
+        kind = rng.random()
+        if kind < 0.3:
+            passengers.append(Socializer(f"S{index}", "", preference, rng.choice(INTERESTS)))
+        elif kind < 0.5:
+            passengers.append(TallPassenger(f"T{index}", "", preference, rng.randrange(165, 205)))
+        else:
+            passengers.append(Passenger(f"P{index}", "", preference))
+    return passengers
+
+
+def run(mode, zones, passengers):
+    swapper = SeatSwapper(zones)
+    for passenger in passengers:
+        swapper.add_passenger(passenger)
+    start = time.perf_counter()
+    swapper.assign_seats(mode)
+    elapsed = time.perf_counter() - start
+
+    seated = [p for p in passengers if p not in swapper.get_unassigned()]
+    seats = [p.get_seat() for p in seated]
+    cost = SeatSwapper(zones).cost_matrix(seated, seats).diagonal().sum()
+    return elapsed, cost, len(swapper.get_unassigned())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=55)
+    parser.add_argument("--passengers", type=int, default=330)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    zones = make_zones(args.rows)
+    seats = sum(len(seats) for seats in zones.values())
+    print(f"{args.passengers} passengers, {seats} seats")
+    for mode in SeatSwapper.MODES:
+        elapsed, cost, unassigned = run(mode, zones, make_passengers(args.passengers, random.Random(args.seed)))
+        seated = args.passengers - unassigned
+        print(f"{mode:8s} {elapsed:8.3f}s  {seated} seated at {cost / max(seated, 1):5.2f} cost each, "
+              f"{unassigned} unassigned")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
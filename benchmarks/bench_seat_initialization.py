@@ -0,0 +1,86 @@
+"""Compare the per-seat insert loop with the bulk seat initialization path.
+
+Usage:
+    python -m benchmarks.bench_seat_initialization --flights 200 --rows 50
+    python -m benchmarks.bench_seat_initialization --backend sqlite --path bench.db
+"""
+import argparse
+import time
+from datetime import date, time as clock
+
+from Database.factory import create_database_handler
+
+SEAT_LETTERS = "ABCDEF"
+
+
+def make_seat_map(rows):
+    return {f"{row}{letter}": True for row in range(1, rows + 1) for letter in SEAT_LETTERS}
+
+
+def add_flights(db, flight_ids, capacity):
+    for flight_id in flight_ids:
+        db.add_flight(flight_id, "BenchAir", "Origin", "Destination",
+                      clock(8, 0), clock(10, 0), date.today(), capacity)
+
+
+def cleanup(db, prefixes):
+    for prefix in prefixes:
+        db.execute_query("DELETE FROM seat_availability WHERE flight_id LIKE %s", (prefix + "%",))
+        db.execute_query("DELETE FROM seats WHERE flight_id LIKE %s", (prefix + "%",))
+        db.execute_query("DELETE FROM flights WHERE flight_id LIKE %s", (prefix + "%",))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=50, help="seat rows per flight (6 seats per row)")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--backend", default="mysql", choices=("mysql", "sqlite"))
+    parser.add_argument("--path", default=":memory:", help="SQLite database file")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="11")
+    parser.add_argument("--database", default="flight_booking")
+    args = parser.parse_args()
+
+    db = create_database_handler(args.backend, path=args.path, host=args.host, user=args.user,
+                                 password=args.password, database=args.database)
+    if not db.connect():
+        print("Failed to connect to database")
+        return 1
+    db.create_tables()
+
+    seat_map = make_seat_map(args.rows)
+    loop_ids = [f"BL{i:05d}" for i in range(args.flights)]
+    bulk_ids = [f"BB{i:05d}" for i in range(args.flights)]
+    cleanup(db, ("BL", "BB"))
+    add_flights(db, loop_ids + bulk_ids, len(seat_map))
+    total_rows = args.flights * len(seat_map)
+
+    try:
+        start = time.perf_counter()
+        for flight_id in loop_ids:
+            db.initialize_seats_for_flight(flight_id, seat_map)
+        loop_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        counts = db.initialize_seats_bulk({flight_id: seat_map for flight_id in bulk_ids},
+                                          chunk_size=args.chunk_size)
+        bulk_elapsed = time.perf_counter() - start
+    finally:
+        cleanup(db, ("BL", "BB"))
+        db.disconnect()
+
+    if counts is None or sum(counts.values()) != total_rows:
+        print("Bulk initialization did not insert every seat")
+        return 1
+
+    print(f"{args.flights} flights x {len(seat_map)} seats = {total_rows} rows")
+    print(f"per-seat loop: {loop_elapsed:8.3f}s  {total_rows / loop_elapsed:12.0f} rows/s")
+    print(f"bulk insert:   {bulk_elapsed:8.3f}s  {total_rows / bulk_elapsed:12.0f} rows/s")
+    print(f"speedup:       {loop_elapsed / bulk_elapsed:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
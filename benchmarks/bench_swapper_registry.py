@@ -0,0 +1,43 @@
+"""Optimal seat swaps for many flights, in this process and across worker processes.
+
+Usage:
+    python -m benchmarks.bench_swapper_registry --flights 64 --aircraft A320 --processes 4
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_seat_assignment import make_passengers
+from flights.SeatLayout import get_layout
+from utilities.swapper_registry import SwapperRegistry
+
+
+def fill(registry, layout, flights, load, rng):
+    for flight in range(flights):
+        for passenger in make_passengers(int(len(layout) * load), rng):
+            registry.get(f"SW{flight:05d}").add_passenger(passenger)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=64)
+    parser.add_argument("--aircraft", default="A320")
+    parser.add_argument("--load", type=float, default=0.9, help="passengers per seat")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    layout = get_layout(args.aircraft)
+    print(f"{args.flights} flights of {len(layout)} seats ({layout.name}), {args.load:.0%} full")
+    for label, processes in (("in process", 1), ("workers", args.processes)):
+        registry = SwapperRegistry(lambda flight_id: layout, max_flights=args.flights)
+        fill(registry, layout, args.flights, args.load, random.Random(7))
+        start = time.perf_counter()
+        registry.assign_many(mode="optimal", processes=processes)
+        elapsed = time.perf_counter() - start
+        unassigned = sum(len(registry.get(flight_id).get_unassigned()) for flight_id in registry.flight_ids())
+        print(f"{label:10s} {elapsed:8.3f}s  {args.flights / elapsed:8.1f} flights/s  {unassigned} unassigned")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,9 @@
+from flights.SeatLayout import get_layout
+
+
 class Flight:
-    def __init__(self, flight_id, airline, source, destination, departure_time, arrival_time, date, available_seats):
+    def __init__(self, flight_id, airline, source, destination, departure_time, arrival_time, date, available_seats,
+                 aircraft_type=None):
         self.flight_id = flight_id
         self.airline = airline
         self.source = source
@@ -8,6 +12,12 @@ class Flight:
         self.arrival_time = arrival_time
         self.date = date
         self.available_seats = available_seats
+        self.aircraft_type = aircraft_type
+
+    @property
+    def layout(self):
+        """Seat layout shared by every flight on the same aircraft type."""
+        return get_layout(self.aircraft_type)
 
     def to_dict(self):
         return {
@@ -18,7 +28,8 @@ class Flight:
             "departure_time": self.departure_time,
             "arrival_time": self.arrival_time,
             "date": self.date,
-            "available_seats": self.available_seats
+            "available_seats": self.available_seats,
+            "aircraft_type": self.aircraft_type
         }
 
     def check_availability(self):
@@ -53,3 +64,10 @@ class FlightScheduleProxy:
 
     def get_schedule(self):
         return self._flight.schedule_summary()
+
+
+def flights_from_rows(rows):
+    """Build Flight objects one row at a time from a ``flights`` table result."""
+    for row in rows:
+        yield Flight(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7],
+                     row[8] if len(row) > 8 else None)
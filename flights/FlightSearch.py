@@ -0,0 +1,158 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+from flights.Flight import flights_from_rows
+
+
+class SearchResult:
+    def __init__(self, flight, free_seats):
+        self.flight = flight
+        self.free_seats = free_seats
+
+    def to_dict(self):
+        result = self.flight.to_dict()
+        result["free_seats"] = self.free_seats
+        return result
+
+    def __repr__(self):
+        return f"SearchResult(flight_id='{self.flight.flight_id}', free_seats={self.free_seats})"
+
+
+def _seconds(value):
+    """Seconds since midnight of a departure time, so keys sort in time order.
+
+    MySQL returns TIME columns as ``timedelta`` and SQLite as text, so
+    comparing their ``str()`` would put "8:00:00" after "14:00:00".
+    """
+    if value is None:
+        return 0
+    if isinstance(value, timedelta):
+        return int(value.total_seconds())
+    if isinstance(value, str):
+        hours, minutes, *seconds = value.split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + int(float(seconds[0]) if seconds else 0)
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+class _Route:
+    """Flights of one (source, destination) pair, kept sorted by departure."""
+
+    def __init__(self):
+        self.keys = []
+        self.flights = []
+
+    def add(self, flight):
+        key = (flight.date, _seconds(flight.departure_time), flight.flight_id)
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            self.flights[position] = flight
+            return key
+        self.keys.insert(position, key)
+        self.flights.insert(position, flight)
+        return key
+
+    def remove(self, key):
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+            del self.flights[position]
+
+    def between(self, date_from, date_to):
+        start = bisect_left(self.keys, (date_from,))
+        end = bisect_right(self.keys, (date_to, float("inf")))
+        return self.flights[start:end]
+
+
+class FlightSearch:
+    """Finds flights with enough free seats across the whole schedule in one call.
+
+    Flights are indexed by route with their keys sorted by date, so a search
+    bisects straight to the requested date range instead of scanning the
+    schedule. Seat counts come from the ``SeatInventory`` for flights it has
+    loaded (which also accounts for live holds) and from the database's seat
+    bitmaps, in a single query, for the rest.
+    """
+
+    ORDERS = ("departure", "most_available")
+
+    def __init__(self, seat_inventory=None, db=None):
+        self.seat_inventory = seat_inventory
+        self.db = db if db is not None else getattr(seat_inventory, "db", None)
+        self._routes = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Index every flight in the database; returns how many were indexed."""
+        return self.index_flights(flights_from_rows(self.db.iter_all_flights()))
+
+    def index_flights(self, flights):
+        count = 0
+        with self._lock:
+            for flight in flights:
+                route_key = (flight.source, flight.destination)
+                previous = self._entries.get(flight.flight_id)
+                if previous is not None and previous[0] in self._routes:
+                    # A rescheduled or re-routed flight replaces its old entry
+                    self._routes[previous[0]].remove(previous[1])
+                self._entries[flight.flight_id] = (route_key, self._route(*route_key).add(flight))
+                count += 1
+        return count
+
+    def add_flight(self, flight):
+        self.index_flights([flight])
+
+    def _route(self, source, destination):
+        route = self._routes.get((source, destination))
+        if route is None:
+            route = self._routes[(source, destination)] = _Route()
+        return route
+
+    def routes(self):
+        return sorted(self._routes)
+
+    def flights_between(self, source, destination, date_from, date_to=None):
+        route = self._routes.get((source, destination))
+        if route is None:
+            return []
+        with self._lock:
+            return route.between(date_from, date_to or date_from)
+
+    def search(self, source, destination, date_from, date_to=None, seat_type=None, party_size=1,
+               order="departure", limit=None):
+        """Flights on the route within the date range that can seat ``party_size``.
+
+        ``seat_type`` restricts the count to seats of that type. Results are
+        ranked by departure, or with ``order="most_available"`` by free seats
+        first; ``limit`` caps the number returned.
+        """
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown search order '{order}'")
+        candidates = self.flights_between(source, destination, date_from, date_to)
+        if not candidates:
+            return []
+
+        free = self.free_seat_counts([flight.flight_id for flight in candidates], seat_type)
+        results = [SearchResult(flight, free[flight.flight_id]) for flight in candidates
+                   if free.get(flight.flight_id, 0) >= party_size]
+        if order == "most_available":
+            results.sort(key=lambda result: -result.free_seats)
+        return results[:limit] if limit is not None else results
+
+    def free_seat_counts(self, flight_ids, seat_type=None):
+        """{flight_id: free seats (of ``seat_type``)}; unknown flights are left out."""
+        counts = {}
+        missing = []
+        for flight_id in flight_ids:
+            if self.seat_inventory is not None and self.seat_inventory.has_flight(flight_id):
+                counts[flight_id] = self.seat_inventory.free_count(flight_id, seat_type)
+            else:
+                missing.append(flight_id)
+
+        if missing and self.db is not None:
+            by_type = self.db.count_free_seats_by_type(missing) or {}
+            for flight_id, type_counts in by_type.items():
+                counts[flight_id] = (type_counts.get(seat_type, 0) if seat_type is not None
+                                     else sum(type_counts.values()))
+        return counts
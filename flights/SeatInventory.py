@@ -0,0 +1,565 @@
+import heapq
+import queue
+import threading
+import time
+import uuid
+
+from Database.seat_bitmap import seat_sort_key
+from utilities.expiry import ExpiryScheduler
+
+FREE = 0
+HELD = 1
+BOOKED = 2
+
+
+class FlightSeats:
+    """Seat state of one flight in flat arrays indexed by seat position.
+
+    ``state`` is a bytearray (FREE/HELD/BOOKED) and seat ids map to positions
+    through a dict, so hold/confirm/release are O(1). Free seats are also kept
+    in min-heaps per seat type and zone (lowest position first) with lazy
+    deletion: taken seats are only dropped when they reach the top, which makes
+    ``find_free`` O(log n) amortized.
+
+    For parties, each row is split into blocks of seats with no aisle between
+    them (from the aircraft ``layout`` when one is given, otherwise the whole
+    row). The longest free run of every block and the free count of every row
+    are kept in buckets keyed by length and updated when a seat changes, so
+    ``find_block`` finds the tightest fitting run without scanning the cabin.
+    """
+
+    def __init__(self, flight_id, seat_ids, seat_types, available, zones=None, layout=None):
+        self.flight_id = flight_id
+        self.seat_ids = tuple(seat_ids)
+        self.seat_types = tuple(seat_types)
+        self.zones = tuple(zones) if zones is not None else (None,) * len(self.seat_ids)
+        self.layout = layout
+        self.index = {seat_id: position for position, seat_id in enumerate(self.seat_ids)}
+        self.state = bytearray(FREE if is_free else BOOKED for is_free in available)
+        self.holds = {}
+        self.lock = threading.RLock()
+        self._init_blocks()
+        self._heaps = {}
+        self._free_counts = {}
+        for position in range(len(self.seat_ids)):
+            for key in self._heap_keys(position):
+                self._heaps.setdefault(key, [])
+                self._free_counts.setdefault(key, 0)
+                if self.state[position] == FREE:
+                    self._heaps[key].append(position)
+                    self._free_counts[key] += 1
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+
+    def _heap_keys(self, position):
+        seat_type = self.seat_types[position]
+        zone = self.zones[position]
+        return ((None, None), (seat_type, None), (None, zone), (seat_type, zone))
+
+    def __len__(self):
+        return len(self.seat_ids)
+
+    def is_free(self, position):
+        return self.state[position] == FREE
+
+    def take(self, position, new_state):
+        was_free = self.state[position] == FREE
+        if was_free:
+            for key in self._heap_keys(position):
+                self._free_counts[key] -= 1
+        self.state[position] = new_state
+        if was_free:
+            self._seat_changed(position, -1)
+
+    def free(self, position):
+        if self.state[position] == FREE:
+            return
+        self.state[position] = FREE
+        self.holds.pop(position, None)
+        self._seat_changed(position, 1)
+        for key in self._heap_keys(position):
+            heap = self._heaps[key]
+            heapq.heappush(heap, position)
+            self._free_counts[key] += 1
+            if len(heap) > 2 * len(self.seat_ids):
+                # Too many stale entries; rebuild from the live free seats.
+                heap[:] = sorted(set(p for p in heap if self.state[p] == FREE))
+
+    def first_free(self, seat_type=None, zone=None):
+        heap = self._heaps.get((seat_type, zone))
+        if not heap:
+            return None
+        while heap and self.state[heap[0]] != FREE:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def free_count(self, seat_type=None, zone=None):
+        return self._free_counts.get((seat_type, zone), 0)
+
+    def _init_blocks(self):
+        rows = {}
+        blocks = []
+        if self.layout is not None:
+            for layout_block in self.layout.blocks:
+                block = [self.index[self.layout.seat_ids[p]] for p in layout_block
+                         if self.layout.seat_ids[p] in self.index]
+                if block:
+                    blocks.append(block)
+        covered = {position for block in blocks for position in block}
+        leftover = {}
+        for position, seat_id in enumerate(self.seat_ids):
+            if position not in covered:
+                leftover.setdefault(seat_sort_key(seat_id)[0], []).append(position)
+        blocks.extend(leftover.values())
+
+        for block in blocks:
+            rows.setdefault(seat_sort_key(self.seat_ids[block[0]])[0], []).append(block)
+        self._row_numbers = sorted(rows)
+        self._blocks = []
+        self._block_row = []
+        self._row_blocks = []
+        self._block_of = [0] * len(self.seat_ids)
+        for row_index, row_number in enumerate(self._row_numbers):
+            self._row_blocks.append([])
+            for block in sorted(rows[row_number]):
+                block_index = len(self._blocks)
+                self._blocks.append(tuple(block))
+                self._block_row.append(row_index)
+                self._row_blocks[row_index].append(block_index)
+                for position in block:
+                    self._block_of[position] = block_index
+
+        self._block_run = [0] * len(self._blocks)
+        self._run_buckets = {}
+        for block_index in range(len(self._blocks)):
+            self._update_run(block_index)
+        self._row_free = [0] * len(self._row_numbers)
+        self._row_buckets = {0: set(range(len(self._row_numbers)))}
+        for position in range(len(self.seat_ids)):
+            if self.state[position] == FREE:
+                self._move_row(self._block_row[self._block_of[position]], 1)
+
+    def _seat_changed(self, position, delta):
+        block_index = self._block_of[position]
+        self._update_run(block_index)
+        self._move_row(self._block_row[block_index], delta)
+
+    def _update_run(self, block_index):
+        longest = run = 0
+        for position in self._blocks[block_index]:
+            run = run + 1 if self.state[position] == FREE else 0
+            longest = max(longest, run)
+        previous = self._block_run[block_index]
+        if previous == longest:
+            return
+        if previous:
+            self._run_buckets[previous].discard(block_index)
+        if longest:
+            self._run_buckets.setdefault(longest, set()).add(block_index)
+        self._block_run[block_index] = longest
+
+    def _move_row(self, row_index, delta):
+        count = self._row_free[row_index]
+        self._row_buckets[count].discard(row_index)
+        self._row_free[row_index] = count + delta
+        self._row_buckets.setdefault(count + delta, set()).add(row_index)
+
+    def find_block(self, size, allow_split=False):
+        """Positions of ``size`` free seats sitting together, or None.
+
+        Prefers one run with no aisle in between, taken from the block whose
+        longest free run fits ``size`` most tightly; then the tightest row with
+        enough free seats (e.g. two pairs across the aisle); and with
+        ``allow_split`` the fewest consecutive rows that can seat everyone.
+        """
+        if size < 1:
+            return None
+        for length in sorted(length for length, blocks in self._run_buckets.items() if blocks and length >= size):
+            block = self._blocks[min(self._run_buckets[length])]
+            run = []
+            for position in block:
+                run = run + [position] if self.state[position] == FREE else []
+                if len(run) == length:
+                    return run[:size]
+
+        for count in sorted(count for count, rows in self._row_buckets.items() if rows and count >= size):
+            free = self._free_in_rows([min(self._row_buckets[count])])
+            start = min(range(len(free) - size + 1), key=lambda i: free[i + size - 1] - free[i])
+            return free[start:start + size]
+
+        if allow_split:
+            best = None
+            for first in range(len(self._row_numbers)):
+                total = 0
+                for last in range(first, len(self._row_numbers)):
+                    total += self._row_free[last]
+                    if total >= size:
+                        if best is None or last - first < best[1] - best[0]:
+                            best = (first, last)
+                        break
+            if best is not None:
+                return self._free_in_rows(range(best[0], best[1] + 1))[:size]
+        return None
+
+    def _free_in_rows(self, row_indexes):
+        return [position for row_index in row_indexes for block_index in self._row_blocks[row_index]
+                for position in self._blocks[block_index] if self.state[position] == FREE]
+
+
+class SeatInventory:
+    """In-memory seat availability for every loaded flight.
+
+    The booking path checks and reserves seats here without touching the
+    database: ``hold`` reserves a free seat for ``ttl`` seconds and returns a
+    token, ``confirm`` turns a hold (or a free seat) into a booking and
+    ``release`` frees it again. Holds that are neither confirmed nor released
+    are reclaimed by an ``ExpiryScheduler`` thread when their TTL runs out.
+    Changes that must reach the database are queued on a ``SeatSyncWorker``;
+    ``refresh`` reloads flights from the database in the background to pick up
+    other agents' bookings.
+
+    Holds live only in this process's memory. They are advisory: they keep
+    this process from offering a seat twice, but other processes neither see
+    nor respect them, so a booking must still claim the seat in the database
+    (``book_seat``'s conditional UPDATE) before ``confirm``. A held seat that
+    ``refresh`` finds booked in the database loses its hold.
+    """
+
+    def __init__(self, db=None, default_ttl=600, clock=time.monotonic, sync_worker=None, start_expiry=True):
+        self.db = db
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.sync = sync_worker if sync_worker is not None else (SeatSyncWorker(db) if db is not None else None)
+        self.expiry = ExpiryScheduler(self._expire_hold, clock=clock, start=start_expiry)
+
+    def add_flight(self, flight_id, seats, zones=None, layout=None):
+        """Load ``flight_id`` from ``(seat_id, seat_type, is_available)`` tuples.
+
+        ``layout`` is the flight's ``SeatLayout``; it tells party allocation
+        where the aisles are.
+        """
+        seats = list(seats)
+        flight = FlightSeats(flight_id, [seat[0] for seat in seats], [seat[1] for seat in seats],
+                             [seat[2] for seat in seats], zones, layout)
+        with self._lock:
+            self._flights[flight_id] = flight
+        return flight
+
+    def load(self, flight_ids, layouts=None):
+        """Load flights from the database's seat bitmaps in one query; returns the ids loaded.
+
+        ``layouts`` optionally maps flight_id -> SeatLayout.
+        """
+        bitmaps = self.db.get_availability_bitmaps(flight_ids) if self.db is not None else None
+        if not bitmaps:
+            return []
+        for flight_id, bitmap in bitmaps.items():
+            self._add_bitmap(flight_id, bitmap, (layouts or {}).get(flight_id))
+        return list(bitmaps)
+
+    def _add_bitmap(self, flight_id, bitmap, layout):
+        return self.add_flight(flight_id, zip(bitmap.seat_ids, bitmap.seat_types,
+                                       (bitmap.is_available(seat_id) for seat_id in bitmap.seat_ids)),
+                        layout=layout)
+
+    def ensure_loaded(self, flight_id, layout=None):
+        return flight_id in self._flights or bool(self.load([flight_id], {flight_id: layout}))
+
+    def has_flight(self, flight_id):
+        return flight_id in self._flights
+
+    def _flight(self, flight_id):
+        flight = self._flights.get(flight_id)
+        if flight is None:
+            raise KeyError(f"Flight {flight_id} is not loaded in the seat inventory")
+        return flight
+
+    def _expire_if_due(self, flight, position):
+        hold = flight.holds.get(position)
+        if hold is not None and hold[1] <= self._clock():
+            flight.free(position)
+            self.expiry.cancel((flight.flight_id, position, hold[0]))
+
+    def hold(self, flight_id, seat_id, ttl=None, holder=None):
+        """Reserve a free seat; returns a hold token, or None if it is taken."""
+        flight = self._flight(flight_id)
+        position = flight.index.get(seat_id)
+        if position is None:
+            return None
+        ttl = self.default_ttl if ttl is None else ttl
+        with flight.lock:
+            self._expire_if_due(flight, position)
+            if not flight.is_free(position):
+                return None
+            token = uuid.uuid4().hex
+            expires_at = self._clock() + ttl
+            flight.take(position, HELD)
+            flight.holds[position] = (token, expires_at, holder)
+        self.expiry.schedule((flight_id, position, token), expires_at)
+        return token
+
+    def hold_group(self, flight_id, party_size, ttl=None, holder=None, allow_split=False):
+        """Hold ``party_size`` seats sitting together under one token.
+
+        Returns ``(seat_ids, token)``, or ``([], None)`` when no block of seats
+        fits (see ``FlightSeats.find_block``). Each seat is confirmed or
+        released individually with the shared token.
+        """
+        flight = self._flight(flight_id)
+        ttl = self.default_ttl if ttl is None else ttl
+        with flight.lock:
+            positions = flight.find_block(party_size, allow_split)
+            if positions is None:
+                return [], None
+            token = uuid.uuid4().hex
+            expires_at = self._clock() + ttl
+            for position in positions:
+                flight.take(position, HELD)
+                flight.holds[position] = (token, expires_at, holder)
+        for position in positions:
+            self.expiry.schedule((flight_id, position, token), expires_at)
+        return [flight.seat_ids[position] for position in positions], token
+
+    def find_adjacent(self, flight_id, party_size, allow_split=False):
+        """Seat ids ``hold_group`` would pick right now, without holding them."""
+        flight = self._flight(flight_id)
+        with flight.lock:
+            positions = flight.find_block(party_size, allow_split)
+            return [flight.seat_ids[position] for position in positions] if positions is not None else []
+
+    def extend_hold(self, flight_id, seat_id, token, ttl=None):
+        """Push a live hold's expiry to ``ttl`` seconds from now."""
+        flight = self._flight(flight_id)
+        position = flight.index.get(seat_id)
+        ttl = self.default_ttl if ttl is None else ttl
+        with flight.lock:
+            if position is None or not self._holds(flight, position, token):
+                return False
+            _, _, holder = flight.holds[position]
+            expires_at = self._clock() + ttl
+            flight.holds[position] = (token, expires_at, holder)
+        self.expiry.schedule((flight_id, position, token), expires_at)
+        return True
+
+    def is_held_by(self, flight_id, seat_id, token):
+        flight = self._flight(flight_id)
+        position = flight.index.get(seat_id)
+        with flight.lock:
+            return position is not None and self._holds(flight, position, token)
+
+    def _holds(self, flight, position, token):
+        # Called with the flight lock held.
+        self._expire_if_due(flight, position)
+        hold = flight.holds.get(position)
+        return hold is not None and hold[0] == token
+
+    def _expire_hold(self, key):
+        flight_id, position, token = key
+        flight = self._flights.get(flight_id)
+        if flight is None:
+            return
+        with flight.lock:
+            hold = flight.holds.get(position)
+            if hold is not None and hold[0] == token:
+                flight.free(position)
+
+    def hold_count(self):
+        """Holds that are still live: neither confirmed, released nor past their expiry."""
+        now = self._clock()
+        with self._lock:
+            flights = list(self._flights.values())
+        count = 0
+        for flight in flights:
+            with flight.lock:
+                count += sum(1 for _, expires_at, _ in flight.holds.values() if expires_at > now)
+        return count
+
+    def confirm(self, flight_id, seat_id, token=None, sync=False):
+        """Mark a seat booked.
+
+        A held seat needs the token returned by ``hold``; a free seat can be
+        confirmed without one. With ``sync`` the booking is written to the
+        database by the sync worker.
+        """
+        flight = self._flight(flight_id)
+        position = flight.index.get(seat_id)
+        if position is None:
+            return False
+        with flight.lock:
+            self._expire_if_due(flight, position)
+            state = flight.state[position]
+            if state == HELD and flight.holds[position][0] != token:
+                return False
+            if state == BOOKED:
+                return False
+            flight.holds.pop(position, None)
+            flight.take(position, BOOKED)
+        if state == HELD:
+            self.expiry.cancel((flight_id, position, token))
+        if sync:
+            self._submit(flight_id, seat_id, False)
+        return True
+
+    def release(self, flight_id, seat_id, token=None, sync=False):
+        """Free a held seat (given its token) or a booked seat (given no token)."""
+        flight = self._flight(flight_id)
+        position = flight.index.get(seat_id)
+        if position is None:
+            return False
+        with flight.lock:
+            state = flight.state[position]
+            if state == FREE:
+                return False
+            if state == HELD and flight.holds[position][0] != token:
+                return False
+            if state == BOOKED and token is not None:
+                return False
+            flight.free(position)
+        if state == HELD:
+            self.expiry.cancel((flight_id, position, token))
+        if sync and state == BOOKED:
+            self._submit(flight_id, seat_id, True)
+        return True
+
+    def is_available(self, flight_id, seat_id):
+        flight = self._flight(flight_id)
+        position = flight.index.get(seat_id)
+        if position is None:
+            return False
+        with flight.lock:
+            self._expire_if_due(flight, position)
+            return flight.is_free(position)
+
+    def find_free(self, flight_id, seat_type=None, zone=None):
+        """Lowest-numbered free seat of the given type and/or zone, or None."""
+        flight = self._flight(flight_id)
+        with flight.lock:
+            position = flight.first_free(seat_type, zone)
+            return flight.seat_ids[position] if position is not None else None
+
+    def free_count(self, flight_id, seat_type=None, zone=None):
+        flight = self._flight(flight_id)
+        with flight.lock:
+            return flight.free_count(seat_type, zone)
+
+    def availability(self, flight_id):
+        """{seat_id: is_free} in seat order."""
+        flight = self._flight(flight_id)
+        with flight.lock:
+            return {seat_id: state == FREE for seat_id, state in zip(flight.seat_ids, flight.state)}
+
+    def seat_type(self, flight_id, seat_id):
+        flight = self._flight(flight_id)
+        return flight.seat_types[flight.index[seat_id]]
+
+    def refresh(self, flight_ids, wait=False, on_done=None):
+        """Reload flights from the database on the sync worker, keeping live holds.
+
+        ``on_done(flight_ids)`` is called on the sync worker's thread once the
+        reload has been applied, e.g. to have a GUI redraw its seat map.
+        """
+        if self.sync is None:
+            return
+        self.sync.submit(self._refresh, list(flight_ids), on_done)
+        if wait:
+            self.sync.flush()
+
+    def _refresh(self, flight_ids, on_done=None):
+        bitmaps = self.db.get_availability_bitmaps(flight_ids)
+        for flight_id, bitmap in (bitmaps or {}).items():
+            flight = self._flights.get(flight_id)
+            if flight is None:
+                self._add_bitmap(flight_id, bitmap, None)
+                continue
+            with flight.lock:
+                if flight.seat_ids != bitmap.seat_ids:
+                    self._carry_holds(flight, self._add_bitmap(flight_id, bitmap, flight.layout))
+                    continue
+                for position, seat_id in enumerate(flight.seat_ids):
+                    free_in_db = bitmap.is_available(seat_id)
+                    state = flight.state[position]
+                    if state == FREE and not free_in_db:
+                        flight.take(position, BOOKED)
+                    elif state == HELD and not free_in_db:
+                        self._drop_hold(flight, position)
+                    elif state == BOOKED and free_in_db:
+                        flight.free(position)
+        if on_done is not None:
+            on_done(flight_ids)
+
+    def _carry_holds(self, old, new):
+        """Move the live holds of a reloaded flight onto its new seat arrays."""
+        # Called with the old flight's lock held.
+        with new.lock:
+            for position, hold in list(old.holds.items()):
+                new_position = new.index.get(old.seat_ids[position])
+                if new_position is None or not new.is_free(new_position):
+                    self._drop_hold(old, position)
+                    continue
+                token, expires_at, _ = hold
+                new.take(new_position, HELD)
+                new.holds[new_position] = hold
+                self.expiry.cancel((old.flight_id, position, token))
+                self.expiry.schedule((new.flight_id, new_position, token), expires_at)
+
+    def _drop_hold(self, flight, position):
+        # The seat was booked elsewhere; called with the flight lock held.
+        token = flight.holds.pop(position)[0]
+        flight.state[position] = BOOKED
+        self.expiry.cancel((flight.flight_id, position, token))
+
+    def _submit(self, flight_id, seat_id, is_available):
+        if self.sync is not None:
+            self.sync.submit(self.db.update_seat_availability, seat_id, flight_id, is_available)
+
+    def close(self):
+        self.expiry.stop()
+        if self.sync is not None:
+            self.sync.close()
+
+
+class SeatSyncWorker:
+    """Background thread that applies queued database writes in order."""
+
+    def __init__(self, db):
+        self.db = db
+        self._queue = queue.Queue()
+        self.applied = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="seat-sync", daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args):
+        self._queue.put((func, args))
+
+    def flush(self):
+        """Block until everything submitted so far has been applied."""
+        self._queue.join()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                func, args = item
+                try:
+                    result = func(*args)
+                except Exception as e:
+                    print(f"Error syncing seat inventory: {e}")
+                    result = False
+                if result is False:
+                    self.failed += 1
+                else:
+                    self.applied += 1
+            finally:
+                self._queue.task_done()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
@@ -0,0 +1,242 @@
+import json
+import threading
+
+WINDOW = "Window"
+AISLE = "Aisle"
+MIDDLE = "Middle"
+
+DEFAULT_LAYOUT = "DEMO16"
+
+# Seat swap zones, front of the cabin to the back
+ZONES = ("Networking", "Quiet", "Work", "Legroom")
+
+BUILTIN_LAYOUTS = [
+    {
+        # The original 16-seat demo cabin; B and C keep their historical "Middle" type.
+        "code": "DEMO16",
+        "name": "Demo 4x4",
+        "cabins": [{"name": "Economy", "rows": [1, 4], "letters": "ABCD", "aisles_after": "B"}],
+        "letter_types": {"B": MIDDLE, "C": MIDDLE},
+    },
+    {
+        "code": "A320",
+        "name": "Airbus A320",
+        "cabins": [
+            {"name": "Business", "rows": [1, 3], "letters": "ACDF", "aisles_after": "C"},
+            {"name": "Economy", "rows": [4, 30], "letters": "ABCDEF", "aisles_after": "C"},
+        ],
+        "exit_rows": [12, 13],
+    },
+    {
+        "code": "B777",
+        "name": "Boeing 777-300",
+        "cabins": [
+            {"name": "Business", "rows": [1, 8], "letters": "ACDGHK", "aisles_after": "CG"},
+            {"name": "Economy", "rows": [10, 51], "letters": "ABCDEFGHJK", "aisles_after": "CG"},
+        ],
+        "exit_rows": [10, 31],
+        "skip_rows": [13],
+    },
+]
+
+
+class Cabin:
+    def __init__(self, name, first_row, last_row, letters, aisles_after=""):
+        self.name = name
+        self.first_row = first_row
+        self.last_row = last_row
+        self.letters = letters
+        self.aisles_after = aisles_after
+
+
+class SeatLayout:
+    """Seat map of one aircraft type, built once and shared by its flights.
+
+    Everything a flight needs per seat (order, type, row, cabin, grid column)
+    is precomputed into tuples and dicts here, so flights keep a reference to
+    the layout instead of their own copy.
+    """
+
+    def __init__(self, code, cabins, name=None, exit_rows=(), skip_rows=(), letter_types=None, zones=None):
+        self.code = code
+        self.name = name or code
+        self.cabins = tuple(cabins)
+        self.exit_rows = frozenset(exit_rows)
+        letter_types = letter_types or {}
+
+        seat_ids, seat_types, rows, cabin_names, columns, blocks = [], [], [], [], [], []
+        grid_width = 0
+        for cabin in self.cabins:
+            letter_columns, letter_types_in_row, groups = _row_geometry(cabin.letters, cabin.aisles_after)
+            grid_width = max(grid_width, letter_columns[cabin.letters[-1]] + 1)
+            for row in range(cabin.first_row, cabin.last_row + 1):
+                if row in skip_rows:
+                    continue
+                first_position = len(seat_ids)
+                for letter in cabin.letters:
+                    seat_ids.append(f"{row}{letter}")
+                    seat_types.append(letter_types.get(letter, letter_types_in_row[letter]))
+                    rows.append(row)
+                    cabin_names.append(cabin.name)
+                    columns.append(letter_columns[letter])
+                for group in groups:
+                    blocks.append(tuple(first_position + cabin.letters.index(letter) for letter in group))
+
+        self.seat_ids = tuple(seat_ids)
+        self.seat_types = tuple(seat_types)
+        self.rows = tuple(rows)
+        self.seat_cabins = tuple(cabin_names)
+        self.columns = tuple(columns)
+        # Runs of seat positions in one row with no aisle between them.
+        self.blocks = tuple(blocks)
+        self.grid_width = grid_width
+        self.aisle_columns = tuple(sorted(set(range(grid_width)) - set(columns)))
+        self.index = {seat_id: position for position, seat_id in enumerate(self.seat_ids)}
+        self.seat_type_table = dict(zip(self.seat_ids, self.seat_types))
+        self.row_numbers = tuple(sorted(set(rows)))
+        self.zones = self._zone_seats(zones)
+
+    def _zone_seats(self, zone_rows):
+        """Seats of each swap zone, front to back.
+
+        ``zone_rows`` maps zone names to [first, last] rows; zones it leaves
+        out are empty, since SeatSwapper needs all of ``ZONES``. Without it the
+        rows are split into equal bands in ``ZONES`` order, and exit rows are
+        moved to Legroom.
+        """
+        row_zone = {}
+        if zone_rows:
+            unknown = sorted(set(zone_rows) - set(ZONES))
+            if unknown:
+                raise ValueError(f"Unknown seat zones {unknown} in layout '{self.code}', expected {list(ZONES)}")
+            for zone, (first_row, last_row) in zone_rows.items():
+                row_zone.update(dict.fromkeys(range(first_row, last_row + 1), zone))
+        else:
+            count = len(self.row_numbers)
+            for band, row in enumerate(self.row_numbers):
+                row_zone[row] = "Legroom" if row in self.exit_rows else ZONES[band * len(ZONES) // count]
+        zones = {zone: [] for zone in ZONES}
+        for seat_id, row in zip(self.seat_ids, self.rows):
+            if row in row_zone:
+                zones[row_zone[row]].append(seat_id)
+        return {zone: tuple(seats) for zone, seats in zones.items()}
+
+    @classmethod
+    def from_definition(cls, definition):
+        cabins = [Cabin(cabin["name"], cabin["rows"][0], cabin["rows"][1], cabin["letters"],
+                        cabin.get("aisles_after", "")) for cabin in definition["cabins"]]
+        return cls(definition["code"], cabins, definition.get("name"), definition.get("exit_rows", ()),
+                   definition.get("skip_rows", ()), definition.get("letter_types"), definition.get("zones"))
+
+    def __len__(self):
+        return len(self.seat_ids)
+
+    def __contains__(self, seat_id):
+        return seat_id in self.index
+
+    def seat_type(self, seat_id):
+        return self.seat_type_table.get(seat_id)
+
+    def cabin(self, seat_id):
+        return self.seat_cabins[self.index[seat_id]]
+
+    def is_exit_row(self, seat_id):
+        return self.rows[self.index[seat_id]] in self.exit_rows
+
+    def grid_position(self, seat_id):
+        """(grid row, grid column) for drawing the seat map, aisles included."""
+        position = self.index[seat_id]
+        return self.row_numbers.index(self.rows[position]), self.columns[position]
+
+    def seat_map(self, available=True):
+        """A fresh {seat_id: available} dict for seeding a flight's seats."""
+        return dict.fromkeys(self.seat_ids, available)
+
+    def __repr__(self):
+        return f"SeatLayout(code='{self.code}', seats={len(self)})"
+
+
+def _row_geometry(letters, aisles_after):
+    """Grid columns, default seat types and aisle-free groups for one row pattern."""
+    columns = {}
+    groups = [[]]
+    column = 0
+    for letter in letters:
+        columns[letter] = column
+        groups[-1].append(letter)
+        column += 1
+        if letter in aisles_after and letter != letters[-1]:
+            column += 1
+            groups.append([])
+
+    types = {}
+    for group_index, group in enumerate(groups):
+        for offset, letter in enumerate(group):
+            if letter in (letters[0], letters[-1]):
+                types[letter] = WINDOW
+            elif (offset == 0 and group_index > 0) or (offset == len(group) - 1 and group_index < len(groups) - 1):
+                types[letter] = AISLE
+            else:
+                types[letter] = MIDDLE
+    return columns, types, [tuple(group) for group in groups]
+
+
+class LayoutRegistry:
+    """Layout definitions by equipment code; each layout is built on first use."""
+
+    def __init__(self, definitions=()):
+        self._definitions = {}
+        self._layouts = {}
+        self._lock = threading.Lock()
+        for definition in definitions:
+            self.register(definition)
+
+    def register(self, definition):
+        with self._lock:
+            self._definitions[definition["code"]] = definition
+            self._layouts.pop(definition["code"], None)
+
+    def load_file(self, path):
+        """Register the layouts in a JSON file holding a list of definitions."""
+        with open(path, encoding="utf-8") as f:
+            for definition in json.load(f):
+                self.register(definition)
+
+    def get(self, code):
+        layout = self._layouts.get(code)
+        if layout is not None:
+            return layout
+        with self._lock:
+            layout = self._layouts.get(code)
+            if layout is None:
+                definition = self._definitions.get(code)
+                if definition is None:
+                    raise KeyError(f"Unknown aircraft layout '{code}'")
+                layout = self._layouts[code] = SeatLayout.from_definition(definition)
+            return layout
+
+    def __contains__(self, code):
+        return code in self._definitions
+
+    def codes(self):
+        return sorted(self._definitions)
+
+
+layouts = LayoutRegistry(BUILTIN_LAYOUTS)
+
+
+def get_layout(code=None):
+    """Shared layout for an equipment code; flights without one use ``DEFAULT_LAYOUT``.
+
+    An unknown code also gets the default layout, with a warning printed the
+    first time it is seen, so one bad flight row cannot break seat selection.
+    """
+    if code and code not in layouts:
+        if code not in _unknown_codes:
+            _unknown_codes.add(code)
+            print(f"Warning: unknown aircraft type '{code}', using the {DEFAULT_LAYOUT} layout")
+        code = None
+    return layouts.get(code or DEFAULT_LAYOUT)
+
+
+_unknown_codes = set()
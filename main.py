@@ -6,25 +6,48 @@ import json
 from PyQt5.QtWidgets import QApplication, QWidget, QDialog, QGridLayout, QPushButton, QLabel, QVBoxLayout, QFormLayout, QLineEdit, QComboBox, QHBoxLayout, QSpinBox, QDoubleSpinBox, QGroupBox, QTabWidget, QDateEdit, QTableWidget, QTableWidgetItem, QMessageBox, QCheckBox, QFileDialog, QTextEdit, QGraphicsDropShadowEffect, QFrame, QRadioButton, QProgressBar
 from PyQt5.QtCore import Qt, QSize, QTimer, QThread, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QPixmap
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 
 from passengers.PassengerClass import Passenger as BasePassenger
 from passengers.ticket import Ticket, TicketProxy
-from flights.Flight import Flight, FlightScheduleProxy
+from flights.Flight import Flight, FlightScheduleProxy, flights_from_rows
 from flights.CrewMember import CrewMember, CrewRegistry, CrewRegistryProxy, User
+from flights.SeatInventory import SeatInventory
+from flights.SeatLayout import get_layout
+from flights.FlightSearch import FlightSearch
 from utilities.Feedback import Feedback
 from utilities.ReminderEmailSender import ReminderEmailSender
-from utilities.seat_swap import Passenger, Socializer, TallPassenger, EcoPassenger, SeatSwapper 
+from utilities.seat_swap import Passenger, Socializer, TallPassenger, EcoPassenger
+from utilities.swapper_registry import SwapperRegistry
 from Security.credentials_encryption import CredentialsManager
 from baggage.Baggage import Baggage
+from baggage.BaggageFeeCalc import use_policy
+from baggage.FeePolicy import RULE_FILE_ERRORS, TieredFeePolicy, route_key
 from ML.Bot import AIAssistant
 from Networking.payment_server import PaymentServer
-from Database.database_handler import DatabaseHandler
+from Database.factory import create_database_handler
+from Database.cached_handler import DatabaseCacheProxy
+from Database.metrics import QueryMetrics
+from Database.connection_pool import close_shared_pools
+
+SEAT_HOLD_TTL = 600  # seconds a selected seat stays reserved during details and payment
+
 
 class SeatSelectionWindow(QWidget):
+    # Emitted from the seat sync thread when a background refresh has finished
+    seats_refreshed = pyqtSignal(list)
+
     def __init__(self):
         super().__init__()
-        self.db = DatabaseHandler(host="localhost", user="root", password="11", database="flight_booking")
+        db_handler = create_database_handler(
+            host=os.environ.get("FLIGHT_DB_HOST", "localhost"),
+            user=os.environ.get("FLIGHT_DB_USER", "root"),
+            password=os.environ.get("FLIGHT_DB_PASSWORD", "11"),
+            database=os.environ.get("FLIGHT_DB_NAME", "flight_booking"),
+            pool_size=8
+        )
+        db_handler.metrics = QueryMetrics()
+        self.db = DatabaseCacheProxy(db_handler)
         if not self.db.connect():
             print("Failed to connect to database")
             return
@@ -33,15 +56,33 @@ class SeatSelectionWindow(QWidget):
 
         self.init_flights_in_db()
 
+        self.seat_inventory = SeatInventory(self.db)
+        self.seats_refreshed.connect(self.on_seats_refreshed)
+        self.flight_search = FlightSearch(self.seat_inventory)
+        self.flights = {}
+        self.flight_proxies = []
+        self.load_flights_from_db()
         self.flight_id = "FL001"
+        self.seat_layout = self.layout_for_flight(self.flight_id)
         self.load_available_seats()
 
         self.selected_seat = None
-        self.seat_swapper = SeatSwapper()
+        self.hold_token = None
+        self.seat_swappers = SwapperRegistry(self.layout_for_flight)
+
+        # Route and class baggage pricing, re-read every 30s when the rules file changes
+        self.fee_policy = None
+        fee_rules = os.environ.get("BAGGAGE_FEE_RULES")
+        if fee_rules:
+            try:
+                self.fee_policy = TieredFeePolicy(path=fee_rules)
+                use_policy(self.fee_policy)
+                self.fee_policy_timer = QTimer(self)
+                self.fee_policy_timer.timeout.connect(self.fee_policy.reload_if_changed)
+                self.fee_policy_timer.start(30000)
+            except RULE_FILE_ERRORS as e:
+                print(f"Error loading baggage fee rules: {e!r}")
 
-        self.flights = self.load_flights_from_db()
-        self.flight_proxies = [FlightScheduleProxy(flight) for flight in self.flights]
-    
         self.ticket_counter = 1000
         self.tickets = {}
  
@@ -118,7 +159,7 @@ class SeatSelectionWindow(QWidget):
         personal_info_layout.addLayout(email_layout)
 
         self.flight_combo = QComboBox(self)
-        for flight in self.flights:
+        for flight in self.flights.values():
             self.flight_combo.addItem(f"{flight.flight_id}: {flight.airline} - {flight.source} to {flight.destination}", 
                                     flight.flight_id)
         self.details_form.addRow("Select Flight: ", self.flight_combo)
@@ -198,6 +239,11 @@ class SeatSelectionWindow(QWidget):
         self.zone_button.clicked.connect(self.show_zone_seats)
         button_layout.addWidget(self.zone_button)
 
+        self.search_button = QPushButton(" Find Flights", self)
+        self.search_button.setIcon(QIcon.fromTheme("edit-find", QIcon()))
+        self.search_button.clicked.connect(self.find_flights)
+        button_layout.addWidget(self.search_button)
+
         self.reminder_button = QPushButton(" Schedule Reminder Email", self)
         self.reminder_button.setIcon(QIcon.fromTheme("mail-send", QIcon()))
         self.reminder_button.clicked.connect(self.schedule_reminder)
@@ -211,73 +257,49 @@ class SeatSelectionWindow(QWidget):
         self.show()
 
     def init_flights_in_db(self):
-        existing_flights = self.db.get_all_flights()
-        if existing_flights and len(existing_flights) > 0:
+        if self.db.count_flights() > 0:
             return  # Flights already exist
         
         # Add sample flights
         flights_data = [
             ("FL001", "AirExpress", "New York", "Los Angeles", 
-             time(8, 0), time(11, 30), datetime.now().date(), 120),
+             time(8, 0), time(11, 30), datetime.now().date(), 120, "DEMO16"),
             ("FL002", "SkyWings", "Chicago", "Miami", 
-             time(9, 15), time(12, 45), datetime.now().date(), 90),
+             time(9, 15), time(12, 45), datetime.now().date(), 90, "DEMO16"),
             ("FL003", "OceanAir", "Boston", "San Francisco", 
-             time(14, 30), time(18, 0), datetime.now().date(), 75)
+             time(14, 30), time(18, 0), datetime.now().date(), 75, "DEMO16")
         ]
         
         for flight_data in flights_data:
             self.db.add_flight(*flight_data)
         
-        # Initialize seats for each flight
-        default_seat_map = {
-            "1A": True, "1B": True, "1C": True, "1D": True,
-            "2A": True, "2B": True, "2C": True, "2D": True,
-            "3A": True, "3B": True, "3C": True, "3D": True,
-            "4A": True, "4B": True, "4C": True, "4D": True,
-        }
-        
-        for flight_data in flights_data:
-            flight_id = flight_data[0]
-            self.db.initialize_seats_for_flight(flight_id, default_seat_map)
+        # Initialize seats for each flight from its aircraft layout; flights on
+        # the same equipment share the layout's seat-type table
+        self.db.initialize_seats_bulk(
+            {flight_data[0]: get_layout(flight_data[8]).seat_map() for flight_data in flights_data},
+            seat_types={flight_data[0]: get_layout(flight_data[8]).seat_type_table for flight_data in flights_data}
+        )
 
     def load_flights_from_db(self):
-        """Load flights from database"""
-        flights_data = self.db.get_all_flights()
-        flights = []
-        
-        for flight_data in flights_data:
-            # Assuming Flight class constructor matches database fields
-            flight = Flight(
-                flight_data[0],  
-                flight_data[1],  
-                flight_data[2],  
-                flight_data[3],  
-                flight_data[4],  
-                flight_data[5],  
-                flight_data[6],  
-                flight_data[7]   
-            )
-            flights.append(flight)
-        
-        return flights
+        """Load flights as rows stream in, indexing each one as it is built"""
+        for flight in flights_from_rows(self.db.iter_all_flights()):
+            self.flights[flight.flight_id] = flight
+            self.flight_proxies.append(FlightScheduleProxy(flight))
+            self.flight_search.add_flight(flight)
+
+    def layout_for_flight(self, flight_id):
+        flight = self.flights.get(flight_id)
+        return flight.layout if flight else get_layout()
+
+    def is_window_seat(self, seat_id):
+        return self.seat_layout.seat_type(seat_id) == "Window"
 
     def load_available_seats(self):
-        """Load available seats from database for current flight"""
-        available_seats_data = self.db.get_available_seats(self.flight_id)
-        
-        # Initialize all seats as unavailable first
-        self.available_seats = {
-            "1A": False, "1B": False, "1C": False, "1D": False,
-            "2A": False, "2B": False, "2C": False, "2D": False,
-            "3A": False, "3B": False, "3C": False, "3D": False,
-            "4A": False, "4B": False, "4C": False, "4D": False,
-        }
-        
-        # Update with available seats from database
-        for seat_data in available_seats_data:
-            seat_id = seat_data[0]
-            if seat_id in self.available_seats:
-                self.available_seats[seat_id] = True
+        """Load seat availability for the current flight from the seat inventory"""
+        if not self.seat_inventory.ensure_loaded(self.flight_id, self.seat_layout):
+            self.available_seats = {}
+            return
+        self.available_seats = self.seat_inventory.availability(self.flight_id)
 
     def generate_ticket_id(self):
         self.ticket_counter += 1
@@ -311,18 +333,29 @@ class SeatSelectionWindow(QWidget):
             pass
     
     def get_selected_flight(self):
-        flight_id = self.flight_combo.currentData()
-        for flight in self.flights:
-            if flight.flight_id == flight_id:
-                return flight
-        return None
+        return self.flights.get(self.flight_combo.currentData())
 
 
     def on_flight_changed(self):
         """Handle flight selection change"""
         selected_flight = self.get_selected_flight()
         if selected_flight:
+            self.release_seat_hold()
             self.flight_id = selected_flight.flight_id
+            layout_changed = selected_flight.layout is not self.seat_layout
+            self.seat_layout = selected_flight.layout
+            self.load_available_seats()
+            if layout_changed:
+                self.rebuild_seat_buttons()
+            else:
+                self.refresh_seat_display()
+            # Catch up with other agents' bookings in the background; the signal
+            # is queued to this thread, which redraws the seats when it arrives
+            self.seat_inventory.refresh([self.flight_id], on_done=self.seats_refreshed.emit)
+
+    def on_seats_refreshed(self, flight_ids):
+        """Redraw the seat map once a background refresh of the shown flight is done"""
+        if self.flight_id in flight_ids:
             self.load_available_seats()
             self.refresh_seat_display()
 
@@ -335,7 +368,7 @@ class SeatSelectionWindow(QWidget):
                 is_available = self.available_seats[seat_id]
                 widget.setEnabled(is_available)
                 
-                if seat_id.endswith(('A', 'D')):  # Window seats
+                if self.is_window_seat(seat_id):
                     if is_available:
                         widget.setStyleSheet("""
                             QPushButton {
@@ -368,16 +401,29 @@ class SeatSelectionWindow(QWidget):
                     else:
                         widget.setStyleSheet("background-color: #ebf5fb; color: #7f8c8d; border: none; border-radius: 8px;")
 
+    def rebuild_seat_buttons(self):
+        while self.grid_layout.count():
+            widget = self.grid_layout.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+        self.create_seat_buttons()
+
     def create_seat_buttons(self):
-        row = 0
-        col = 0
+        layout = self.seat_layout
+        for row in range(len(layout.row_numbers)):
+            for col in layout.aisle_columns:
+                aisle = QLabel("", self)
+                aisle.setFixedSize(20, 60)
+                self.grid_layout.addWidget(aisle, row, col)
 
         for seat, available in self.available_seats.items():
+            if seat not in layout:
+                continue
             seat_button = QPushButton(seat, self)
             seat_button.setFixedSize(45, 45)
             seat_button.setEnabled(available)
             
-            if seat.endswith(('A', 'D')):
+            if self.is_window_seat(seat):
                 if available:
                     seat_button.setStyleSheet("""
                         QPushButton {
@@ -411,18 +457,8 @@ class SeatSelectionWindow(QWidget):
                     seat_button.setStyleSheet("background-color: #ebf5fb; color: #7f8c8d; border: none; border-radius: 8px;")
             
             seat_button.clicked.connect(self.select_seat)
+            row, col = layout.grid_position(seat)
             self.grid_layout.addWidget(seat_button, row, col)
-            
-            if seat.endswith('B'):
-                col += 1
-                aisle = QLabel("", self)
-                aisle.setFixedSize(20, 60)
-                self.grid_layout.addWidget(aisle, row, col)
-                
-            col += 1
-            if col > 4:
-                col = 0
-                row += 1
 
     def select_seat(self):
         selected_button = self.sender()  
@@ -437,7 +473,7 @@ class SeatSelectionWindow(QWidget):
                     break
             
             if old_seat_button:
-                if self.selected_seat.endswith(('A', 'D')):
+                if self.is_window_seat(self.selected_seat):
                     old_seat_button.setStyleSheet("""
                         QPushButton {
                             background-color: #85c1e9;
@@ -464,7 +500,10 @@ class SeatSelectionWindow(QWidget):
                         }
                     """)
 
-        if self.available_seats[selected_seat]:  
+        self.release_seat_hold()
+        # Hold the seat while the passenger fills in details and pays
+        self.hold_token = self.seat_inventory.hold(self.flight_id, selected_seat, ttl=SEAT_HOLD_TTL)
+        if self.hold_token:
             self.selected_seat = selected_seat
             self.selected_seat_label.setText(f"Selected Seat: {self.selected_seat}")
             
@@ -479,12 +518,17 @@ class SeatSelectionWindow(QWidget):
             """)
         else:
             self.selected_seat_label.setText("Seat already taken, please select another.")
+
+    def release_seat_hold(self):
+        if self.selected_seat and self.hold_token:
+            self.seat_inventory.release(self.flight_id, self.selected_seat, token=self.hold_token)
+        self.selected_seat = None
+        self.hold_token = None
     
     def get_flight_info(self):
-        flight_id = self.flight_combo.currentData()
-        for flight in self.flights:
-            if flight.flight_id == flight_id:
-                return f"{flight.flight_id}: {flight.airline} ({flight.source} to {flight.destination})"
+        flight = self.get_selected_flight()
+        if flight:
+            return f"{flight.flight_id}: {flight.airline} ({flight.source} to {flight.destination})"
         return None
     
     def check_baggage(self):
@@ -495,12 +539,19 @@ class SeatSelectionWindow(QWidget):
             self.baggage_status.setText("Please enter your name first.")
             return
         
-        baggage = Baggage(passenger_name, weight)
+        baggage = self.create_baggage(passenger_name, weight, self.selected_seat)
         
         baggage.calculate_fee()
         
         self.baggage_status.setText(baggage.get_fee_summary())
 
+    def create_baggage(self, passenger_name, weight, seat_id=None):
+        """Baggage priced for the selected flight's route and the seat's cabin"""
+        flight = self.get_selected_flight()
+        route = route_key(flight.source, flight.destination) if flight else None
+        travel_class = self.seat_layout.cabin(seat_id) if seat_id in self.seat_layout else None
+        return Baggage(passenger_name, weight, travel_class, route)
+
     def create_appropriate_passenger(self, name, seat, preference):
         passenger_type = self.passenger_type.currentText()
         
@@ -534,7 +585,7 @@ class SeatSelectionWindow(QWidget):
             self.selected_seat_label.setText("Please enter your name.")
             return
 
-        baggage = Baggage(passenger_name, baggage_weight)
+        baggage = self.create_baggage(passenger_name, baggage_weight, self.selected_seat)
         baggage.calculate_fee()
         baggage_fee = baggage.baggage_fee
         
@@ -586,52 +637,51 @@ class SeatSelectionWindow(QWidget):
                 eco_passenger = EcoPassenger(passenger_name, self.selected_seat, preference)
                 special_data = f"Recommended Meal: {eco_passenger.recommend_meal()}"
             
-            # Add passenger to database
-            passenger_id = self.db.add_passenger(
-                name=passenger_name,
-                email=email,
-                age=age,
-                passenger_type=passenger_type,
-                preferences=preference,
-                special_data=special_data
-            )
-            
-            if passenger_id is None:
-                self.selected_seat_label.setText("Error: Failed to save passenger data")
+            if not self.seat_inventory.is_held_by(flight_id, self.selected_seat, self.hold_token):
+                self.selected_seat_label.setText(f"Your hold on seat {self.selected_seat} expired, please select a seat again.")
+                self.selected_seat = None
+                self.hold_token = None
+                self.load_available_seats()
+                self.refresh_seat_display()
                 return
-            
-            # Add baggage if applicable
-            if baggage_weight > 0:
-                baggage_success = self.db.add_baggage(passenger_id, baggage_weight, baggage_fee)
-                if not baggage_success:
-                    print("Warning: Failed to save baggage data")
-            
-            # Generate ticket ID and create booking
+
+            # Add the passenger, their baggage and the booking together, so a
+            # seat taken in the meantime leaves no passenger or baggage rows behind
             ticket_id = self.generate_ticket_id()
-            booking_success = self.db.create_booking(
+            booking = self.db.book_new_passenger(
                 ticket_id=ticket_id,
-                passenger_id=passenger_id,
                 flight_id=flight_id,
                 seat_id=self.selected_seat,
+                passenger={
+                    "name": passenger_name,
+                    "email": email,
+                    "age": age,
+                    "passenger_type": passenger_type,
+                    "preferences": preference,
+                    "special_data": special_data
+                },
+                baggage=(baggage_weight, baggage_fee) if baggage_weight > 0 else None,
                 payment_status=payment_status
             )
             
-            if not booking_success:
+            if booking.conflict:
+                self.selected_seat_label.setText(f"Seat {self.selected_seat} was just taken, please select another.")
+                self.release_seat_hold()
+                self.seat_inventory.refresh([flight_id], wait=True)
+                self.load_available_seats()
+                self.refresh_seat_display()
+                return
+
+            if not booking.ok:
                 self.selected_seat_label.setText("Error: Failed to create booking")
                 return
-            
-            # Update payment status if needed
-            if payment_status:
-                payment_update = self.db.update_booking_payment(ticket_id, True)
-                if not payment_update:
-                    print("Warning: Failed to update payment status")
+            passenger_id = booking.passenger_id
+
+            self.seat_inventory.confirm(flight_id, self.selected_seat, token=self.hold_token)
+            self.hold_token = None
             
             # Create passenger object for seat swapper
-            selected_flight = None
-            for flight in self.flights:
-                if flight.flight_id == flight_id:
-                    selected_flight = flight
-                    break
+            selected_flight = self.flights.get(flight_id)
                     
             passenger = self.create_appropriate_passenger(
                 name=passenger_name, 
@@ -648,7 +698,7 @@ class SeatSelectionWindow(QWidget):
             )
             ticket_details = ticket_proxy.get_ticket_details()
             
-            self.seat_swapper.add_passenger(passenger)
+            self.seat_swappers.get(flight_id).add_passenger(passenger)
 
             flight_info = f"{selected_flight.flight_id}: {selected_flight.airline} ({selected_flight.source} to {selected_flight.destination})"
             
@@ -690,7 +740,7 @@ class SeatSelectionWindow(QWidget):
             for i in range(self.grid_layout.count()):
                 widget = self.grid_layout.itemAt(i).widget()
                 if isinstance(widget, QPushButton) and widget.text() == self.selected_seat:
-                    if self.selected_seat.endswith(('A', 'D')):  # Window seats
+                    if self.is_window_seat(self.selected_seat):
                         widget.setStyleSheet("background-color: #d6eaf8; color: #7f8c8d; border: none; border-radius: 8px;")
                     else:  # Middle seats
                         widget.setStyleSheet("background-color: #ebf5fb; color: #7f8c8d; border: none; border-radius: 8px;")
@@ -705,19 +755,23 @@ class SeatSelectionWindow(QWidget):
             print(f"Booking error: {e}")
 
     def swap_seat(self):
-        self.seat_swapper.assign_seats()
-        passenger_data = self.seat_swapper.get_passenger_data()
+        seat_swapper = self.seat_swappers.get(self.flight_id)
+        seat_swapper.assign_seats("optimal")
+        passenger_data = seat_swapper.get_passenger_data()
 
         if not passenger_data:
-            self.selected_seat_label.setText("No passengers available for seat swapping.")
+            self.selected_seat_label.setText(f"No passengers on {self.flight_id} available for seat swapping.")
             return
 
         swap_message = "\n".join([f"{data['name']} -> Seat {data['seat']} (Preference: {data['preference']})"
                                   for data in passenger_data])
-        self.selected_seat_label.setText(f"Seat Swap Complete:\n{swap_message}")
+        unassigned = seat_swapper.get_unassigned()
+        if unassigned:
+            swap_message += "\nNo seat left for: " + ", ".join(p.get_name() for p in unassigned)
+        self.selected_seat_label.setText(f"Seat Swap Complete for {self.flight_id}:\n{swap_message}")
 
     def show_zone_seats(self):
-        available_zones = self.seat_swapper.get_available_seats()
+        available_zones = self.seat_swappers.get(self.flight_id).get_available_seats()
         zone_info = []
         
         for zone, seats in available_zones.items():
@@ -729,6 +783,21 @@ class SeatSelectionWindow(QWidget):
         
         self.selected_seat_label.setText("Available Zone Seats:\n" + "\n".join(zone_info))
 
+    def find_flights(self):
+        """List flights on the selected route in the week from the chosen date with a free seat"""
+        selected_flight = self.get_selected_flight()
+        if not selected_flight:
+            return
+        date_from = self.flight_date.date().toPyDate()
+        results = self.flight_search.search(selected_flight.source, selected_flight.destination,
+                                            date_from, date_from + timedelta(days=7), order="most_available")
+        if not results:
+            self.selected_seat_label.setText(
+                f"No flights with free seats from {selected_flight.source} to {selected_flight.destination}.")
+            return
+        lines = [f"{r.flight.flight_id} on {r.flight.date}: {r.free_seats} free seats" for r in results]
+        self.selected_seat_label.setText("Flights with free seats:\n" + "\n".join(lines))
+
     def get_booking_details(self, ticket_id):
         return self.db.get_booking_by_ticket(ticket_id)
 
@@ -736,6 +805,8 @@ class SeatSelectionWindow(QWidget):
         return self.db.get_baggage_by_passenger(passenger_id)
 
     def __del__(self):
+        if hasattr(self, 'seat_inventory'):
+            self.seat_inventory.close()
         if hasattr(self, 'db'):
             self.db.disconnect()
 
@@ -919,8 +990,7 @@ class BaggageInfoWindow(QWidget):
         layout.addWidget(self.title_label)
 
         # Policy information
-        from baggage.BaggageFeeCalc import BaggageFeeCalculatorProxy
-        calculator = BaggageFeeCalculatorProxy()
+        from baggage.Baggage import fee_calculator as calculator
         
         policy_info = QLabel(f"""
         Baggage Policy:
@@ -2365,6 +2435,7 @@ class MainApplication(QWidget):
     def closeEvent(self, event):
         if self.payment_management and self.payment_management.payment_server:
             self.payment_management.stop_payment_server()
+        close_shared_pools()
         event.accept()
 
 if __name__ == "__main__":
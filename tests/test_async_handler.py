@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+from datetime import date, time
+from Database.async_handler import ASYNC_METHODS, AsyncDatabaseHandler
+from Database.base_handler import BaseDatabaseHandler
+from Database.sqlite_handler import SQLiteDatabaseHandler
+
+
+class TestAsyncDatabaseHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+        self.db.add_flight("FL001", "AirExpress", "New York", "Los Angeles",
+                           time(8, 0), time(11, 30), date(2025, 6, 1), 120)
+        self.db.initialize_seats_bulk({"FL001": {seat: True for seat in ("1A", "1B", "1C", "1D")}})
+        self.adb = AsyncDatabaseHandler(self.db, max_workers=4)
+        self.addCleanup(self.adb.close)
+        self.addCleanup(self.db.disconnect)
+
+    def test_method_surface_matches_handler(self):
+        for name in ASYNC_METHODS:
+            self.assertTrue(hasattr(BaseDatabaseHandler, name), name)
+            self.assertTrue(asyncio.iscoroutinefunction(getattr(AsyncDatabaseHandler, name)), name)
+
+    def test_booking_flow(self):
+        async def flow():
+            passenger_id = await self.adb.add_passenger("Alice", None, 30, "Regular", "Work")
+            await self.adb.add_baggage(passenger_id, 20.0, 30)
+            result = await self.adb.book_seat("TKT1", passenger_id, "FL001", "1A", True)
+            seats = await self.adb.get_available_seats("FL001")
+            return result, seats
+
+        result, seats = asyncio.run(flow())
+        self.assertTrue(result.ok)
+        self.assertNotIn("1A", [seat for seat, _ in seats])
+
+    def test_concurrent_flows_sell_seat_once(self):
+        async def flow(index):
+            passenger_id = await self.adb.add_passenger(f"P{index}", None, 30, "Regular", "Work")
+            return await self.adb.book_seat(f"TKT{index}", passenger_id, "FL001", "1B")
+
+        async def run_all():
+            return await asyncio.gather(*(flow(i) for i in range(50)))
+
+        results = asyncio.run(run_all())
+        self.assertEqual(sum(result.ok for result in results), 1)
+        self.assertEqual(sum(result.conflict for result in results), 49)
+
+    def test_default_workers_follow_pool(self):
+        adb = AsyncDatabaseHandler(self.db)
+        self.addCleanup(adb.close)
+        self.assertEqual(adb.max_workers, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from baggage.Baggage import Baggage
-from baggage.BaggageFeeCalc import BaggageFeeCalculator
+from baggage.BaggageFeeCalc import BaggageFeeCalculator, BaggageFeeCalculatorProxy
 
 class TestBaggage(unittest.TestCase):
 
@@ -20,5 +20,17 @@ class TestBaggage(unittest.TestCase):
         self.assertTrue(calc.within_limit(20))
         self.assertFalse(calc.within_limit(21))
 
+    def test_batch_fees_match_scalar_fees(self):
+        calc = BaggageFeeCalculatorProxy()
+        weights = [0, 18, 20, 20.5, 25, 32]
+        classes = ["Economy", "Business", "Economy", "First", "Economy", "Business"]
+        fees = calc.calculate_fees(weights, classes, "NYC-LAX")
+        self.assertEqual(list(fees), [calc.calculate_fee(w, c, "NYC-LAX") for w, c in zip(weights, classes)])
+        self.assertEqual(list(calc.calculate_fees(weights)), [0, 0, 0, 5, 50, 120])
+        self.assertEqual(list(calc.calculator.within_limits(weights)), [True, True, True, False, False, False])
+        self.assertEqual(len(calc.calculate_fees([])), 0)
+        with self.assertRaises(ValueError):
+            calc.calculate_fees(weights, ["Economy"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from datetime import date, time
+from Database.cached_handler import DatabaseCacheProxy
+from Database.sqlite_handler import SQLiteDatabaseHandler
+from utilities.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(maxsize=4, ttl=10, clock=clock)
+        cache.set("a", 1)
+        clock.now = 9.9
+        self.assertEqual(cache.get("a"), 1)
+        clock.now = 10.0
+        self.assertIsNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+
+
+class CountingHandler(SQLiteDatabaseHandler):
+    def __init__(self):
+        super().__init__(":memory:")
+        self.reads = 0
+
+    def fetch_data(self, query, params=None):
+        self.reads += 1
+        return super().fetch_data(query, params)
+
+
+class TestDatabaseCacheProxy(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = CountingHandler()
+        self.db = DatabaseCacheProxy(self.handler)
+        self.db.connect()
+        self.db.create_tables()
+        self.db.add_flight("FL001", "AirExpress", "New York", "Los Angeles",
+                           time(8, 0), time(11, 30), date(2025, 6, 1), 120)
+        self.db.initialize_seats_bulk({"FL001": {"1A": True, "1B": True}})
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_flight_reads_are_served_from_cache(self):
+        self.db.get_flight_by_id("FL001")
+        reads = self.handler.reads
+        for _ in range(5):
+            self.assertEqual(self.db.get_flight_by_id("FL001")[0], "FL001")
+        self.assertEqual(self.handler.reads, reads)
+        self.assertEqual(self.db.cache_stats()["flights"]["hits"], 5)
+
+    def test_booking_invalidates_seat_availability(self):
+        self.assertEqual(len(self.db.get_available_seats("FL001")), 2)
+        passenger_id = self.db.add_passenger("Alice", None, 30, "Regular", "Work")
+        self.assertTrue(self.db.book_seat("TKT1", passenger_id, "FL001", "1A").ok)
+        self.assertEqual(self.db.get_available_seats("FL001"), [("1B", "Middle")])
+
+        self.db.update_seat_availability("1A", "FL001", True)
+        self.assertEqual(len(self.db.get_available_seats("FL001")), 2)
+
+    def test_add_flight_invalidates_flight_list(self):
+        self.assertEqual(len(self.db.get_all_flights()), 1)
+        self.db.add_flight("FL002", "SkyWings", "Chicago", "Miami",
+                           time(9, 15), time(12, 45), date(2025, 6, 1), 90)
+        self.assertEqual(len(self.db.get_all_flights()), 2)
+
+    def test_raw_writes_invalidate_every_cache(self):
+        self.assertEqual(len(self.db.get_available_seats("FL001")), 2)
+        self.assertEqual(self.db.get_flight_by_id("FL001")[1], "AirExpress")
+        self.db.execute_query("UPDATE seats SET is_available = FALSE WHERE flight_id = %s AND seat_id = %s",
+                              ("FL001", "1B"))
+        self.db.execute_query("UPDATE flights SET airline = %s WHERE flight_id = %s", ("SkyWings", "FL001"))
+
+        self.assertEqual(self.db.get_available_seats("FL001"), [("1A", "Window")])
+        self.assertEqual(self.db.get_flight_by_id("FL001")[1], "SkyWings")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import threading
+import time
+import unittest
+from Database.connection_pool import ConnectionPool, PoolTimeoutError, get_shared_pool, close_shared_pools
+
+
+class FakeConnection:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.created = []
+
+    def factory(self):
+        conn = FakeConnection()
+        self.created.append(conn)
+        return conn
+
+    def test_lazy_growth_and_reuse(self):
+        """Connections are only opened on demand and reused once returned."""
+        pool = ConnectionPool(self.factory, max_size=3)
+        self.assertEqual(pool.stats()["size"], 0)
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(pool.stats()["misses"], 1)
+
+    def test_bounded_size_times_out(self):
+        pool = ConnectionPool(self.factory, max_size=1, checkout_timeout=0.05)
+        held = pool.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire()
+        pool.release(held)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_health_check_replaces_dead_connection(self):
+        """Idle connections are pinged on checkout, not on every query."""
+        pings = []
+
+        def ping(conn):
+            pings.append(conn)
+            return conn.alive
+
+        pool = ConnectionPool(self.factory, max_size=2, ping=ping, health_check_interval=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.alive = False
+
+        replacement = pool.acquire()
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["failed_health_checks"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_max_lifetime_recycles(self):
+        pool = ConnectionPool(self.factory, max_size=2, max_lifetime=0)
+        conn = pool.acquire()
+        time.sleep(0.01)
+        pool.release(conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["recycled"], 1)
+
+    def test_concurrent_checkouts_never_exceed_max_size(self):
+        pool = ConnectionPool(self.factory, max_size=4)
+        peak = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                with pool.connection():
+                    with lock:
+                        peak.append(pool.stats()["in_use"])
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertLessEqual(max(peak), 4)
+        self.assertLessEqual(len(self.created), 4)
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+    def test_shared_pool_is_reused_per_key(self):
+        first = get_shared_pool(("test", "db"), self.factory, max_size=2)
+        second = get_shared_pool(("test", "db"), self.factory, max_size=2, ping=lambda conn: True)
+        self.assertIs(first, second)
+        self.assertIs(get_shared_pool(("test", "db"), self.factory), first)
+        close_shared_pools()
+        self.assertIsNot(get_shared_pool(("test", "db"), self.factory), first)
+        close_shared_pools()
+
+    def test_shared_pool_rejects_different_settings(self):
+        first = get_shared_pool(("test", "db"), self.factory, max_size=2)
+        try:
+            with self.assertRaises(ValueError):
+                get_shared_pool(("test", "db"), self.factory, max_size=5)
+            with self.assertRaises(ValueError):
+                get_shared_pool(("test", "db"), self.factory, max_size=2, checkout_timeout=1.0)
+            self.assertEqual(first.max_size, 2)
+        finally:
+            close_shared_pools()
+
+    def test_interrupted_checkout_discards_connection(self):
+        """A KeyboardInterrupt inside the block must not return the connection."""
+        pool = ConnectionPool(self.factory, max_size=1)
+        with self.assertRaises(KeyboardInterrupt):
+            with pool.connection() as conn:
+                raise KeyboardInterrupt
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["idle"], 0)
+        self.assertEqual(pool.stats()["size"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
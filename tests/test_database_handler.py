@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from Database.connection_pool import close_shared_pools
+from Database.database_handler import DatabaseHandler, BookingResult, seat_type_for
+
+
+class TestBulkSeatInitialization(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.is_connected.return_value = True
+        self.cursor = self.connection.cursor.return_value
+        self.cursor.rowcount = 0
+        self.cursor.fetchall.return_value = []
+        self.executed = []
+
+        def execute(query, params=None):
+            self.executed.append((query, params))
+            self.cursor.rowcount = len(params) // 4
+
+        self.cursor.execute.side_effect = execute
+        patcher = patch("Database.database_handler.mysql.connector.connect", return_value=self.connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db = DatabaseHandler()
+
+    def test_seats_are_chunked_per_flight_in_one_commit(self):
+        seat_maps = {
+            "FL001": {f"{row}{letter}": True for row in range(1, 6) for letter in "ABCD"},
+            "FL002": {"1A": True, "1B": False},
+        }
+        counts = self.db.initialize_seats_bulk(seat_maps, chunk_size=8)
+
+        self.assertEqual(counts, {"FL001": 20, "FL002": 2})
+        inserts = [statement for statement in self.executed if statement[0].startswith("INSERT")]
+        self.assertEqual(len(inserts), 4)  # 8 + 8 + 4 seats, then FL002
+        self.assertEqual(self.connection.commit.call_count, 1)
+        query, params = inserts[-1]
+        self.assertEqual(query.count("(%s, %s, %s, %s)"), 2)
+        self.assertEqual(params, ["1A", "FL002", True, "Window", "1B", "FL002", False, "Middle"])
+
+    def test_seat_type_lookup(self):
+        self.assertEqual(seat_type_for("12A"), "Window")
+        self.assertEqual(seat_type_for("12D"), "Window")
+        self.assertEqual(seat_type_for("12B"), "Middle")
+
+
+class TestBookSeat(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.is_connected.return_value = True
+        self.cursor = self.connection.cursor.return_value
+        self.cursor.fetchall.return_value = []
+        patcher = patch("Database.database_handler.mysql.connector.connect", return_value=self.connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db = DatabaseHandler()
+
+    def test_booking_commits_once(self):
+        self.cursor.rowcount = 1
+        result = self.db.book_seat("TKT1", 7, "FL001", "1A", payment_status=True)
+
+        self.assertTrue(result.ok)
+        statements = [call[0][0] for call in self.cursor.execute.call_args_list]
+        self.assertIn("is_available = TRUE", statements[0])
+        self.assertIn("INSERT INTO seat_availability_changes", self.cursor.executemany.call_args[0][0])
+        self.assertFalse(any("seat_availability" in statement for statement in statements))
+        self.assertIn("INSERT INTO bookings", statements[-1])
+        self.assertEqual(self.connection.commit.call_count, 1)
+
+    def test_nested_use_of_a_statement_closes_the_extra_cursor(self):
+        outer_cursor, inner_cursor = MagicMock(), MagicMock()
+        self.connection.cursor.side_effect = [outer_cursor, inner_cursor]
+        with self.db._statement(self.connection, "SELECT 1") as outer:
+            with self.db._statement(self.connection, "SELECT 1") as inner:
+                self.assertIsNot(inner, outer)
+
+        inner_cursor.close.assert_called_once()
+        outer_cursor.close.assert_not_called()
+        with self.db._statement(self.connection, "SELECT 1") as cached:
+            self.assertIs(cached, outer_cursor)
+
+    def test_shared_pool_is_keyed_by_password(self):
+        self.addCleanup(close_shared_pools)
+        first = DatabaseHandler(password="one", pool_size=2)
+        self.assertIs(DatabaseHandler(password="one", pool_size=2).pool, first.pool)
+        self.assertIsNot(DatabaseHandler(password="two", pool_size=2).pool, first.pool)
+
+    def test_taken_seat_reports_conflict(self):
+        self.cursor.rowcount = 0
+        result = self.db.book_seat("TKT2", 7, "FL001", "1A")
+
+        self.assertEqual(result.status, BookingResult.CONFLICT)
+        self.assertFalse(self.db.create_booking("TKT3", 7, "FL001", "1A"))
+        self.assertEqual(self.cursor.execute.call_count, 2)  # no INSERT was attempted
+        self.connection.commit.assert_not_called()
+        self.assertEqual(self.connection.rollback.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
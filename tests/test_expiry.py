@@ -0,0 +1,62 @@
+import threading
+import unittest
+from utilities.expiry import ExpiryScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestExpiryScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.expired = []
+        self.scheduler = ExpiryScheduler(self.expired.append, clock=self.clock, start=False)
+
+    def test_expires_in_deadline_order(self):
+        self.scheduler.schedule("b", 20)
+        self.scheduler.schedule("a", 10)
+        self.scheduler.schedule("c", 30)
+        self.clock.now = 25
+        self.assertEqual(self.scheduler.expire_due(), 2)
+        self.assertEqual(self.expired, ["a", "b"])
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_cancel_and_reschedule(self):
+        self.scheduler.schedule("a", 10)
+        self.scheduler.schedule("b", 10)
+        self.scheduler.cancel("a")
+        self.scheduler.schedule("b", 50)
+        self.clock.now = 20
+        self.assertEqual(self.scheduler.expire_due(), 0)
+        self.assertEqual(self.scheduler.deadline("b"), 50)
+
+    def test_stale_entries_are_compacted(self):
+        for key in range(1000):
+            self.scheduler.schedule(key, 100)
+        for key in range(990):
+            self.scheduler.cancel(key)
+        self.assertLess(len(self.scheduler._heap), 100)
+        self.clock.now = 100
+        self.assertEqual(self.scheduler.expire_due(), 10)
+
+
+class TestExpiryThread(unittest.TestCase):
+
+    def test_background_thread_fires_deadlines(self):
+        fired = threading.Event()
+        scheduler = ExpiryScheduler(lambda key: fired.set())
+        self.addCleanup(scheduler.stop)
+        scheduler.schedule("late", scheduler._clock() + 60)
+        scheduler.schedule("soon", scheduler._clock() + 0.05)
+        self.assertTrue(fired.wait(2))
+        self.assertEqual(scheduler.deadline("soon"), None)
+        self.assertIsNotNone(scheduler.deadline("late"))
+
+if __name__ == '__main__':
+    unittest.main()
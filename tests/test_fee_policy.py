@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from baggage.Baggage import Baggage
+from baggage.BaggageFeeCalc import BaggageFeeCalculatorProxy, BaggageFeePolicy, use_policy
+from baggage.FeePolicy import FeeTable, TieredFeePolicy
+
+RULES = {
+    "version": "test",
+    "default": {"limit": 20, "fee_per_kg": 10},
+    "rules": [
+        {"class": "Business", "tiers": [[0, 0], [32, 8]]},
+        {"route": "New York-London", "tiers": [[0, 0], [23, 12], [32, 25]], "piece_fees": [0, 60, 150]},
+        {"route": "New York-London", "class": "First", "limit": 40, "fee_per_kg": 5},
+    ],
+}
+
+
+class TestFeePolicy(unittest.TestCase):
+
+    def tearDown(self):
+        use_policy(None)
+
+    def test_tiers_are_charged_band_by_band(self):
+        table = FeeTable([(23, 12), (32, 25)], piece_fees=(0, 60, 150))
+        self.assertEqual(table.allowance, 23)
+        self.assertEqual(table.fee(20), 0)
+        self.assertEqual(table.fee(30), 7 * 12)
+        self.assertEqual(table.fee(35), 9 * 12 + 3 * 25)
+        self.assertEqual(table.fee(35, piece=2), 9 * 12 + 3 * 25 + 60)
+        self.assertEqual(table.fee(10, piece=5), 150)
+        self.assertEqual(list(table.fees([20, 30, 35, -1], pieces=[1, 1, 2, 3])), [0, 84, 243, 150])
+        with self.assertRaises(ValueError):
+            FeeTable([(0, 0), (20, -1)])
+
+    def test_most_specific_rule_wins(self):
+        calc = BaggageFeeCalculatorProxy(TieredFeePolicy(RULES))
+        self.assertEqual(calc.calculate_fee(30, "First", "New York-London"), 0)
+        self.assertEqual(calc.calculate_fee(30, "Economy", "New York-London"), 84)
+        self.assertEqual(calc.calculate_fee(35, "Business", "Paris-Cairo"), 24)
+        self.assertEqual(calc.calculate_fee(25), 50)
+        self.assertEqual(calc.get_limit("Business"), 32)
+
+        weights = [30, 30, 35, 25, 40]
+        classes = ["First", "Economy", "Business", None, "Economy"]
+        routes = ["New York-London", "New York-London", "Paris-Cairo", "Paris-Cairo", "New York-London"]
+        pieces = [1, 2, 1, 1, 3]
+        self.assertEqual(list(calc.calculate_fees(weights, classes, routes, pieces)),
+                         [calc.calculate_fee(*bag) for bag in zip(weights, classes, routes, pieces)])
+
+    def test_hot_reload_swaps_the_schedule(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fees.json")
+            with open(path, "w") as f:
+                json.dump(RULES, f)
+            policy = TieredFeePolicy(path=path)
+            before = policy.snapshot()
+            self.assertFalse(policy.reload_if_changed())
+
+            with open(path, "w") as f:
+                json.dump({"default": {"limit": 15, "fee_per_kg": 20}}, f)
+            os.utime(path, (0, 0))
+            self.assertTrue(policy.reload_if_changed())
+            self.assertEqual(policy.version, before.version + 1)
+            self.assertEqual(before.table("Business").allowance, 32)   # old snapshot is untouched
+            self.assertEqual(policy.get_limit("Business"), 15)
+
+            with open(path, "w") as f:
+                f.write("{not json")
+            os.utime(path, (1, 1))
+            self.assertFalse(policy.reload_if_changed())
+            self.assertEqual(policy.get_limit(), 15)
+
+    def test_malformed_rules_keep_the_current_schedule(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fees.json")
+            with open(path, "w") as f:
+                json.dump(RULES, f)
+            policy = TieredFeePolicy(path=path)
+            before = policy.snapshot()
+
+            malformed = ({"default": {"fee_per_kg": 10}},      # no "limit"
+                         {"rules": [{"class": "Business", "tiers": 5}]},
+                         {"rules": [{"class": "Business", "tiers": [[0, 0], [20]]}]},
+                         ["not", "a", "rule", "table"])
+            for mtime, rules in enumerate(malformed, start=1):
+                with open(path, "w") as f:
+                    json.dump(rules, f)
+                os.utime(path, (mtime, mtime))
+                with redirect_stdout(io.StringIO()) as output:
+                    self.assertFalse(policy.reload_if_changed())
+                self.assertIn("Error reloading baggage fee rules", output.getvalue())
+                self.assertIs(policy.snapshot(), before)
+
+    def test_baggage_uses_the_installed_policy(self):
+        bag = Baggage("Jane", 30, "Economy", "New York-London", piece=2)
+        self.assertEqual(bag.calculate_fee(), 100)   # flat default: 10kg over at $10, no piece fee
+        use_policy(TieredFeePolicy(RULES))
+        self.assertEqual(bag.calculate_fee(), 84 + 60)
+        self.assertFalse(bag.check_baggage_weight())
+        self.assertIn("limit of 23kg", bag.get_fee_summary())
+
+    def test_policy_arguments_are_not_ignored(self):
+        self.assertIs(BaggageFeePolicy(), BaggageFeePolicy())
+        strict = BaggageFeePolicy(limit=15, fee_per_kg=20)
+        self.assertIsNot(strict, BaggageFeePolicy())
+        self.assertEqual(BaggageFeeCalculatorProxy(strict).calculate_fee(20), 100)
+        self.assertEqual(BaggageFeePolicy().get_limit(), 20)
+
+
+class TestFeeCalculatorProxy(unittest.TestCase):
+
+    def test_quotes_match_batch_and_calculator(self):
+        calc = BaggageFeeCalculatorProxy()
+        weights = [20.04, 20.05, 19.96, 24.95]
+        quotes = [calc.calculate_fee(weight) for weight in weights]
+        self.assertEqual(quotes, list(calc.calculate_fees(weights)))
+        self.assertEqual(quotes, [calc.calculator.calculate_fee(weight) for weight in weights])
+        self.assertGreater(quotes[0], 0)
+
+    def test_policy_changes_apply_to_the_next_quote(self):
+        policy = BaggageFeePolicy(limit=20, fee_per_kg=10)
+        calc = BaggageFeeCalculatorProxy(policy)
+        self.assertEqual(calc.calculate_fee(25), 50)
+        policy.fee_per_kg = 20
+        self.assertEqual(calc.calculate_fee(25), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
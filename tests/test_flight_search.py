@@ -0,0 +1,89 @@
+import unittest
+from datetime import date, time, timedelta
+from Database.sqlite_handler import SQLiteDatabaseHandler
+from flights.Flight import Flight
+from flights.FlightSearch import FlightSearch
+from flights.SeatInventory import SeatInventory
+from flights.SeatLayout import get_layout
+
+
+class TestFlightSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+        layout = get_layout()
+        schedule = [("FL001", date(2025, 6, 1), time(14, 0), 16),
+                    ("FL002", date(2025, 6, 1), time(8, 0), 2),
+                    ("FL003", date(2025, 6, 3), time(9, 0), 10),
+                    ("FL004", date(2025, 6, 9), time(9, 0), 16)]
+        seat_maps = {}
+        for flight_id, flight_date, departure, free_seats in schedule:
+            self.db.add_flight(flight_id, "AirExpress", "New York", "Los Angeles",
+                               departure, time(23, 0), flight_date, 16, layout.code)
+            seat_maps[flight_id] = {seat_id: position < free_seats
+                                    for position, seat_id in enumerate(layout.seat_ids)}
+        self.db.add_flight("FL005", "SkyWings", "Chicago", "Miami", time(9, 0), time(12, 0), date(2025, 6, 1), 16)
+        seat_maps["FL005"] = layout.seat_map()
+        self.db.initialize_seats_bulk(seat_maps, seat_types={flight_id: layout.seat_type_table
+                                                             for flight_id in seat_maps})
+
+        self.inventory = SeatInventory(self.db, start_expiry=False)
+        self.search = FlightSearch(self.inventory)
+        self.assertEqual(self.search.load(), 5)
+
+    def tearDown(self):
+        self.inventory.close()
+        self.db.disconnect()
+
+    def ids(self, results):
+        return [result.flight.flight_id for result in results]
+
+    def test_search_filters_route_dates_and_party_size(self):
+        results = self.search.search("New York", "Los Angeles", date(2025, 6, 1), date(2025, 6, 3), party_size=3)
+        self.assertEqual(self.ids(results), ["FL001", "FL003"])
+        self.assertEqual(results[0].free_seats, 16)
+        self.assertEqual(self.search.search("Boston", "Miami", date(2025, 6, 1)), [])
+
+    def test_results_are_ranked(self):
+        by_departure = self.search.search("New York", "Los Angeles", date(2025, 6, 1), date(2025, 6, 30))
+        self.assertEqual(self.ids(by_departure), ["FL002", "FL001", "FL003", "FL004"])
+        by_space = self.search.search("New York", "Los Angeles", date(2025, 6, 1), date(2025, 6, 30),
+                                      order="most_available", limit=2)
+        self.assertEqual(self.ids(by_space), ["FL001", "FL004"])
+
+    def test_seat_type_counts_and_live_holds(self):
+        # FL002 only has 1A and 1B free: one window seat
+        results = self.search.search("New York", "Los Angeles", date(2025, 6, 1), seat_type="Window")
+        self.assertEqual({r.flight.flight_id: r.free_seats for r in results}, {"FL001": 8, "FL002": 1})
+
+        self.inventory.ensure_loaded("FL002")
+        self.inventory.hold("FL002", "1A")
+        results = self.search.search("New York", "Los Angeles", date(2025, 6, 1), seat_type="Window")
+        self.assertEqual(self.ids(results), ["FL001"])
+
+    def test_reindexing_a_rescheduled_flight_moves_it(self):
+        self.search.add_flight(Flight("FL004", "AirExpress", "New York", "Los Angeles",
+                                      time(9, 0), time(23, 0), date(2025, 6, 2), 16))
+        self.assertEqual(self.ids(self.search.search("New York", "Los Angeles", date(2025, 6, 2))), ["FL004"])
+        self.assertEqual(self.search.search("New York", "Los Angeles", date(2025, 6, 9)), [])
+        with self.assertRaises(ValueError):
+            self.search.search("New York", "Los Angeles", date(2025, 6, 1), order="cheapest")
+
+    def test_timedelta_departures_sort_by_time(self):
+        # MySQL returns TIME columns as timedelta
+        search = FlightSearch()
+        search.index_flights([
+            Flight("FL101", "AirExpress", "Boston", "Denver", timedelta(hours=14), timedelta(hours=18),
+                   date(2025, 6, 1), 16),
+            Flight("FL102", "AirExpress", "Boston", "Denver", timedelta(hours=8), timedelta(hours=12),
+                   date(2025, 6, 1), 16),
+            Flight("FL103", "AirExpress", "Boston", "Denver", "09:30:00", "13:00:00", date(2025, 6, 1), 16),
+        ])
+        flights = search.flights_between("Boston", "Denver", date(2025, 6, 1), date(2025, 6, 1))
+        self.assertEqual([flight.flight_id for flight in flights], ["FL102", "FL103", "FL101"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from flights.CrewMember import CrewMember, CrewRegistry
-from flights.Flight import Flight, FlightScheduleProxy
+from flights.Flight import Flight, FlightScheduleProxy, flights_from_rows
 
 class TestFlights(unittest.TestCase):
 
@@ -21,5 +21,13 @@ class TestFlights(unittest.TestCase):
         proxy.update_schedule(new_departure_time="09:00", new_arrival_time="13:00")
         self.assertEqual(proxy.get_schedule()["departure"], "09:00")
 
+    def test_flights_from_rows_is_lazy(self):
+        rows = iter([("FL1", "AirCo", "NY", "LA", "10:00", "14:00", "2025-06-06", 120)])
+        flights = flights_from_rows(rows)
+        flight = next(flights)
+        self.assertEqual(flight.flight_id, "FL1")
+        self.assertEqual(flight.available_seats, 120)
+        self.assertEqual(list(flights), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,142 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, time
+from Database.group_booking import GroupBooking, load_manifest
+from Database.sqlite_handler import SQLiteDatabaseHandler
+from baggage.Baggage import Baggage
+from baggage.BaggageFeeCalc import use_policy
+from baggage.FeePolicy import TieredFeePolicy, route_key
+from flights.SeatInventory import SeatInventory
+from flights.SeatLayout import get_layout
+
+
+def manifest_row(name, seat_id, **extra):
+    row = {"name": name, "email": f"{name.lower()}@example.com", "age": 30,
+           "passenger_type": "Regular", "preferences": "Work", "seat_id": seat_id}
+    row.update(extra)
+    return row
+
+
+class TestGroupBooking(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+        self.db.add_flight("FL001", "AirExpress", "New York", "Los Angeles",
+                           time(8, 0), time(11, 30), date(2025, 6, 1), 120)
+        self.db.initialize_seats_bulk({"FL001": {f"{row}{letter}": True for row in range(1, 5) for letter in "ABCD"}})
+        self.group = GroupBooking(self.db)
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def count(self, table):
+        return self.db.fetch_data(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+    def test_books_whole_manifest(self):
+        manifest = [manifest_row("Ann", "1A", baggage_weight=25, payment_status="yes"),
+                    manifest_row("Ben", "1B", ticket_id="CHARTER2"),
+                    manifest_row("Cat", "1C")]
+        result = self.group.book("FL001", manifest)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.booked, 3)
+        self.assertEqual(result.tickets[2], "CHARTER2")
+        self.assertEqual(self.count("bookings"), 3)
+        self.assertEqual(self.db.fetch_data("SELECT weight, fee FROM baggage")[0][1], 50)
+        self.assertTrue(self.db.get_booking_by_ticket(result.tickets[1])[6])
+        free = {seat for seat, _ in self.db.get_available_seats("FL001")}
+        self.assertTrue(free.isdisjoint({"1A", "1B", "1C"}))
+        self.assertEqual(self.db.get_availability_bitmaps(["FL001"])["FL001"].free_count(), 13)
+
+    def test_invalid_rows_are_reported_and_nothing_is_written(self):
+        manifest = [manifest_row("Ann", "1A"), manifest_row("", "1B"),
+                    manifest_row("Cat", "1A"), manifest_row("Dan", "1D", age="old")]
+        result = self.group.book("FL001", manifest)
+
+        self.assertFalse(result.committed)
+        self.assertEqual([row for row, _ in result.errors], [2, 3, 4])
+        self.assertIn("name is required", result.errors[0][1])
+        self.assertEqual(self.count("passengers"), 0)
+
+    def test_taken_seats_with_partial_booking(self):
+        self.db.update_seat_availability("2A", "FL001", False)
+        manifest = [manifest_row("Ann", "1A"), manifest_row("Ben", "2A"), manifest_row("Cat", "bad seat id")]
+
+        strict = self.group.book("FL001", manifest[:2])
+        self.assertFalse(strict.committed)
+        self.assertEqual(strict.errors[0][0], 2)
+        self.assertEqual(self.count("bookings"), 0)
+
+        partial = self.group.book("FL001", manifest, allow_partial=True)
+        self.assertTrue(partial.committed)
+        self.assertEqual(list(partial.tickets), [1])
+        self.assertEqual([row for row, _ in partial.errors], [2, 3])
+
+    def test_manifest_files(self):
+        directory = tempfile.mkdtemp()
+        csv_path = os.path.join(directory, "manifest.csv")
+        with open(csv_path, "w", newline="") as f:
+            f.write("name,email,age,seat_id,baggage_weight\nAnn,ann@example.com,30,3a,\nBen,,41,3B,22.5\n")
+        jsonl_path = os.path.join(directory, "manifest.jsonl")
+        with open(jsonl_path, "w") as f:
+            f.write(json.dumps(manifest_row("Cat", "4A")) + "\n{not json\n")
+        self.addCleanup(lambda: [os.remove(csv_path), os.remove(jsonl_path), os.rmdir(directory)])
+
+        self.assertTrue(self.group.book("FL001", csv_path).ok)
+        self.assertEqual(self.count("baggage"), 1)
+
+        result = self.group.book("FL001", jsonl_path, allow_partial=True)
+        self.assertEqual(result.booked, 1)
+        self.assertIn("Invalid JSON", result.errors[0][1])
+        self.assertRaises(ValueError, load_manifest, "manifest.xlsx")
+
+    def test_party_is_seated_together(self):
+        inventory = SeatInventory(self.db, start_expiry=False)
+        self.addCleanup(inventory.close)
+        self.assertTrue(self.group.book("FL001", [manifest_row("Ann", "1B")]).ok)
+
+        party = [manifest_row(name, None) for name in ("Dan", "Eve", "Fay")]
+        result = self.group.book_together("FL001", party, inventory, layout=get_layout("DEMO16"))
+        self.assertTrue(result.ok)
+        self.assertEqual(list(result.seats.values()), ["1A", "1C", "1D"])
+        self.assertFalse(inventory.is_available("FL001", "1C"))
+        self.assertEqual(inventory.hold_count(), 0)
+
+        too_big = [manifest_row(f"P{index}", None) for index in range(5)]
+        result = self.group.book_together("FL001", too_big, inventory)
+        self.assertFalse(result.committed)
+        self.assertIn("5 seats together", result.errors[0][1])
+        self.assertEqual(self.group.book_together("FL001", too_big, inventory, allow_split=True).booked, 5)
+        self.assertEqual(self.count("bookings"), 9)
+
+    def test_baggage_is_priced_for_route_and_cabin(self):
+        use_policy(TieredFeePolicy({
+            "default": {"limit": 20, "fee_per_kg": 10},
+            "rules": [
+                {"route": "New York-London", "tiers": [[0, 0], [23, 12]]},
+                {"route": "New York-London", "class": "Business", "limit": 40, "fee_per_kg": 5},
+            ],
+        }))
+        self.addCleanup(use_policy, None)
+        layout = get_layout("A320")
+        self.db.add_flight("FL002", "AirExpress", "New York", "London",
+                           time(18, 0), time(6, 0), date(2025, 6, 1), 174, "A320")
+        self.db.initialize_seats_bulk({"FL002": layout.seat_map()}, seat_types=layout.seat_type_table)
+
+        manifest = [manifest_row("Ann", "1A", baggage_weight=30), manifest_row("Ben", "4A", baggage_weight=30),
+                    manifest_row("Cat", "4B", baggage_weight=30, baggage_fee=5)]
+        self.assertTrue(self.group.book("FL002", manifest).ok)
+
+        route = route_key("New York", "London")
+        expected = [Baggage(name, 30, layout.cabin(seat), route).calculate_fee()
+                    for name, seat in (("Ann", "1A"), ("Ben", "4A"))]
+        self.assertEqual(expected, [0, 84])
+        fees = [fee for (fee,) in self.db.fetch_data("SELECT fee FROM baggage ORDER BY baggage_id")]
+        self.assertEqual(fees, expected + [5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from datetime import date
+from Database.base_handler import (AVAILABLE_SEATS_QUERY, BAGGAGE_BY_PASSENGER_QUERY,
+                                   BOOKING_BY_TICKET_QUERY, FLIGHTS_BY_ROUTE_QUERY)
+from Database.migrations import Migration, MigrationRunner, MIGRATIONS
+from Database.sqlite_handler import SQLiteDatabaseHandler
+
+
+class TestMigrationRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.assertTrue(self.db.create_tables())
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_create_tables_applies_all_migrations_once(self):
+        runner = MigrationRunner(self.db)
+        self.assertEqual(runner.applied_versions(), {m.version for m in MIGRATIONS})
+        self.assertEqual(runner.migrate(), [])
+        self.assertTrue(self.db.create_tables())
+
+    def test_new_migration_is_applied_in_order(self):
+        extra = Migration(99, "Test column", ("ALTER TABLE passengers ADD COLUMN nickname VARCHAR(20)",))
+        runner = MigrationRunner(self.db, MIGRATIONS + [extra])
+        self.assertEqual([m.version for m in runner.pending()], [99])
+        self.assertEqual(runner.migrate(), [99])
+        self.assertIsNotNone(self.db.fetch_data("SELECT nickname FROM passengers"))
+
+    def test_failed_migration_is_not_recorded(self):
+        broken = Migration(100, "Broken", ("ALTER TABLE missing_table ADD COLUMN x INT",))
+        runner = MigrationRunner(self.db, MIGRATIONS + [broken])
+        self.assertIsNone(runner.migrate())
+        self.assertNotIn(100, runner.applied_versions())
+
+
+class TestHotQueryPlans(unittest.TestCase):
+    """The hot lookups must be served by the migration indexes, not table scans."""
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_available_seats_uses_flight_availability_index(self):
+        self.assertIn("idx_seats_flight_available", self.db.indexes_used(AVAILABLE_SEATS_QUERY, ("FL001",)))
+
+    def test_bookings_by_passenger_uses_passenger_index(self):
+        query = "SELECT * FROM bookings WHERE passenger_id = %s"
+        self.assertIn("idx_bookings_passenger", self.db.indexes_used(query, (1,)))
+
+    def test_baggage_lookup_uses_passenger_index(self):
+        self.assertIn("idx_baggage_passenger", self.db.indexes_used(BAGGAGE_BY_PASSENGER_QUERY, (1,)))
+
+    def test_route_search_uses_route_index(self):
+        params = ("New York", "Los Angeles", date(2025, 6, 1), date(2025, 6, 7))
+        self.assertIn("idx_flights_route_date", self.db.indexes_used(FLIGHTS_BY_ROUTE_QUERY, params))
+
+    def test_booking_join_does_not_scan(self):
+        plan = self.db.explain(BOOKING_BY_TICKET_QUERY, ("TKT1001",))
+        self.assertTrue(plan)
+        for row in plan:
+            self.assertFalse(row[-1].startswith("SCAN"), row[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from Database.database_handler import DatabaseHandler
+from Database.metrics import QueryMetrics
+from Database.sqlite_handler import SQLiteDatabaseHandler
+
+
+class TestQueryMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+        self.db.metrics = QueryMetrics()
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_calls_are_recorded_per_method(self):
+        passenger_id = self.db.add_passenger("Alice", None, 30, "Regular", "Work")
+        self.db.add_passenger("Bob", None, 41, "Regular", "Sleep")
+        self.db.get_passenger_by_id(passenger_id)
+
+        stats = self.db.metrics.as_dict()
+        self.assertEqual(stats["add_passenger"]["count"], 2)
+        self.assertEqual(stats["add_passenger"]["rows"], 2)
+        self.assertEqual(stats["get_passenger_by_id"]["rows"], 1)
+        self.assertEqual(stats["add_passenger"]["buckets"][float("inf")], 2)
+
+    def test_nested_calls_count_once(self):
+        self.db.create_booking("TKT1", 1, "FL404", "1A")
+        stats = self.db.metrics.as_dict()
+        self.assertIn("create_booking", stats)
+        self.assertNotIn("book_seat", stats)
+
+    def test_errors_are_counted(self):
+        with patch("builtins.print"):
+            self.assertFalse(self.db.add_baggage(999, 20, 0))  # unknown passenger violates the foreign key
+        self.assertEqual(self.db.metrics.as_dict()["add_baggage"]["errors"], 1)
+
+    def test_prometheus_export(self):
+        self.db.get_available_seats("FL001")
+        text = self.db.metrics.to_prometheus()
+        self.assertIn('flight_db_query_duration_seconds_count{method="get_available_seats"} 1', text)
+        self.assertIn('le="+Inf"', text)
+        self.assertIn('flight_db_query_errors_total{method="get_available_seats"} 0', text)
+
+
+class TestPreparedStatementCache(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.is_connected.return_value = True
+        patcher = patch("Database.database_handler.mysql.connector.connect", return_value=self.connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fixed_queries_reuse_prepared_cursor(self):
+        db = DatabaseHandler()
+        for _ in range(3):
+            db.add_passenger("Alice", None, 30, "Regular", "Work")
+        self.connection.cursor.assert_called_once_with(prepared=True)
+
+    def test_cache_can_be_disabled(self):
+        db = DatabaseHandler(statement_cache_size=0)
+        for _ in range(3):
+            db.add_passenger("Alice", None, 30, "Regular", "Work")
+        self.assertEqual(self.connection.cursor.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from mysql.connector import Error
+from Database.database_handler import DatabaseHandler
+from Database.resilience import CircuitBreaker, CircuitOpenError, Reconnector, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_is_exponential_and_capped(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, jitter=False)
+        self.assertEqual([round(policy.delay(n), 3) for n in range(6)], [0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+    def test_jitter_stays_below_cap(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, rng=lambda: 0.5)
+        self.assertAlmostEqual(policy.delay(10), 0.5)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=self.clock)
+
+    def test_opens_after_threshold_and_probes_once(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.clock.now = 10
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())  # only one trial call at a time
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.times_opened, 2)
+        self.assertAlmostEqual(self.breaker.retry_after(), 10)
+
+
+class TestReconnector(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sleeps = []
+        self.connect = MagicMock(side_effect=OSError("refused"))
+        self.reconnector = Reconnector(
+            self.connect,
+            RetryPolicy(max_attempts=3, base_delay=0.1, jitter=False),
+            CircuitBreaker(failure_threshold=5, reset_timeout=30, clock=self.clock),
+            sleep=self.sleeps.append,
+        )
+
+    def test_retries_with_backoff_then_fails_fast(self):
+        self.assertRaises(OSError, self.reconnector.connect)
+        self.assertEqual(self.connect.call_count, 3)
+        self.assertEqual([round(delay, 3) for delay in self.sleeps], [0.1, 0.2])
+
+        self.assertRaises(OSError, self.reconnector.connect)  # fifth failure opens the breaker
+        self.assertEqual(self.connect.call_count, 5)
+        self.assertRaises(CircuitOpenError, self.reconnector.connect)
+        self.assertEqual(self.connect.call_count, 5)
+
+        stats = self.reconnector.stats()
+        self.assertEqual((stats["attempts"], stats["failures"], stats["rejected"]), (5, 5, 1))
+        self.assertEqual(stats["state"], CircuitBreaker.OPEN)
+
+    def test_recovers_after_reset_timeout(self):
+        for _ in range(2):
+            self.assertRaises(OSError, self.reconnector.connect)
+        self.clock.now = 30
+        self.connect.side_effect = None
+        self.connect.return_value = "connection"
+
+        self.assertEqual(self.reconnector.connect(), "connection")
+        self.assertEqual(self.reconnector.stats()["state"], CircuitBreaker.CLOSED)
+
+    def test_unexpected_error_in_half_open_trial_frees_the_trial(self):
+        reconnector = Reconnector(self.connect, RetryPolicy(max_attempts=1),
+                                  CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=self.clock),
+                                  retry_on=(OSError,), sleep=self.sleeps.append)
+        self.assertRaises(OSError, reconnector.connect)
+        self.clock.now = 30
+        self.connect.side_effect = TypeError("bad connect argument")
+        self.assertRaises(TypeError, reconnector.connect)
+        self.assertEqual(reconnector.stats()["state"], CircuitBreaker.HALF_OPEN)
+
+        self.connect.side_effect = None
+        self.connect.return_value = "connection"
+        self.assertEqual(reconnector.connect(), "connection")
+        self.assertEqual(reconnector.stats()["state"], CircuitBreaker.CLOSED)
+
+
+class TestHandlerReconnect(unittest.TestCase):
+
+    @patch("Database.database_handler.mysql.connector.connect", side_effect=Error(errno=2003, msg="down"))
+    def test_outage_fails_fast(self, connect):
+        db = DatabaseHandler(retry_policy=RetryPolicy(max_attempts=2, base_delay=0),
+                             circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        self.assertFalse(db.connect())
+        self.assertEqual(connect.call_count, 2)
+
+        self.assertIsNone(db.get_flight_by_id("FL001"))
+        self.assertEqual(connect.call_count, 2)
+        self.assertEqual(db.reconnect_stats()["rejected"], 1)
+
+    @patch("Database.database_handler.mysql.connector.connect")
+    def test_missing_database_is_created_once(self, connect):
+        connection = MagicMock()
+        connect.side_effect = [Error(errno=1049, msg="unknown database"), connection, connection]
+        db = DatabaseHandler(retry_policy=RetryPolicy(max_attempts=1))
+
+        self.assertTrue(db.connect())
+        self.assertEqual(connect.call_count, 3)  # failed connect, server connect, retry
+        connection.cursor.return_value.execute.assert_called_once_with("CREATE DATABASE IF NOT EXISTS flight_booking")
+
+if __name__ == '__main__':
+    unittest.main()
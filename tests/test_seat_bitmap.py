@@ -0,0 +1,122 @@
+import unittest
+from datetime import date, time
+from Database.seat_bitmap import SeatBitmap, seat_sort_key
+from Database.sqlite_handler import SQLiteDatabaseHandler
+
+
+class TestSeatBitmap(unittest.TestCase):
+
+    def setUp(self):
+        rows = [("10A", "Window", True), ("2B", "Middle", False), ("2A", "Window", True), ("1D", "Window", False)]
+        self.bitmap = SeatBitmap.from_rows("FL001", rows)
+
+    def test_seats_are_ordered_by_row(self):
+        self.assertEqual(self.bitmap.seat_ids, ("1D", "2A", "2B", "10A"))
+        self.assertLess(seat_sort_key("9F"), seat_sort_key("10A"))
+
+    def test_counts_and_updates(self):
+        self.assertEqual(self.bitmap.free_count(), 2)
+        self.assertEqual(self.bitmap.count_free_by_type(), {"Window": 2, "Middle": 0})
+
+        self.bitmap.set_available("2B", True)
+        self.bitmap.set_available("2A", False)
+        self.assertEqual(self.bitmap.available_seats(), ["2B", "10A"])
+        self.assertEqual(self.bitmap.available_seats("Window"), ["10A"])
+        self.assertFalse(self.bitmap.is_available("2A"))
+
+    def test_byte_round_trip(self):
+        restored = SeatBitmap(*self.bitmap.to_row())
+        self.assertEqual(restored.available_seats(), self.bitmap.available_seats())
+        self.assertEqual(len(self.bitmap.to_bytes()), 1)
+
+
+class TestStoredBitmaps(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+        for flight_id in ("FL001", "FL002"):
+            self.db.add_flight(flight_id, "AirExpress", "New York", "Los Angeles",
+                               time(8, 0), time(11, 30), date(2025, 6, 1), 120)
+        seat_map = {f"{row}{letter}": True for row in range(1, 5) for letter in "ABCD"}
+        self.db.initialize_seats_bulk({"FL001": seat_map, "FL002": seat_map})
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_writes_keep_bitmap_in_step_with_seats(self):
+        passenger_id = self.db.add_passenger("Alice", None, 30, "Regular", "Work")
+        self.assertTrue(self.db.book_seat("TKT1", passenger_id, "FL001", "1A").ok)
+        self.assertTrue(self.db.update_seat_availability("1B", "FL001", False))
+        self.assertTrue(self.db.update_seat_availability("1B", "FL002", False))
+
+        bitmaps = self.db.get_availability_bitmaps(["FL001", "FL002"])
+        for flight_id, bitmap in bitmaps.items():
+            free = sorted(seat for seat, _ in self.db.get_available_seats(flight_id))
+            self.assertEqual(sorted(bitmap.available_seats()), free)
+
+        self.assertEqual(self.db.count_free_seats_by_type(["FL001", "FL002"]), {
+            "FL001": {"Window": 7, "Middle": 7},
+            "FL002": {"Window": 8, "Middle": 7},
+        })
+
+    def test_missing_bitmap_is_built_from_seats(self):
+        self.db.execute_query("DELETE FROM seat_availability WHERE flight_id = %s", ("FL002",))
+        self.db.execute_query("UPDATE seats SET is_available = FALSE WHERE flight_id = %s AND seat_id = %s",
+                              ("FL002", "4D"))
+
+        bitmaps = self.db.get_availability_bitmaps(["FL002", "FL999"])
+        self.assertEqual(list(bitmaps), ["FL002"])
+        self.assertEqual(bitmaps["FL002"].free_count(), 15)
+        # Reads never write; storing the bitmap is left to compaction
+        self.assertEqual(len(self.db.fetch_data("SELECT * FROM seat_availability")), 1)
+
+        self.assertEqual(self.db.compact_seat_bitmaps(), 1)
+        self.assertEqual(len(self.db.fetch_data("SELECT * FROM seat_availability")), 2)
+        self.assertEqual(self.db.get_availability_bitmaps(["FL002"])["FL002"].free_count(), 15)
+
+    def test_compaction_folds_logged_changes_into_bitmaps(self):
+        passenger_id = self.db.add_passenger("Alice", None, 30, "Regular", "Work")
+        self.assertTrue(self.db.book_seat("TKT1", passenger_id, "FL001", "1A").ok)
+        self.assertTrue(self.db.update_seat_availability("1A", "FL001", True))
+        self.assertTrue(self.db.update_seat_availability("2C", "FL001", False))
+        self.assertEqual(len(self.db.fetch_data("SELECT * FROM seat_availability_changes")), 3)
+        before = self.db.get_availability_bitmaps(["FL001"])["FL001"].available_seats()
+
+        self.assertEqual(self.db.compact_seat_bitmaps(), 1)
+        self.assertEqual(self.db.fetch_data("SELECT * FROM seat_availability_changes"), [])
+        after = self.db.get_availability_bitmaps(["FL001"])["FL001"]
+        self.assertEqual(after.available_seats(), before)
+        self.assertNotIn("2C", after.available_seats())
+        self.assertIn("1A", after.available_seats())
+
+    def test_writes_keep_the_change_log_bounded(self):
+        self.db.SEAT_LOG_COMPACT_THRESHOLD = 8
+        for round_number in range(10):
+            for seat_id in ("1A", "2B", "3C"):
+                self.assertTrue(self.db.update_seat_availability(seat_id, "FL001", round_number % 2 == 1))
+            pending = self.db.fetch_data("SELECT COUNT(*) FROM seat_availability_changes")[0][0]
+            self.assertLess(pending, 8)
+
+        passenger_id = self.db.add_passenger("Alice", None, 30, "Regular", "Work")
+        for index, seat_id in enumerate(f"{row}{letter}" for row in (1, 2) for letter in "ABCD"):
+            self.assertTrue(self.db.book_seat(f"TKT{index}", passenger_id, "FL002", seat_id).ok)
+        self.assertEqual(self.db.fetch_data("SELECT * FROM seat_availability_changes WHERE flight_id = %s",
+                                            ("FL002",)), [])
+
+        free = sorted(seat for seat, _ in self.db.get_available_seats("FL001"))
+        self.assertEqual(sorted(self.db.get_availability_bitmaps(["FL001"])["FL001"].available_seats()), free)
+
+    def test_seats_added_after_the_bitmap_are_read_from_seats(self):
+        self.db.initialize_seats_for_flight("FL001", {"5A": True})
+        self.db.execute_query("UPDATE seat_availability SET seat_ids = %s, seat_types = %s, available = %s "
+                              "WHERE flight_id = %s", ("1A", "Window", b"\x01", "FL001"))
+        self.assertTrue(self.db.update_seat_availability("5A", "FL001", False))
+
+        bitmap = self.db.get_availability_bitmaps(["FL001"])["FL001"]
+        self.assertEqual(len(bitmap), 17)
+        self.assertEqual(bitmap.free_count(), 16)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import random
+import threading
+import unittest
+from datetime import date, time
+from Database.sqlite_handler import SQLiteDatabaseHandler
+from flights.SeatInventory import FREE, SeatInventory
+from flights.SeatLayout import get_layout
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def seats(rows=4):
+    return [(f"{row}{letter}", "Window" if letter in "AD" else "Middle", True)
+            for row in range(1, rows + 1) for letter in "ABCD"]
+
+
+class TestSeatInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.inventory = SeatInventory(default_ttl=60, clock=self.clock, start_expiry=False)
+        zones = ["Front" if int(seat[0][:-1]) <= 2 else "Back" for seat in seats()]
+        self.inventory.add_flight("FL001", seats(), zones=zones)
+
+    def test_hold_confirm_release(self):
+        token = self.inventory.hold("FL001", "1A")
+        self.assertIsNotNone(token)
+        self.assertIsNone(self.inventory.hold("FL001", "1A"))
+        self.assertFalse(self.inventory.confirm("FL001", "1A", token="other"))
+        self.assertTrue(self.inventory.confirm("FL001", "1A", token=token))
+        self.assertFalse(self.inventory.is_available("FL001", "1A"))
+
+        self.assertFalse(self.inventory.release("FL001", "1A", token=token))
+        self.assertTrue(self.inventory.release("FL001", "1A"))
+        self.assertTrue(self.inventory.is_available("FL001", "1A"))
+
+    def test_expired_hold_is_reclaimed(self):
+        token = self.inventory.hold("FL001", "2B", ttl=30)
+        self.clock.now = 31
+        self.assertTrue(self.inventory.is_available("FL001", "2B"))
+        self.assertIsNotNone(self.inventory.hold("FL001", "2B"))
+        self.assertFalse(self.inventory.confirm("FL001", "2B", token=token))
+
+    def test_hold_count_skips_lazily_expired_holds(self):
+        self.inventory.hold("FL001", "2B", ttl=30)
+        self.inventory.hold("FL001", "2C", ttl=90)
+        self.clock.now = 31
+        self.assertEqual(self.inventory.hold_count(), 1)
+        self.assertTrue(self.inventory.is_available("FL001", "2B"))
+        self.assertEqual(len(self.inventory.expiry), 1)
+        self.assertEqual(self.inventory.hold_count(), 1)
+
+    def test_scheduler_reclaims_abandoned_holds(self):
+        tokens = [self.inventory.hold("FL001", seat_id, ttl=ttl)
+                  for seat_id, ttl in (("1A", 10), ("1B", 20), ("1C", 30))]
+        self.assertTrue(self.inventory.confirm("FL001", "1C", token=tokens[2]))
+        self.assertTrue(self.inventory.extend_hold("FL001", "1B", tokens[1], ttl=100))
+        self.assertEqual(self.inventory.hold_count(), 2)
+
+        self.clock.now = 50
+        self.assertEqual(self.inventory.expiry.expire_due(), 1)
+        self.assertEqual(self.inventory.find_free("FL001", "Window"), "1A")
+        self.assertTrue(self.inventory.is_held_by("FL001", "1B", tokens[1]))
+        self.assertFalse(self.inventory.is_held_by("FL001", "1A", tokens[0]))
+        self.assertEqual(self.inventory.free_count("FL001"), 14)
+
+    def test_find_free_by_type_and_zone(self):
+        self.assertEqual(self.inventory.find_free("FL001", "Window"), "1A")
+        self.inventory.confirm("FL001", "1A")
+        self.inventory.hold("FL001", "1D")
+        self.assertEqual(self.inventory.find_free("FL001", "Window"), "2A")
+        self.assertEqual(self.inventory.find_free("FL001", "Middle", zone="Back"), "3B")
+        self.assertEqual(self.inventory.free_count("FL001", "Window"), 6)
+        self.assertEqual(self.inventory.free_count("FL001"), 14)
+
+        for seat_id in ("2A", "2D"):
+            self.inventory.confirm("FL001", seat_id)
+        self.assertIsNone(self.inventory.find_free("FL001", "Window", zone="Front"))
+        self.inventory.release("FL001", "2D")
+        self.assertEqual(self.inventory.find_free("FL001", "Window", zone="Front"), "2D")
+
+    def test_concurrent_holds_reserve_seat_once(self):
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(self.inventory.hold("FL001", "3C")))
+                   for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len([token for token in tokens if token]), 1)
+
+
+class TestPartyAllocation(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = SeatInventory(start_expiry=False)
+
+    def add(self, flight_id, layout):
+        seats = [(seat_id, layout.seat_type(seat_id), True) for seat_id in layout.seat_ids]
+        return self.inventory.add_flight(flight_id, seats, layout=layout)
+
+    def test_prefers_runs_without_an_aisle_then_same_row(self):
+        self.add("FL001", get_layout("DEMO16"))
+        seat_ids, token = self.inventory.hold_group("FL001", 2)
+        self.assertEqual(seat_ids, ["1A", "1B"])
+        self.assertTrue(self.inventory.is_held_by("FL001", "1B", token))
+
+        self.inventory.confirm("FL001", "2A")
+        self.assertEqual(self.inventory.find_adjacent("FL001", 2), ["1C", "1D"])
+        self.assertEqual(self.inventory.find_adjacent("FL001", 3), ["2B", "2C", "2D"])
+        self.assertEqual(self.inventory.find_adjacent("FL001", 5), [])
+        self.assertEqual(self.inventory.find_adjacent("FL001", 5, allow_split=True), ["1C", "1D", "2B", "2C", "2D"])
+
+        for seat_id in seat_ids:
+            self.inventory.release("FL001", seat_id, token)
+        self.assertEqual(self.inventory.find_adjacent("FL001", 4), ["1A", "1B", "1C", "1D"])
+
+    def test_tightest_block_is_used(self):
+        self.add("FL002", get_layout("A320"))
+        self.assertEqual(self.inventory.hold_group("FL002", 3)[0], ["4A", "4B", "4C"])
+        self.assertEqual(self.inventory.find_adjacent("FL002", 2), ["1A", "1C"])
+        self.assertEqual(self.inventory.find_adjacent("FL002", 6), ["5A", "5B", "5C", "5D", "5E", "5F"])
+        self.assertEqual(self.inventory.find_adjacent("FL002", 7), [])
+
+    def test_incremental_runs_match_a_full_scan(self):
+        layout = get_layout("A320")
+        flight = self.add("FL003", layout)
+        rng = random.Random(3)
+        for _ in range(2000):
+            seat_id = rng.choice(layout.seat_ids)
+            if self.inventory.is_available("FL003", seat_id):
+                self.inventory.confirm("FL003", seat_id)
+            else:
+                self.inventory.release("FL003", seat_id)
+
+            size = rng.randrange(2, 10)
+            found = flight.find_block(size)
+            best_run = 0
+            for block in layout.blocks:
+                run = 0
+                for position in block:
+                    run = run + 1 if flight.state[position] == FREE else 0
+                    best_run = max(best_run, run)
+            if best_run >= size:
+                self.assertEqual(len(found), size)
+                self.assertEqual(len({layout.rows[p] for p in found}), 1)
+                self.assertTrue(all(flight.state[p] == FREE for p in found))
+                self.assertEqual(found, list(range(found[0], found[0] + size)))
+
+
+class TestInventoryDatabaseSync(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+        self.db.add_flight("FL001", "AirExpress", "New York", "Los Angeles",
+                           time(8, 0), time(11, 30), date(2025, 6, 1), 120)
+        self.db.initialize_seats_bulk({"FL001": {seat[0]: True for seat in seats()}})
+        self.inventory = SeatInventory(self.db, start_expiry=False)
+        self.addCleanup(self.db.disconnect)
+        self.addCleanup(self.inventory.close)
+
+    def test_load_and_write_back(self):
+        self.assertTrue(self.inventory.ensure_loaded("FL001"))
+        self.assertFalse(self.inventory.ensure_loaded("FL404"))
+        self.assertEqual(list(self.inventory.availability("FL001"))[:5], ["1A", "1B", "1C", "1D", "2A"])
+
+        self.assertTrue(self.inventory.confirm("FL001", "1A", sync=True))
+        self.inventory.sync.flush()
+        self.assertNotIn("1A", [seat for seat, _ in self.db.get_available_seats("FL001")])
+
+    def test_refresh_picks_up_external_bookings_and_keeps_holds(self):
+        self.inventory.ensure_loaded("FL001")
+        token = self.inventory.hold("FL001", "2A")
+        self.db.update_seat_availability("4D", "FL001", False)
+
+        self.inventory.refresh(["FL001"], wait=True)
+        self.assertFalse(self.inventory.is_available("FL001", "4D"))
+        self.assertTrue(self.inventory.confirm("FL001", "2A", token=token))
+
+    def test_refresh_reports_completion(self):
+        self.inventory.ensure_loaded("FL001")
+        self.db.update_seat_availability("4D", "FL001", False)
+        seen = []
+        self.inventory.refresh(["FL001"], wait=True,
+                               on_done=lambda flight_ids: seen.append(self.inventory.availability("FL001")["4D"]))
+        self.assertEqual(seen, [False])
+
+    def test_refresh_of_a_changed_seat_map_carries_holds_over(self):
+        self.inventory.ensure_loaded("FL001")
+        token = self.inventory.hold("FL001", "2A", ttl=60)
+        lost = self.inventory.hold("FL001", "3B")
+        self.db.initialize_seats_for_flight("FL001", {"0A": True})
+        self.db.update_seat_availability("3B", "FL001", False)
+
+        self.inventory.refresh(["FL001"], wait=True)
+        self.assertIn("0A", self.inventory.availability("FL001"))
+        self.assertTrue(self.inventory.is_held_by("FL001", "2A", token))
+        self.assertFalse(self.inventory.is_available("FL001", "2A"))
+        self.assertFalse(self.inventory.is_held_by("FL001", "3B", lost))
+        self.assertEqual(self.inventory.hold_count(), 1)
+        self.assertTrue(self.inventory.confirm("FL001", "2A", token=token))
+
+if __name__ == '__main__':
+    unittest.main()
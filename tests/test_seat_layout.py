@@ -0,0 +1,120 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, time
+from Database.sqlite_handler import SQLiteDatabaseHandler
+from flights.Flight import Flight, flights_from_rows
+from flights.SeatLayout import LayoutRegistry, get_layout
+from utilities.seat_swap import Passenger, SeatSwapper
+
+
+class TestSeatLayout(unittest.TestCase):
+
+    def test_demo_layout_keeps_original_seat_map(self):
+        layout = get_layout()
+        self.assertEqual(layout.code, "DEMO16")
+        self.assertEqual(len(layout), 16)
+        self.assertEqual(layout.seat_type("1A"), "Window")
+        self.assertEqual(layout.seat_type("2C"), "Middle")
+        self.assertEqual(layout.grid_position("3C"), (2, 3))
+        self.assertEqual(layout.aisle_columns, (2,))
+
+    def test_seat_types_blocks_and_exit_rows(self):
+        layout = get_layout("B777")
+        self.assertEqual(len(layout), 458)
+        self.assertNotIn("13A", layout)
+        self.assertEqual([layout.seat_type(f"20{letter}") for letter in "ABCDEFGHJK"],
+                         ["Window", "Middle", "Aisle", "Aisle", "Middle", "Middle", "Aisle", "Aisle", "Middle", "Window"])
+        self.assertEqual(layout.cabin("1A"), "Business")
+        self.assertTrue(layout.is_exit_row("31K"))
+        first_row_blocks = [block for block in layout.blocks if layout.rows[block[0]] == 10]
+        self.assertEqual([len(block) for block in first_row_blocks], [3, 4, 3])
+
+    def test_layouts_are_built_once_and_shared(self):
+        self.assertIs(get_layout("A320"), get_layout("A320"))
+        rows = [("FL1", "AirCo", "NY", "LA", "10:00", "14:00", "2025-06-06", 120, "A320"),
+                ("FL2", "AirCo", "LA", "NY", "16:00", "20:00", "2025-06-06", 120, "A320")]
+        first, second = flights_from_rows(rows)
+        self.assertIs(first.layout, second.layout)
+
+    def test_registry_loads_json_definitions(self):
+        definition = {"code": "E190", "cabins": [{"name": "Economy", "rows": [1, 25], "letters": "ACDF",
+                                                 "aisles_after": "C"}]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "layouts.json")
+            with open(path, "w") as f:
+                json.dump([definition], f)
+            registry = LayoutRegistry()
+            registry.load_file(path)
+        self.assertIn("E190", registry)
+        self.assertEqual(len(registry.get("E190")), 100)
+        self.assertEqual(registry.get("E190").seat_type("5C"), "Aisle")
+        with self.assertRaises(KeyError):
+            registry.get("A380")
+
+    def test_unknown_aircraft_type_falls_back_to_default_layout(self):
+        flight = Flight("FL009", "AirExpress", "New York", "Los Angeles",
+                        time(8, 0), time(11, 30), date(2025, 6, 1), 16, "X999")
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertIs(flight.layout, get_layout())
+            self.assertIs(get_layout("X999"), get_layout())
+        self.assertEqual(output.getvalue().count("unknown aircraft type 'X999'"), 1)
+
+    def test_swap_zones_follow_the_seat_map(self):
+        self.assertEqual(get_layout().zones["Networking"], ("1A", "1B", "1C", "1D"))
+        zones = get_layout("A320").zones
+        self.assertEqual(list(zones), ["Networking", "Quiet", "Work", "Legroom"])
+        self.assertIn("12A", zones["Legroom"])
+        self.assertEqual(sum(len(seats) for seats in zones.values()), 174)
+
+        registry = LayoutRegistry([{"code": "Z", "cabins": [{"name": "Economy", "rows": [1, 3], "letters": "AB"}],
+                                    "zones": {"Legroom": [1, 1], "Networking": [2, 3]}}])
+        self.assertEqual(registry.get("Z").zones, {"Networking": ("2A", "2B", "3A", "3B"), "Quiet": (), "Work": (),
+                                                   "Legroom": ("1A", "1B")})
+
+    def test_partial_custom_zones_still_drive_a_swapper(self):
+        registry = LayoutRegistry([{"code": "Z", "cabins": [{"name": "Economy", "rows": [1, 3], "letters": "AB"}],
+                                    "zones": {"Networking": [1, 3]}}])
+        for mode in SeatSwapper.MODES:
+            swapper = SeatSwapper(registry.get("Z").zones)
+            bob = Passenger("Bob", "", "Networking")
+            swapper.add_passenger(Passenger("Ann", "", "Comfort"))
+            swapper.add_passenger(bob)
+            swapper.assign_seats(mode)
+            self.assertIn(bob.get_seat(), registry.get("Z").zones["Networking"])
+
+        registry.register({"code": "Y", "cabins": [{"name": "Economy", "rows": [1, 3], "letters": "AB"}],
+                           "zones": {"Lounge": [1, 3]}})
+        with self.assertRaisesRegex(ValueError, "Lounge"):
+            registry.get("Y")
+
+
+class TestLayoutSeeding(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_flights_store_aircraft_type_and_layout_seat_types(self):
+        layout = get_layout("A320")
+        self.db.add_flight("FL001", "AirExpress", "New York", "Los Angeles",
+                           time(8, 0), time(11, 30), date(2025, 6, 1), 174, "A320")
+        self.db.initialize_seats_bulk({"FL001": layout.seat_map()},
+                                      seat_types={"FL001": layout.seat_type_table})
+
+        flight = next(flights_from_rows(self.db.get_all_flights()))
+        self.assertEqual(flight.aircraft_type, "A320")
+        self.assertIs(flight.layout, layout)
+        self.assertEqual(self.db.count_free_seats_by_type(["FL001"])["FL001"],
+                         {"Window": 60, "Aisle": 60, "Middle": 54})
+
+
+if __name__ == '__main__':
+    unittest.main()
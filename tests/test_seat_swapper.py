@@ -1,5 +1,10 @@
+import itertools
+import random
 import unittest
-from utilities.seat_swap import SeatSwapper, Socializer, TallPassenger, EcoPassenger
+from flights.SeatLayout import LayoutRegistry
+from utilities.assignment import solve_assignment
+from utilities.interest_clustering import InterestClusters, interest_tokens
+from utilities.seat_swap import Passenger, SeatSwapper, Socializer, TallPassenger, EcoPassenger
 
 class TestSeatSwapper(unittest.TestCase):
 
@@ -49,5 +54,130 @@ class TestSeatSwapper(unittest.TestCase):
         self.system.add_passenger(self.eco_passenger)
         self.eco_passenger.recommend_meal()  # Should recommend a meal
 
+    def test_optimal_assignment_respects_preferences(self):
+        """Test that the optimal mode seats tall passengers with legroom and groups interests."""
+        tech = [Socializer(f"Tech{i}", "", "Networking", "Tech") for i in range(2)]
+        golf = Socializer("Golfer", "", "Networking", "Golf")
+        sleeper = Passenger("Dana", "", "Sleep")
+        for passenger in [tech[0], golf, tech[1], self.tall_passenger, sleeper]:
+            self.system.add_passenger(passenger)
+
+        self.system.assign_seats("optimal")
+
+        self.assertIn(self.tall_passenger.get_seat(), ["40A", "40B", "40C", "40D"])
+        self.assertIn(sleeper.get_seat(), ["20A", "20D"])  # Window seat in the Quiet zone
+        tech_seats = sorted(p.get_seat() for p in tech)
+        self.assertIn(tech_seats, [["10A", "10B"], ["10B", "10C"], ["10C", "10D"]])
+        self.assertNotIn(self.tall_passenger.get_seat(), self.system.get_available_seats()["Legroom"])
+        self.assertEqual(self.system.get_unassigned(), [])
+
+    def test_seat_types_come_from_the_layout(self):
+        """Test that aisle seekers are kept out of the middle seats of a 3-3 row."""
+        layout = LayoutRegistry([{"code": "N6", "cabins": [{"name": "Economy", "rows": [1, 4], "letters": "ABCDEF",
+                                                            "aisles_after": "C"}],
+                                  "zones": {"Networking": [1, 1], "Quiet": [2, 2], "Work": [3, 3],
+                                            "Legroom": [4, 4]}}]).get("N6")
+        workers = [Passenger(f"W{i}", "", "Work") for i in range(2)]
+        sleepers = [Passenger(f"S{i}", "", "Sleep") for i in range(2)]
+        swapper = SeatSwapper(layout.zones, seat_types=layout.seat_type_table)
+        for passenger in workers + sleepers:
+            swapper.add_passenger(passenger)
+        swapper.assign_seats("optimal")
+
+        self.assertEqual(sorted(p.get_seat() for p in workers), ["3C", "3D"])
+        self.assertFalse({"3B", "3E"} & {p.get_seat() for p in workers})
+        self.assertEqual(sorted(p.get_seat() for p in sleepers), ["2A", "2F"])
+
+    def test_unassigned_passengers_are_reported(self):
+        """Test that passengers beyond a full zone are reported in both modes."""
+        crowd = [Passenger(f"P{i}", "", "Comfort") for i in range(5)]
+        for passenger in crowd:
+            self.system.add_passenger(passenger)
+        self.system.assign_seats()
+        self.assertEqual(self.system.get_unassigned(), [crowd[4]])
+
+        system = SeatSwapper()
+        crowd = [Passenger(f"P{i}", "", "Comfort") for i in range(17)]
+        for passenger in crowd:
+            system.add_passenger(passenger)
+        system.assign_seats("optimal")
+        self.assertEqual(len(system.get_unassigned()), 1)
+        self.assertEqual(len({p.get_seat() for p in crowd} - {""}), 16)
+        self.assertRaises(ValueError, system.assign_seats, "random")
+
+    def test_incremental_assignment_keeps_seated_passengers(self):
+        """Test that later passes only place new or waiting passengers."""
+        crowd = [Passenger(f"P{i}", "", "Comfort") for i in range(5)]
+        for passenger in crowd[:3]:
+            self.system.add_passenger(passenger)
+        self.system.assign_seats()
+        self.assertEqual([p.get_seat() for p in crowd[:3]], ["40A", "40B", "40C"])
+
+        for passenger in crowd[3:]:
+            self.system.add_passenger(passenger)
+        self.system.assign_seats()
+        self.assertEqual([p.get_seat() for p in crowd[:4]], ["40A", "40B", "40C", "40D"])
+        self.assertEqual(self.system.get_unassigned(), [crowd[4]])
+        self.assertEqual(self.system.get_available_seats()["Legroom"], [])
+
+        self.system.remove_passenger(crowd[1])
+        self.assertEqual(self.system.get_available_seats()["Legroom"], ["40B"])
+        self.system.assign_seats()
+        self.assertEqual(crowd[4].get_seat(), "40B")
+        self.assertEqual(self.system.get_unassigned(), [])
+        self.assertNotIn(crowd[1], self.system._passengers)
+        self.assertEqual(self.system.get_available_seats()["Networking"], ["10A", "10B", "10C", "10D"])
+
+    def test_assignment_solver_is_optimal(self):
+        """Test the solver against brute force on small problems."""
+        rng = random.Random(5)
+        for rows, columns in [(3, 3), (4, 6), (5, 5)]:
+            for _ in range(20):
+                cost = [[rng.randrange(6) for _ in range(columns)] for _ in range(rows)]
+                chosen = solve_assignment(cost)
+                best = min(sum(cost[r][c] for r, c in enumerate(perm))
+                           for perm in itertools.permutations(range(columns), rows))
+                self.assertEqual(len(set(chosen)), rows)
+                self.assertEqual(sum(cost[r][c] for r, c in enumerate(chosen)), best)
+
+    def test_socializers_are_clustered_by_interest(self):
+        """Test that socializers with related interests sit next to each other as they board."""
+        zones = {"Networking": [f"{row}{letter}" for row in (10, 11) for letter in "ABCD"],
+                 "Quiet": ["20A"], "Work": ["30A"], "Legroom": ["40A"]}
+        system = SeatSwapper(zones)
+        golf = Socializer("Golfer", "", "Networking", "Golf")
+        tech = [Socializer("Ada", "", "Networking", "Startups and AI"),
+                Socializer("Linus", "", "Networking", "AI startup")]
+        for passenger in [golf, tech[0], Socializer("Bea", "", "Networking", "Golfing holidays")]:
+            system.add_passenger(passenger)
+        system.assign_seats()
+        system.add_passenger(tech[1])
+        system.assign_seats()
+
+        seats = zones["Networking"]
+        self.assertEqual(abs(seats.index(tech[0].get_seat()) - seats.index(tech[1].get_seat())), 1)
+        self.assertEqual(system.get_unassigned(), [])
+        self.assertNotIn(tech[1].get_seat(), system.get_available_seats()["Networking"])
+
+        system.remove_passenger(tech[0])
+        self.assertIn(tech[0].get_seat(), system.get_available_seats()["Networking"])
+
+    def test_interest_clusters(self):
+        """Test tokenizing, clustering and removing interests."""
+        self.assertEqual(interest_tokens("Startups and the AI"), ["startup", "ai"])
+        clusters = InterestClusters()
+        ids = clusters.add_many([("a", "Tech startups"), ("b", "Jazz"), ("c", "startup tech"), ("d", "!!")])
+        self.assertEqual(ids[0], ids[2])
+        self.assertNotEqual(ids[0], ids[1])
+        self.assertIsNone(ids[3])
+        self.assertEqual(clusters.add("c", "ignored"), ids[0])
+        self.assertEqual(clusters.add("e", "Jazz music"), ids[1])
+
+        clusters.remove("b")
+        clusters.remove("e")
+        self.assertEqual(clusters.members(ids[0]), ["a", "c"])
+        self.assertNotIn(ids[1], clusters.clusters())
+        self.assertNotEqual(clusters.add("f", "Jazz"), ids[1])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
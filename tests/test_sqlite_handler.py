@@ -0,0 +1,159 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date, time
+from Database.base_handler import BookingResult
+from Database.factory import create_database_handler
+from Database.sqlite_handler import SQLiteDatabaseHandler
+
+
+def seed(db, flight_id="FL001", seats=("1A", "1B", "1C", "1D")):
+    db.create_tables()
+    db.add_flight(flight_id, "AirExpress", "New York", "Los Angeles",
+                  time(8, 0), time(11, 30), date(2025, 6, 1), 120)
+    db.initialize_seats_bulk({flight_id: {seat: True for seat in seats}})
+
+
+class TestSQLiteHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.assertTrue(self.db.connect())
+        seed(self.db)
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_flight_round_trip(self):
+        flight = self.db.get_flight_by_id("FL001")
+        self.assertEqual(flight[0], "FL001")
+        self.assertEqual(flight[4], time(8, 0))
+        self.assertEqual(flight[6], date(2025, 6, 1))
+        self.assertEqual(len(self.db.get_all_flights()), 1)
+
+    def test_booking_flow(self):
+        passenger_id = self.db.add_passenger("Alice", "alice@example.com", 30, "Regular", "Work")
+        self.assertIsNotNone(passenger_id)
+        self.assertTrue(self.db.add_baggage(passenger_id, 23.5, 35))
+
+        result = self.db.book_seat("TKT1001", passenger_id, "FL001", "1A", payment_status=True)
+        self.assertTrue(result.ok)
+
+        booking = self.db.get_booking_by_ticket("TKT1001")
+        self.assertEqual(booking[1], "TKT1001")
+        self.assertIn("Alice", booking)
+        self.assertNotIn("1A", [seat for seat, _ in self.db.get_available_seats("FL001")])
+        self.assertEqual(len(self.db.get_baggage_by_passenger(passenger_id)), 1)
+
+    def test_second_booking_of_seat_conflicts(self):
+        passenger_id = self.db.add_passenger("Bob", None, 40, "Regular", "Sleep")
+        self.assertTrue(self.db.book_seat("TKT1", passenger_id, "FL001", "1B").ok)
+
+        result = self.db.book_seat("TKT2", passenger_id, "FL001", "1B")
+        self.assertEqual(result.status, BookingResult.CONFLICT)
+        self.assertIsNone(self.db.get_booking_by_ticket("TKT2"))
+
+    def test_create_booking_needs_an_existing_free_seat(self):
+        passenger_id = self.db.add_passenger("Dan", None, 35, "Regular", "Work")
+        self.assertTrue(self.db.create_booking("TKT1", passenger_id, "FL001", "1D"))
+        self.assertFalse(self.db.create_booking("TKT2", passenger_id, "FL001", "1D"))
+        self.assertFalse(self.db.create_booking("TKT3", passenger_id, "FL001", "9Z"))
+        self.assertFalse(self.db.create_booking("TKT4", passenger_id, "FL404", "1A"))
+        self.assertEqual(self.db.fetch_data("SELECT ticket_id FROM bookings"), [("TKT1",)])
+
+    def test_new_passenger_is_booked_in_one_transaction(self):
+        passenger = {"name": "Erin", "email": None, "age": 28, "passenger_type": "Regular", "preferences": "Work"}
+        result = self.db.book_new_passenger("TKT1", "FL001", "1A", passenger, baggage=(25, 50))
+        self.assertTrue(result.ok)
+        self.assertEqual(self.db.get_passenger_by_id(result.passenger_id)[1], "Erin")
+        self.assertEqual(len(self.db.get_baggage_by_passenger(result.passenger_id)), 1)
+        self.assertEqual(self.db.get_booking_by_ticket("TKT1")[2], result.passenger_id)
+
+        result = self.db.book_new_passenger("TKT2", "FL001", "1A", dict(passenger, name="Finn"), baggage=(30, 100))
+        self.assertTrue(result.conflict)
+        self.assertIsNone(result.passenger_id)
+        self.assertEqual(len(self.db.fetch_data("SELECT * FROM passengers")), 1)
+        self.assertEqual(len(self.db.fetch_data("SELECT * FROM baggage")), 1)
+
+    def test_concurrent_bookings_sell_seat_once(self):
+        passenger_id = self.db.add_passenger("Carol", None, 25, "Regular", "Work")
+        results = []
+
+        def book(index):
+            results.append(self.db.book_seat(f"TKT{index}", passenger_id, "FL001", "1C"))
+
+        threads = [threading.Thread(target=book, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(sum(result.ok for result in results), 1)
+        self.assertEqual(sum(result.conflict for result in results), 19)
+
+
+class TestStreamingReads(unittest.TestCase):
+
+    def setUp(self):
+        self.db = SQLiteDatabaseHandler(":memory:")
+        self.db.connect()
+        self.db.create_tables()
+        for i in range(25):
+            self.db.add_flight(f"FL{i:03d}", "AirExpress", "New York", "Los Angeles",
+                               time(8, 0), time(11, 30), date(2025, 6, 1), 120)
+
+    def tearDown(self):
+        self.db.disconnect()
+
+    def test_rows_and_batches(self):
+        self.assertEqual(len(list(self.db.iter_all_flights(fetch_size=4))), 25)
+        batches = list(self.db.iter_data("SELECT flight_id FROM flights", fetch_size=10, batches=True))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual(self.db.count_flights(), 25)
+
+    def test_abandoned_iterator_releases_connection(self):
+        rows = self.db.iter_all_flights(fetch_size=2)
+        next(rows)
+        rows.close()
+
+        result = []
+        reader = threading.Thread(target=lambda: result.append(self.db.get_flight_by_id("FL001")))
+        reader.start()
+        reader.join(timeout=2)
+        self.assertEqual(result[0][0], "FL001")
+
+
+class TestSQLiteFileBackend(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def test_separate_handlers_cannot_double_book(self):
+        """Two handlers on one file behave like two booking agents."""
+        first = create_database_handler("sqlite", path=self.path)
+        second = create_database_handler("sqlite", path=self.path)
+        first.connect()
+        second.connect()
+        self.addCleanup(first.disconnect)
+        self.addCleanup(second.disconnect)
+        seed(first)
+
+        passenger_id = first.add_passenger("Dan", None, 50, "Regular", "Work")
+        results = []
+        threads = [
+            threading.Thread(target=lambda db=db, i=i: results.append(
+                db.book_seat(f"TKT{i}", passenger_id, "FL001", "1D")))
+            for i, db in enumerate([first, second] * 5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(sum(result.ok for result in results), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from flights.SeatLayout import get_layout
+from utilities.seat_swap import Passenger, Socializer
+from utilities.swapper_registry import SwapperRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSwapperRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.layouts = {"FL001": get_layout(), "FL002": get_layout("A320")}
+        self.clock = FakeClock()
+        self.evicted = []
+        self.registry = SwapperRegistry(self.layouts.get, max_flights=2, idle_ttl=60, clock=self.clock,
+                                        on_evict=lambda flight_id, swapper: self.evicted.append(flight_id))
+
+    def test_swappers_use_each_flights_seats(self):
+        demo = Passenger("Ann", "1A", "Comfort")
+        a320 = Passenger("Ben", "5A", "Comfort")
+        self.registry.get("FL001").add_passenger(demo)
+        self.registry.get("FL002").add_passenger(a320)
+        self.registry.get("FL001").assign_seats()
+        self.registry.get("FL002").assign_seats()
+
+        self.assertIs(self.registry.get("FL001"), self.registry.get("FL001"))
+        self.assertIn(demo.get_seat(), self.layouts["FL001"].zones["Legroom"])
+        self.assertIn(a320.get_seat(), self.layouts["FL002"].zones["Legroom"])
+        self.assertEqual([data["name"] for data in self.registry.get("FL001").get_passenger_data()], ["Ann"])
+
+    def test_swappers_use_the_layout_seat_types(self):
+        workers = [Passenger(f"W{i}", "", "Work") for i in range(4)]
+        swapper = self.registry.get("FL002")
+        for passenger in workers:
+            swapper.add_passenger(passenger)
+        swapper.assign_seats("optimal")
+
+        layout = self.layouts["FL002"]
+        self.assertEqual({layout.seat_type(p.get_seat()) for p in workers}, {"Aisle"})
+
+    def test_idle_and_least_recently_used_flights_are_evicted(self):
+        self.registry.get("FL001")
+        self.clock.now = 30
+        self.registry.get("FL002")
+        self.clock.now = 70
+        self.assertEqual(self.registry.evict_idle(), 1)
+        self.assertEqual(self.evicted, ["FL001"])
+        self.assertEqual(self.registry.flight_ids(), ["FL002"])
+
+        self.layouts["FL003"] = get_layout()
+        self.registry.get("FL001")
+        self.registry.get("FL003")
+        self.assertEqual(self.evicted, ["FL001", "FL002"])
+        self.assertEqual(self.registry.stats()["created"], 4)
+
+    def test_assign_many_in_worker_processes(self):
+        registry = SwapperRegistry(lambda flight_id: get_layout("A320"))
+        manifests = {}
+        for flight in range(3):
+            flight_id = f"FL{flight:03d}"
+            manifests[flight_id] = [Socializer(f"S{flight}{i}", "", "Networking", "Tech") for i in range(3)]
+            manifests[flight_id].append(Passenger(f"P{flight}", "", "Sleep"))
+            for passenger in manifests[flight_id]:
+                registry.get(flight_id).add_passenger(passenger)
+
+        registry.assign_many(processes=2)
+
+        networking = get_layout("A320").zones["Networking"]
+        for flight_id, passengers in manifests.items():
+            seats = [networking.index(p.get_seat()) for p in passengers[:3]]
+            self.assertEqual(max(seats) - min(seats), 2)
+            self.assertIn(passengers[3].get_seat(), get_layout("A320").zones["Quiet"])
+            self.assertEqual(registry.get(flight_id).get_unassigned(), [])
+        with self.assertRaises(ValueError):
+            registry.assign_many(mode="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
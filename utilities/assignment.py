@@ -0,0 +1,74 @@
+from typing import List
+
+import numpy as np
+
+
+def solve_assignment(cost) -> List[int]:
+    """Minimum-cost assignment of rows to distinct columns.
+
+    ``cost`` is an n x m array with n <= m; returns the column chosen for each
+    row. This is the shortest augmenting path (Jonker-Volgenant style) form of
+    the Hungarian algorithm with potentials: each row is added with one
+    Dijkstra-like search whose per-step work over all columns is a numpy
+    operation, so a 300 x 300 problem takes a fraction of a second.
+    """
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    if n > m:
+        raise ValueError("solve_assignment needs at least as many columns as rows")
+    if n == 0:
+        return []
+
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)   # owner[j]: 1-based row assigned to column j, 0 if free
+    way = np.zeros(m + 1, dtype=int)
+
+    # Start from row minima as potentials and give every row its cheapest
+    # column while that column is still free. With the many equal costs of a
+    # preference matrix this settles most rows before any search runs.
+    u[1:] = cost.min(axis=1)
+    pending = []
+    for row in range(1, n + 1):
+        tight = np.flatnonzero(cost[row - 1] == u[row]) + 1
+        free = tight[owner[tight] == 0]
+        if len(free):
+            owner[free[0]] = row
+        else:
+            pending.append(row)
+
+    for row in pending:
+        owner[0] = row
+        column = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            reduced = cost[current_row - 1] - u[current_row] - v[1:]
+            free = ~used[1:]
+            better = free & (reduced < min_reduced[1:])
+            min_reduced[1:][better] = reduced[better]
+            way[1:][better] = column
+
+            candidates = np.where(free, min_reduced[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_reduced[~used] -= delta
+
+            column = next_column
+            if owner[column] == 0:
+                break
+
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    assignment = [0] * n
+    for column in range(1, m + 1):
+        if owner[column]:
+            assignment[owner[column] - 1] = column - 1
+    return assignment
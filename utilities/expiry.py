@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class ExpiryScheduler:
+    """Calls ``on_expire(key)`` once each scheduled key's deadline passes.
+
+    Deadlines live in one min-heap served by a single background thread, so
+    hundreds of thousands of pending expiries cost one heap entry each rather
+    than a timer thread each. Cancelling or rescheduling a key is O(1): its old
+    heap entry is left in place and skipped when it reaches the top, and the
+    heap is compacted once stale entries outnumber live ones.
+    """
+
+    def __init__(self, on_expire, clock=time.monotonic, start=True):
+        self._on_expire = on_expire
+        self._clock = clock
+        self._heap = []
+        self._deadlines = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.expired = 0
+        self._thread = None
+        if start:
+            self._thread = threading.Thread(target=self._run, name="expiry-scheduler", daemon=True)
+            self._thread.start()
+
+    def schedule(self, key, expires_at):
+        """Set (or move) the deadline of ``key``."""
+        with self._condition:
+            entry = (expires_at, next(self._sequence), key)
+            self._deadlines[key] = entry
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._condition.notify()
+
+    def cancel(self, key):
+        with self._condition:
+            if self._deadlines.pop(key, None) is not None and len(self._heap) > 2 * len(self._deadlines) + 64:
+                self._heap = list(self._deadlines.values())
+                heapq.heapify(self._heap)
+
+    def deadline(self, key):
+        entry = self._deadlines.get(key)
+        return entry[0] if entry is not None else None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def expire_due(self):
+        """Expire every key whose deadline has passed; returns how many fired."""
+        due = []
+        with self._condition:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if self._deadlines.get(entry[2]) is entry:
+                    del self._deadlines[entry[2]]
+                    due.append(entry[2])
+        for key in due:
+            try:
+                self._on_expire(key)
+            except Exception as e:
+                print(f"Error expiring {key}: {e}")
+        self.expired += len(due)
+        return len(due)
+
+    def _next_wait(self):
+        # Called with the condition held.
+        while self._heap and self._deadlines.get(self._heap[0][2]) is not self._heap[0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self._clock())
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                wait = self._next_wait()
+                if wait is None or wait > 0:
+                    self._condition.wait(wait)
+                    continue
+            self.expire_due()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
@@ -0,0 +1,118 @@
+import re
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+STOP_WORDS = frozenset(("a", "an", "and", "the", "of", "in", "on", "for", "to", "with", "my", "i"))
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def interest_tokens(text: str) -> List[str]:
+    """Lowercase word tokens of an interest string, plurals folded ("Startups" -> "startup")."""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall((text or "").lower()):
+        if token in STOP_WORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class InterestClusters:
+    """Groups passengers whose interests share words.
+
+    Each interest is a normalised bag-of-words vector and each cluster keeps
+    the sum of its members' vectors. A passenger joins the cluster whose
+    centroid is most cosine-similar, if that similarity reaches ``threshold``,
+    and starts a new cluster otherwise. Scoring a passenger is one
+    matrix-vector product against all centroids, so adding socializers as they
+    board costs the same as clustering them in one batch.
+    """
+
+    def __init__(self, threshold: float = 0.5):
+        self.threshold = threshold
+        self._vocabulary: Dict[str, int] = {}
+        self._centroids = np.zeros((0, 0))
+        self._sizes: List[int] = []
+        self._members: Dict[int, Dict[Hashable, None]] = {}
+        self._assignments: Dict[Hashable, Tuple[int, np.ndarray]] = {}
+
+    def __len__(self):
+        return len(self._members)
+
+    def _vectorize(self, texts: List[str]) -> np.ndarray:
+        token_lists = [interest_tokens(text) for text in texts]
+        for tokens in token_lists:
+            for token in tokens:
+                self._vocabulary.setdefault(token, len(self._vocabulary))
+        width = len(self._vocabulary)
+        if self._centroids.shape[1] < width:
+            self._centroids = np.pad(self._centroids, ((0, 0), (0, width - self._centroids.shape[1])))
+
+        vectors = np.zeros((len(texts), width))
+        for row, tokens in enumerate(token_lists):
+            vectors[row, [self._vocabulary[token] for token in tokens]] = 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+    def add(self, key: Hashable, interest: str) -> Optional[int]:
+        """Cluster id of ``key``, clustering it first if needed; None for no usable interest."""
+        return self.add_many([(key, interest)])[0]
+
+    def add_many(self, items: Iterable[Tuple[Hashable, str]]) -> List[Optional[int]]:
+        items = list(items)
+        vectors = self._vectorize([interest for _, interest in items])
+        cluster_ids = []
+        for (key, _), vector in zip(items, vectors):
+            if key in self._assignments:
+                cluster_ids.append(self._assignments[key][0])
+                continue
+            if not vector.any():
+                cluster_ids.append(None)
+                continue
+            cluster_id = self._closest(vector)
+            if cluster_id is None:
+                cluster_id = len(self._sizes)
+                self._centroids = np.vstack([self._centroids, np.zeros(self._centroids.shape[1])])
+                self._sizes.append(0)
+                self._members[cluster_id] = {}
+            self._centroids[cluster_id] += vector
+            self._sizes[cluster_id] += 1
+            self._members[cluster_id][key] = None
+            self._assignments[key] = (cluster_id, vector)
+            cluster_ids.append(cluster_id)
+        return cluster_ids
+
+    def _closest(self, vector: np.ndarray) -> Optional[int]:
+        if not len(self._sizes):
+            return None
+        norms = np.linalg.norm(self._centroids, axis=1)
+        scores = self._centroids[:, :len(vector)] @ vector
+        scores = np.divide(scores, norms, out=np.zeros_like(scores), where=norms > 0)
+        best = int(np.argmax(scores))
+        return best if scores[best] >= self.threshold else None
+
+    def remove(self, key: Hashable):
+        assignment = self._assignments.pop(key, None)
+        if assignment is None:
+            return
+        cluster_id, vector = assignment
+        self._centroids[cluster_id, :len(vector)] -= vector
+        self._sizes[cluster_id] -= 1
+        del self._members[cluster_id][key]
+        if not self._sizes[cluster_id]:
+            # Keep the row so ids stay stable; a zero centroid never matches
+            self._centroids[cluster_id] = 0.0
+            del self._members[cluster_id]
+
+    def cluster_of(self, key: Hashable) -> Optional[int]:
+        assignment = self._assignments.get(key)
+        return assignment[0] if assignment is not None else None
+
+    def members(self, cluster_id: int) -> List[Hashable]:
+        return list(self._members.get(cluster_id, ()))
+
+    def clusters(self) -> Dict[int, List[Hashable]]:
+        return {cluster_id: list(members) for cluster_id, members in self._members.items()}
@@ -1,5 +1,26 @@
+import heapq
 import random
-from typing import List
+import string
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+import numpy as np
+
+from utilities.assignment import solve_assignment
+from utilities.interest_clustering import InterestClusters
+
+# Costs of the optimal assignment mode; lower is better.
+ZONE_MISMATCH_COST = 10.0
+SEAT_KIND_COST = 1.0
+TALL_HEIGHT = 180          # cm above which the legroom zone starts to matter
+TALL_COST_PER_CM = 0.2
+INTEREST_DISTANCE_COST = 0.5
+
+SEAT_KIND_PREFERENCES = {
+    "Sleep": "Window",
+    "Work": "Aisle",
+}
 
 
 class Passenger:
@@ -29,12 +50,18 @@ class Socializer(Passenger):
         super().__init__(name, seat, preference)
         self._interest = interest
 
+    def get_interest(self) -> str:
+        return self._interest
+
 
 class TallPassenger(Passenger):
     def __init__(self, name, seat, preference, height: int):
         super().__init__(name, seat, preference)
         self._height = height
 
+    def get_height(self) -> int:
+        return self._height
+
 
 class EcoPassenger(Passenger):
     def __init__(self, name, seat, preference):
@@ -49,25 +76,321 @@ class EcoPassenger(Passenger):
 
 
 class SeatSwapper:
-    def __init__(self):
-        self._seats = {
+    """Assigns passengers to seats in preference zones.
+
+    ``assign_seats()`` is the fast greedy pass: passengers take the next free
+    seat of their zone in the order they were added. ``assign_seats("optimal")``
+    instead builds a passenger x seat cost matrix (zone match, window/aisle
+    wish, legroom for tall passengers, socializers with the same interest
+    placed next to each other) and solves it as one minimum-cost assignment.
+    Passengers that cannot be seated keep their seat and are listed by
+    ``get_unassigned()`` in both modes.
+
+    The greedy pass is incremental: free seats are kept in a min-heap per zone
+    (front of the zone first) and only passengers added since the last pass,
+    or waiting for a seat in a zone where one was freed, are placed. Seated
+    passengers are never revisited, so one more passenger or one released seat
+    costs O(log n) however long the manifest is.
+
+    Socializers headed for the Networking zone are grouped by interest with
+    ``InterestClusters``. A new cluster is seated in the middle of the longest
+    free run of Networking seats, and later members take the free seat
+    closest to the ones already seated, so clusters stay
+    together as passengers board. ``cluster_interests=False`` turns this off.
+
+    ``seat_types`` maps seat ids to "Window", "Aisle" or "Middle", normally the
+    ``seat_type_table`` of the flight's ``SeatLayout``. Without it the seat
+    types are guessed: the outermost seats of each zone row are windows and
+    the rest aisles, which only holds for two-seat blocks.
+    """
+
+    MODES = ("greedy", "optimal")
+
+    def __init__(self, zones: Optional[Dict[str, List[str]]] = None, cluster_interests: bool = True,
+                 seat_types: Optional[Dict[str, str]] = None):
+        # ``zones`` maps each of the four zone names to its seats, front to back
+        zones = zones or {
             "Networking": ["10A", "10B", "10C", "10D"],
             "Quiet": ["20A", "20B", "20C", "20D"],
             "Work": ["30A", "30B", "30C", "30D"],
             "Legroom": ["40A", "40B", "40C", "40D"]
         }
-        self._passengers: List[Passenger] = []
+        self._zones = list(zones)
+        self._seat_order = [seat for seats in zones.values() for seat in seats]
+        self._seat_index = {seat: index for index, seat in enumerate(self._seat_order)}
+        self._seat_zones = {seat: zone for zone, seats in zones.items() for seat in seats}
+        self._seat_kinds = self._classify_seats(self._seat_order)
+        if seat_types:
+            self._seat_kinds.update((seat, seat_types[seat]) for seat in self._seat_order if seat in seat_types)
+        # Insertion-ordered so removals are O(1); values are unused
+        self._passengers: Dict[Passenger, None] = {}
+        self._assignments: Dict[Passenger, str] = {}
+        self._occupants: Dict[str, Passenger] = {}
+        self._free_heaps = {zone: [self._seat_index[seat] for seat in seats] for zone, seats in zones.items()}
+        for heap in self._free_heaps.values():
+            heapq.heapify(heap)
+        self._pending: Deque[Passenger] = deque()
+        self._waiting: Dict[str, Deque[Passenger]] = {zone: deque() for zone in self._zones}
+        self._freed_zones: Set[str] = set()
+        self._available: Dict[str, List[str]] = {}
+        self._dirty_zones: Set[str] = set(self._zones)
+        self.cluster_interests = cluster_interests
+        self._interests = InterestClusters()
+        # Free Networking seat indices in order, for nearest-seat lookups, and
+        # the seat indices each interest cluster already holds
+        self._networking_free = sorted(self._free_heaps.get("Networking", []))
+        self._cluster_seated: Dict[int, List[int]] = {}
 
     def add_passenger(self, passenger: Passenger):
         if isinstance(passenger, Passenger):
-            self._passengers.append(passenger)
+            self._passengers[passenger] = None
+            self._pending.append(passenger)
+
+    def remove_passenger(self, passenger: Passenger):
+        """Drop a passenger and give their seat back to its zone."""
+        if self._passengers.pop(passenger, False) is False:
+            return
+        seat = self._assignments.pop(passenger, None)
+        if seat is not None:
+            self._free_seat(seat)
+        self._interests.remove(passenger)
+        # Queued entries of removed passengers are skipped when they come up
+
+    def assign_seats(self, mode: str = "greedy"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown assignment mode '{mode}'")
+        if mode == "optimal":
+            self._assign_optimal()
+            return
+
+        # Waiting passengers first, in zones where seats came free
+        for zone in self._freed_zones:
+            waiting = self._waiting[zone]
+            while waiting and self._has_free_seat(zone):
+                passenger = waiting.popleft()
+                if self._is_queued(passenger):
+                    self._seat(passenger, self._next_seat(passenger, zone))
+        self._freed_zones.clear()
 
-    def assign_seats(self):
-        for passenger in self._passengers:
+        pending = [passenger for passenger in self._pending if self._is_queued(passenger)]
+        self._pending.clear()
+        clustered = self._cluster(pending)
+        # Whole new clusters first, largest first, so each can get a run of seats
+        for cluster_id, members in sorted(clustered.items(), key=lambda item: -len(item[1])):
+            seats = self._cluster_seats(cluster_id, len(members))
+            for passenger, seat in zip(members, seats):
+                self._seat(passenger, seat)
+            self._waiting["Networking"].extend(members[len(seats):])
+
+        for passenger in pending:
+            if passenger in self._assignments or self._interests.cluster_of(passenger) is not None:
+                continue
             zone = self._get_zone(passenger.get_preference())
-            if self._seats[zone]:
-                new_seat = self._seats[zone].pop(0)
-                passenger.swap_seat(new_seat)
+            if self._has_free_seat(zone):
+                self._seat(passenger, self._take_seat(zone))
+            else:
+                self._waiting[zone].append(passenger)
+
+    def _is_clustered(self, passenger: Passenger) -> bool:
+        return (self.cluster_interests and isinstance(passenger, Socializer)
+                and self._get_zone(passenger.get_preference()) == "Networking")
+
+    def _cluster(self, passengers: List[Passenger]) -> Dict[int, List[Passenger]]:
+        socializers = [p for p in passengers if self._is_clustered(p)]
+        if not socializers:
+            return {}
+        cluster_ids = self._interests.add_many((p, p.get_interest()) for p in socializers)
+        clusters: Dict[int, List[Passenger]] = {}
+        for passenger, cluster_id in zip(socializers, cluster_ids):
+            if cluster_id is not None:
+                clusters.setdefault(cluster_id, []).append(passenger)
+        return clusters
+
+    def _cluster_seats(self, cluster_id: int, count: int) -> List[str]:
+        """Up to ``count`` free Networking seats next to the cluster's seated members."""
+        free = self._networking_free
+        taken = self._cluster_seated.get(cluster_id, [])
+        chosen: List[int] = []
+        if not taken and free:
+            # New cluster: the middle of the longest free run, leaving room on
+            # both sides for members who board later
+            runs = []
+            run_start = 0
+            for i in range(1, len(free) + 1):
+                if i == len(free) or free[i] != free[i - 1] + 1:
+                    runs.append((run_start, i - run_start))
+                    run_start = i
+            start, length = max(runs, key=lambda run: run[1])
+            start += max(0, length - count + 1) // 2
+            chosen = free[start:start + min(count, length)]
+        while len(chosen) < count and len(chosen) < len(free):
+            seat = self._nearest_free(taken + chosen, exclude=set(chosen))
+            if seat is None:
+                break
+            chosen.append(seat)
+        return [self._seat_order[index] for index in chosen]
+
+    def _nearest_free(self, anchors: List[int], exclude: Set[int]) -> Optional[int]:
+        """Free Networking seat closest to the span of ``anchors``, gaps inside it first."""
+        free = self._networking_free
+        low, high = min(anchors), max(anchors)
+        position = bisect_left(free, low)
+        above = next((free[i] for i in range(position, len(free)) if free[i] not in exclude), None)
+        below = next((free[i] for i in range(position - 1, -1, -1) if free[i] not in exclude), None)
+        if above is None or (below is not None and low - below < above - high):
+            return below
+        return above
+
+    def _next_seat(self, passenger: Passenger, zone: str) -> str:
+        cluster_id = self._interests.cluster_of(passenger) if zone == "Networking" else None
+        if cluster_id is not None:
+            seats = self._cluster_seats(cluster_id, 1)
+            if seats:
+                return seats[0]
+        return self._take_seat(zone)
+
+    def _is_queued(self, passenger: Passenger) -> bool:
+        # Queues may hold removed or already seated passengers
+        return passenger in self._passengers and passenger not in self._assignments
+
+    def _has_free_seat(self, zone: str) -> bool:
+        heap = self._free_heaps[zone]
+        while heap and self._seat_order[heap[0]] in self._occupants:
+            heapq.heappop(heap)
+        return bool(heap)
+
+    def _take_seat(self, zone: str) -> str:
+        return self._seat_order[heapq.heappop(self._free_heaps[zone])]
+
+    def _free_seat(self, seat: str):
+        zone = self._seat_zones[seat]
+        occupant = self._occupants.pop(seat, None)
+        heapq.heappush(self._free_heaps[zone], self._seat_index[seat])
+        if zone == "Networking":
+            index = self._seat_index[seat]
+            insort(self._networking_free, index)
+            seated = self._cluster_seated.get(self._interests.cluster_of(occupant))
+            if seated:
+                del seated[bisect_left(seated, index)]
+        self._freed_zones.add(zone)
+        self._dirty_zones.add(zone)
+
+    def _seat(self, passenger: Passenger, seat: str):
+        passenger.swap_seat(seat)
+        self._assignments[passenger] = seat
+        self._occupants[seat] = passenger
+        zone = self._seat_zones[seat]
+        self._dirty_zones.add(zone)
+        if zone == "Networking":
+            # Seats taken off-heap leave a stale heap entry, skipped by _has_free_seat
+            index = self._seat_index[seat]
+            position = bisect_left(self._networking_free, index)
+            if position < len(self._networking_free) and self._networking_free[position] == index:
+                del self._networking_free[position]
+            cluster_id = self._interests.cluster_of(passenger)
+            if cluster_id is not None:
+                insort(self._cluster_seated.setdefault(cluster_id, []), index)
+
+    def _assign_optimal(self):
+        # A full re-solve: every seat is back in the pool
+        pool = self._seat_order
+        passengers = list(self._passengers)
+        cost = self.cost_matrix(passengers, pool)
+        if len(passengers) <= len(pool):
+            seat_of = dict(enumerate(solve_assignment(cost)))
+        else:
+            # More passengers than seats: pick a passenger for every seat instead
+            seat_of = {row: column for column, row in enumerate(solve_assignment(cost.T))}
+        self.apply_assignment([pool[seat_of[row]] if row in seat_of else None for row in range(len(passengers))])
+
+    def get_assignment(self) -> List[Optional[str]]:
+        """Seat of every passenger in the order they were added, None if unseated."""
+        return [self._assignments.get(passenger) for passenger in self._passengers]
+
+    def apply_assignment(self, seats: List[Optional[str]]):
+        """Seat passengers as given by ``get_assignment()``, e.g. from a copy solved elsewhere.
+
+        Passengers left without a seat wait for one in their zone, and any
+        added after ``seats`` was taken are placed by the next greedy pass.
+        """
+        self._cluster(list(self._passengers))
+        self._assignments = {}
+        self._occupants = {}
+        self._cluster_seated = {}
+        self._pending.clear()
+        self._waiting = {zone: deque() for zone in self._zones}
+        self._freed_zones.clear()
+        for index, passenger in enumerate(list(self._passengers)):
+            if index >= len(seats):
+                self._pending.append(passenger)
+            elif seats[index] is not None:
+                self._seat(passenger, seats[index])
+            else:
+                self._waiting[self._get_zone(passenger.get_preference())].append(passenger)
+
+        self._free_heaps = {zone: [] for zone in self._zones}
+        for seat in self._seat_order:
+            if seat not in self._occupants:
+                self._free_heaps[self._seat_zones[seat]].append(self._seat_index[seat])
+        self._networking_free = sorted(self._free_heaps.get("Networking", []))
+        self._dirty_zones = set(self._zones)
+
+    def cost_matrix(self, passengers: List[Passenger], seats: List[str]) -> np.ndarray:
+        """Cost of seating each passenger (rows) in each seat (columns)."""
+        zones = self._zones
+        seat_zone = np.array([zones.index(self._seat_zones[seat]) for seat in seats])
+        is_window = np.array([self._seat_kinds[seat] == "Window" for seat in seats])
+        is_aisle = np.array([self._seat_kinds[seat] == "Aisle" for seat in seats])
+        is_legroom = seat_zone == zones.index("Legroom")
+        networking = {seat: position for position, seat in
+                      enumerate(seat for seat in seats if self._seat_zones[seat] == "Networking")}
+        seat_position = np.array([networking.get(seat, np.nan) for seat in seats])
+
+        wanted_zone = np.array([zones.index(self._get_zone(p.get_preference())) for p in passengers])
+        wanted_kind = [SEAT_KIND_PREFERENCES.get(p.get_preference()) for p in passengers]
+        wants_window = np.array([kind == "Window" for kind in wanted_kind])
+        wants_aisle = np.array([kind == "Aisle" for kind in wanted_kind])
+        extra_height = np.array([max(0, p.get_height() - TALL_HEIGHT) if isinstance(p, TallPassenger) else 0
+                                 for p in passengers])
+
+        cost = ZONE_MISMATCH_COST * (wanted_zone[:, None] != seat_zone[None, :])
+        cost = cost + SEAT_KIND_COST * ((wants_window[:, None] & ~is_window[None, :])
+                                        | (wants_aisle[:, None] & ~is_aisle[None, :]))
+        cost = cost + TALL_COST_PER_CM * extra_height[:, None] * ~is_legroom[None, :]
+
+        # Socializers in the same interest cluster get consecutive Networking
+        # seats: each cluster is centred on its own stretch of the zone, and
+        # seats further from that centre cost more.
+        centres = np.full(len(passengers), np.nan)
+        start = 0
+        groups: Dict[int, List[int]] = {}
+        rows = [row for row, p in enumerate(passengers) if self._is_clustered(p)]
+        cluster_ids = self._interests.add_many((passengers[row], passengers[row].get_interest()) for row in rows)
+        for row, cluster_id in zip(rows, cluster_ids):
+            if cluster_id is not None:
+                groups.setdefault(cluster_id, []).append(row)
+        for rows in groups.values():
+            centres[rows] = start + (len(rows) - 1) / 2
+            start += len(rows)
+        distance = np.abs(seat_position[None, :] - centres[:, None])
+        cost = cost + INTEREST_DISTANCE_COST * np.nan_to_num(distance, nan=0.0)
+        return cost
+
+    @staticmethod
+    def _classify_seats(seat_order: List[str]) -> Dict[str, str]:
+        """Guessed seat types: Window for the outermost seat of each zone row, Aisle for the rest."""
+        rows: Dict[str, List[str]] = {}
+        for seat in seat_order:
+            rows.setdefault(seat.rstrip(string.ascii_uppercase), []).append(seat)
+        kinds = {}
+        for seats in rows.values():
+            for seat in seats:
+                kinds[seat] = "Window" if seat in (seats[0], seats[-1]) else "Aisle"
+        return kinds
+
+    def get_unassigned(self) -> List[Passenger]:
+        return list(dict.fromkeys(passenger for zone in self._zones for passenger in self._waiting[zone]
+                                  if self._is_queued(passenger)))
 
     def get_passenger_data(self) -> List[dict]:
         return [{
@@ -77,7 +400,12 @@ class SeatSwapper:
         } for p in self._passengers]
 
     def get_available_seats(self) -> dict:
-        return self._seats
+        # Only zones whose free seats changed since the last call are rebuilt
+        for zone in self._dirty_zones:
+            self._available[zone] = [self._seat_order[index] for index in sorted(set(self._free_heaps[zone]))
+                                     if self._seat_order[index] not in self._occupants]
+        self._dirty_zones.clear()
+        return {zone: self._available[zone] for zone in self._zones}
 
     def _get_zone(self, preference: str) -> str:
         return {
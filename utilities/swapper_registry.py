@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Dict, Iterable, List, Optional
+
+from flights.SeatLayout import SeatLayout, get_layout
+from utilities.seat_swap import SeatSwapper
+
+
+def _solve(swapper: SeatSwapper, mode: str) -> List[Optional[str]]:
+    """Worker side of ``assign_many``: solve a pickled copy and send back only the seats."""
+    swapper.assign_seats(mode)
+    return swapper.get_assignment()
+
+
+class SwapperRegistry:
+    """One SeatSwapper per flight, built on first use from the flight's seat map.
+
+    ``layout_for`` maps a flight id to its ``SeatLayout`` (the default layout
+    if omitted) and the swapper's zones and seat types come from that layout,
+    so every flight only ever moves its own passengers between its own seats,
+    and window and aisle wishes match the real cabin. At most
+    ``max_flights`` swappers are kept, least recently used first out, and any
+    swapper not touched for ``idle_ttl`` seconds is dropped on the next
+    access. ``on_evict(flight_id, swapper)`` is called for each swapper
+    dropped, so the caller can persist its passengers; an evicted flight
+    starts again with an empty swapper.
+    """
+
+    def __init__(self, layout_for: Optional[Callable[[str], SeatLayout]] = None, max_flights: int = 128,
+                 idle_ttl: Optional[float] = None, on_evict: Optional[Callable[[str, SeatSwapper], None]] = None,
+                 clock=time.monotonic):
+        if max_flights < 1:
+            raise ValueError("max_flights must be at least 1")
+        self._layout_for = layout_for or (lambda flight_id: get_layout())
+        self.max_flights = max_flights
+        self.idle_ttl = idle_ttl
+        self._on_evict = on_evict
+        self._clock = clock
+        self._swappers: "OrderedDict[str, SeatSwapper]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evictions = 0
+
+    def get(self, flight_id: str) -> SeatSwapper:
+        """The flight's swapper, creating it from the flight's layout if needed."""
+        with self._lock:
+            evicted = self._expire()
+            swapper = self._swappers.get(flight_id)
+            if swapper is None:
+                layout = self._layout_for(flight_id)
+                swapper = self._swappers[flight_id] = SeatSwapper(layout.zones, seat_types=layout.seat_type_table)
+                self.created += 1
+                while len(self._swappers) > self.max_flights:
+                    evicted.append(self._evict(next(iter(self._swappers))))
+            self._swappers.move_to_end(flight_id)
+            self._last_used[flight_id] = self._clock()
+        self._notify(evicted)
+        return swapper
+
+    def _expire(self):
+        if self.idle_ttl is None:
+            return []
+        cutoff = self._clock() - self.idle_ttl
+        evicted = []
+        # Least recently used first, so stop at the first flight still in use
+        while self._swappers:
+            flight_id = next(iter(self._swappers))
+            if self._last_used[flight_id] > cutoff:
+                break
+            evicted.append(self._evict(flight_id))
+        return evicted
+
+    def _evict(self, flight_id):
+        self.evictions += 1
+        del self._last_used[flight_id]
+        return flight_id, self._swappers.pop(flight_id)
+
+    def _notify(self, evicted):
+        if self._on_evict is not None:
+            for flight_id, swapper in evicted:
+                self._on_evict(flight_id, swapper)
+
+    def evict_idle(self) -> int:
+        """Drop swappers idle for longer than ``idle_ttl``; returns how many went."""
+        with self._lock:
+            evicted = self._expire()
+        self._notify(evicted)
+        return len(evicted)
+
+    def discard(self, flight_id: str):
+        with self._lock:
+            if flight_id in self._swappers:
+                del self._last_used[flight_id]
+                del self._swappers[flight_id]
+
+    def __contains__(self, flight_id):
+        return flight_id in self._swappers
+
+    def __len__(self):
+        return len(self._swappers)
+
+    def flight_ids(self) -> List[str]:
+        return list(self._swappers)
+
+    def assign_many(self, flight_ids: Optional[Iterable[str]] = None, mode: str = "optimal",
+                    processes: Optional[int] = None) -> Dict[str, SeatSwapper]:
+        """Run ``assign_seats(mode)`` for many flights, in parallel worker processes.
+
+        Each swapper is pickled to a worker, solved there and only the seat
+        list comes back, which is applied to the swapper here so the caller's
+        passenger objects are the ones that move. ``processes=1`` (or a single
+        flight) solves in this process instead.
+        """
+        if mode not in SeatSwapper.MODES:
+            raise ValueError(f"Unknown assignment mode '{mode}'")
+        flight_ids = list(self._swappers) if flight_ids is None else list(flight_ids)
+        swappers = {flight_id: self.get(flight_id) for flight_id in flight_ids}
+        processes = min(processes or os.cpu_count() or 1, len(swappers))
+        if processes <= 1:
+            for swapper in swappers.values():
+                swapper.assign_seats(mode)
+            return swappers
+
+        chunksize = max(1, len(swappers) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = executor.map(_solve, swappers.values(), repeat(mode), chunksize=chunksize)
+            for swapper, seats in zip(swappers.values(), results):
+                swapper.apply_assignment(seats)
+        return swappers
+
+    def stats(self):
+        return {
+            "flights": len(self._swappers),
+            "max_flights": self.max_flights,
+            "created": self.created,
+            "evictions": self.evictions,
+        }